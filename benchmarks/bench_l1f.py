@@ -0,0 +1,107 @@
+"""
+Compare the fused level-1f kernels against the loops of level-1v calls
+they replace, on an m x b panel of b vectors.
+
+    python benchmarks/bench_l1f.py [--sizes 1000 100000] [--cols 4 8 32] [--dtype d]
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+
+import numpy as np
+
+from pyblis import blis_l1f, blis_l1v
+
+
+def best_time(fn, repeat=5):
+    number, _ = timeit.Timer(fn).autorange()
+    return min(timeit.repeat(fn, number=number, repeat=repeat)) / number
+
+
+def operands(m, b, dtype):
+    rng = np.random.default_rng(0)
+    # Column-major, so each vector of the panel is contiguous for the
+    # level-1v loops too.
+    a = np.asfortranarray(rng.random((m, b))).astype(dtype)
+    return a, rng.random(m).astype(dtype), rng.random(b).astype(dtype)
+
+
+def bench_axpyf(m, b, dtype):
+    # y += A x, as in the update step of classical Gram-Schmidt.
+    a, y, x = operands(m, b, dtype)
+    cols = [a[:, j] for j in range(b)]
+
+    def fused():
+        blis_l1f.axpyf(-1.0, a, x, y)
+
+    def loop():
+        for j, col in enumerate(cols):
+            blis_l1v.axpyv(-x[j], col, y)
+
+    return best_time(fused), best_time(loop), a.nbytes
+
+
+def bench_dotxf(m, b, dtype):
+    # y := A^T w, as in the projection step of classical Gram-Schmidt.
+    a, w, y = operands(m, b, dtype)
+    cols = [a[:, j] for j in range(b)]
+
+    def fused():
+        blis_l1f.dotxf(1.0, a, w, 0.0, y)
+
+    def loop():
+        for j, col in enumerate(cols):
+            y[j] = blis_l1v.dotv(col, w)
+
+    return best_time(fused), best_time(loop), a.nbytes
+
+
+def bench_dotxaxpyf(m, b, dtype):
+    # y := A^T w and z += A x in one pass over A.
+    a, w, x = operands(m, b, dtype)
+    y = np.zeros(b, dtype=dtype)
+    z = np.zeros(m, dtype=dtype)
+    cols = [a[:, j] for j in range(b)]
+
+    def fused():
+        blis_l1f.dotxaxpyf(1.0, a, w, x, 0.0, y, z)
+
+    def loop():
+        for j, col in enumerate(cols):
+            y[j] = blis_l1v.dotv(col, w)
+            blis_l1v.axpyv(x[j], col, z)
+
+    return best_time(fused), best_time(loop), a.nbytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100_000])
+    parser.add_argument("--cols", type=int, nargs="+", default=[4, 8, 32])
+    parser.add_argument("--dtype", default="d", choices=["f", "d", "F", "D"])
+    args = parser.parse_args()
+    dtype = np.dtype(args.dtype)
+
+    print(
+        f"{'op':<10}{'m':>8}{'b':>5}{'l1f [us]':>12}{'l1v [us]':>12}"
+        f"{'speedup':>9}{'l1f GB/s':>10}"
+    )
+    for name, bench in (
+        ("axpyf", bench_axpyf),
+        ("dotxf", bench_dotxf),
+        ("dotxaxpyf", bench_dotxaxpyf),
+    ):
+        for m in args.sizes:
+            for b in args.cols:
+                t_fused, t_loop, nbytes = bench(m, b, dtype)
+                print(
+                    f"{name:<10}{m:>8}{b:>5}{t_fused * 1e6:>12.1f}"
+                    f"{t_loop * 1e6:>12.1f}{t_loop / t_fused:>9.2f}"
+                    f"{nbytes / t_fused / 1e9:>10.2f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Compare the level-2 gemv/trsv paths against level-3 gemm/trsm on a single
+column, which is what callers had to use before blis_l2 existed.
+
+    python benchmarks/bench_l2.py [--sizes 64 256 1024 4096] [--dtype d]
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+
+import numpy as np
+
+from pyblis import blis_l2, blis_l3
+
+
+def best_time(fn, repeat=5):
+    number, _ = timeit.Timer(fn).autorange()
+    return min(timeit.repeat(fn, number=number, repeat=repeat)) / number
+
+
+def bench_gemv(n, dtype):
+    rng = np.random.default_rng(0)
+    a = rng.random((n, n)).astype(dtype)
+    x = rng.random(n).astype(dtype)
+    y = np.zeros(n, dtype=dtype)
+    xcol = x.reshape(n, 1)
+    ycol = y.reshape(n, 1)
+    t_l2 = best_time(lambda: blis_l2.gemv(1.0, a, x, 0.0, y))
+    t_l3 = best_time(lambda: blis_l3.gemm(1.0, a, xcol, 0.0, ycol))
+    return t_l2, t_l3, a.nbytes
+
+
+def bench_trsv(n, dtype):
+    rng = np.random.default_rng(0)
+    a = np.tril(rng.random((n, n))) + n * np.eye(n)
+    a = a.astype(dtype)
+    b = rng.random(n).astype(dtype)
+    x = b.copy()
+    xcol = x.reshape(n, 1)
+
+    # Both variants restore the right-hand side first, so repeated in-place
+    # solves do not drive x towards denormals.
+    def solve_l2():
+        np.copyto(x, b)
+        blis_l2.trsv(1.0, a, x, uplo_a="L")
+
+    def solve_l3():
+        np.copyto(x, b)
+        blis_l3.trsm(1.0, a, xcol, side_a="L", uplo_a="L")
+
+    t_l2 = best_time(solve_l2)
+    t_l3 = best_time(solve_l3)
+    return t_l2, t_l3, a.nbytes // 2
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[64, 256, 1024, 4096])
+    parser.add_argument("--dtype", default="d", choices=["f", "d", "F", "D"])
+    args = parser.parse_args()
+    dtype = np.dtype(args.dtype)
+
+    print(
+        f"{'op':<6}{'n':>7}{'l2 [us]':>12}{'l3 [us]':>12}{'speedup':>9}{'l2 GB/s':>9}"
+    )
+    for name, bench in (("gemv", bench_gemv), ("trsv", bench_trsv)):
+        for n in args.sizes:
+            t_l2, t_l3, nbytes = bench(n, dtype)
+            print(
+                f"{name:<6}{n:>7}{t_l2 * 1e6:>12.1f}{t_l3 * 1e6:>12.1f}"
+                f"{t_l3 / t_l2:>9.2f}{nbytes / t_l2 / 1e9:>9.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,343 @@
+"""
+Level-3 throughput (GFLOPS) of every blis_l3 operation over a sweep of
+shapes, datatypes and thread counts, next to numpy.matmul and
+scipy.linalg.blas on the same machine.
+
+    python benchmarks/bench_l3.py [--ops gemm trsm] [--sizes 256 1024]
+        [--families square tall-skinny short-wide small] [--dtypes f d F D]
+        [--threads 1 2 4] [--methods 1m native] [--output results.json]
+
+Each pyblis row names the implementation BLIS ran: "native" or an induced
+method such as "1m" for complex dtypes. numpy and scipy run on whatever BLAS they were built against; their thread
+count follows --threads only if threadpoolctl is installed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import functools
+import json
+import os
+import platform
+import timeit
+from pathlib import Path
+
+import numpy as np
+
+import pyblis
+from pyblis import blis_l3, core, ind
+from pyblis.core import libblis
+
+try:
+    from scipy.linalg import blas as scipy_blas
+except ImportError:
+    scipy_blas = None
+
+try:
+    from threadpoolctl import threadpool_limits
+except ImportError:
+    threadpool_limits = None
+
+
+FAMILIES = {
+    "square": lambda n: (n, n, n),
+    "tall-skinny": lambda n: (4 * n, max(n // 8, 1), n),
+    "short-wide": lambda n: (max(n // 8, 1), 4 * n, n),
+}
+SMALL_SHAPES = [(4, 4, 4), (8, 8, 8), (16, 16, 16), (32, 32, 32)]
+
+
+def best_time(fn, repeat=5):
+    number, _ = timeit.Timer(fn).autorange()
+    return min(timeit.repeat(fn, number=number, repeat=repeat)) / number
+
+
+def rand(rng, shape, dtype):
+    out = rng.random(shape)
+    if np.dtype(dtype).kind == "c":
+        out = out + 1j * rng.random(shape)
+    return out.astype(dtype)
+
+
+def triangular(rng, m, dtype):
+    return np.tril(rand(rng, (m, m), dtype)) + m * np.eye(m, dtype=dtype)
+
+
+def scipy_fn(typechar, name):
+    if scipy_blas is None:
+        return None
+    prefix = {"f": "s", "d": "d", "F": "c", "D": "z"}[typechar]
+    return getattr(scipy_blas, prefix + name, None)
+
+
+# Each case returns (flops, pyblis call, numpy call or None, scipy call or
+# None) for an (m, n, k) shape. Ops that only have two dimensions use m and
+# n; rank-k updates use m for the order of C and k for the inner dimension.
+def case_gemm(rng, shape, dtype):
+    m, n, k = shape
+    a, b, c = (
+        rand(rng, (m, k), dtype),
+        rand(rng, (k, n), dtype),
+        rand(rng, (m, n), dtype),
+    )
+    sp = scipy_fn(dtype.char, "gemm")
+    return (
+        2 * m * n * k,
+        lambda rntm: blis_l3.gemm(1.0, a, b, 0.0, c, rntm=rntm),
+        lambda: np.matmul(a, b, out=c),
+        sp and (lambda: sp(1.0, a, b, 0.0, c, overwrite_c=True)),
+    )
+
+
+def case_gemmt(rng, shape, dtype):
+    m, _, k = shape
+    a, b, c = (
+        rand(rng, (m, k), dtype),
+        rand(rng, (k, m), dtype),
+        rand(rng, (m, m), dtype),
+    )
+    return (
+        m * m * k,
+        lambda rntm: blis_l3.gemmt(1.0, a, b, 0.0, c, uplo_c="L", rntm=rntm),
+        None,
+        None,
+    )
+
+
+def _case_hemm_symm(name, rng, shape, dtype):
+    m, n, _ = shape
+    a, b, c = (
+        rand(rng, (m, m), dtype),
+        rand(rng, (m, n), dtype),
+        rand(rng, (m, n), dtype),
+    )
+    a = a + a.conj().T
+    op = getattr(blis_l3, name)
+    sp = scipy_fn(dtype.char, name)
+    return (
+        2 * m * m * n,
+        lambda rntm: op(1.0, a, b, 0.0, c, uplo_a="L", rntm=rntm),
+        lambda: np.matmul(a, b, out=c),
+        sp and (lambda: sp(1.0, a, b, 0.0, c, lower=1, overwrite_c=True)),
+    )
+
+
+def _case_rank_k(name, rng, shape, dtype):
+    m, _, k = shape
+    a, c = rand(rng, (m, k), dtype), rand(rng, (m, m), dtype)
+    op = getattr(blis_l3, name)
+    sp = scipy_fn(dtype.char, name)
+    return (
+        m * m * k,
+        lambda rntm: op(1.0, a, 0.0, c, uplo_c="L", rntm=rntm),
+        None,
+        sp and (lambda: sp(1.0, a, 0.0, c, lower=1, overwrite_c=True)),
+    )
+
+
+def _case_rank_2k(name, rng, shape, dtype):
+    m, _, k = shape
+    a, b, c = (
+        rand(rng, (m, k), dtype),
+        rand(rng, (m, k), dtype),
+        rand(rng, (m, m), dtype),
+    )
+    op = getattr(blis_l3, name)
+    sp = scipy_fn(dtype.char, name)
+    return (
+        2 * m * m * k,
+        lambda rntm: op(1.0, a, b, 0.0, c, uplo_c="L", rntm=rntm),
+        None,
+        sp and (lambda: sp(1.0, a, b, 0.0, c, lower=1, overwrite_c=True)),
+    )
+
+
+def _case_triangular(name, rng, shape, dtype):
+    m, n, _ = shape
+    a, b0 = triangular(rng, m, dtype), rand(rng, (m, n), dtype)
+    b = b0.copy()
+    op = getattr(blis_l3, name)
+    sp = scipy_fn(dtype.char, name)
+
+    # In-place operations restore B first so repeated calls stay finite.
+    def run(rntm):
+        np.copyto(b, b0)
+        op(1.0, a, b, side_a="L", uplo_a="L", rntm=rntm)
+
+    def run_scipy():
+        np.copyto(b, b0)
+        sp(1.0, a, b, lower=1, overwrite_b=True)
+
+    return (
+        m * m * n,
+        run,
+        (lambda: np.matmul(a, b0, out=b)) if name == "trmm" else None,
+        sp and run_scipy,
+    )
+
+
+def case_trmm3(rng, shape, dtype):
+    m, n, _ = shape
+    a, b, c = (
+        triangular(rng, m, dtype),
+        rand(rng, (m, n), dtype),
+        rand(rng, (m, n), dtype),
+    )
+    return (
+        m * m * n,
+        lambda rntm: blis_l3.trmm3(1.0, a, b, 0.0, c, uplo_a="L", rntm=rntm),
+        lambda: np.matmul(a, b, out=c),
+        None,
+    )
+
+
+CASES = {
+    "gemm": case_gemm,
+    "gemmt": case_gemmt,
+    "hemm": functools.partial(_case_hemm_symm, "hemm"),
+    "symm": functools.partial(_case_hemm_symm, "symm"),
+    "herk": functools.partial(_case_rank_k, "herk"),
+    "syrk": functools.partial(_case_rank_k, "syrk"),
+    "her2k": functools.partial(_case_rank_2k, "her2k"),
+    "syr2k": functools.partial(_case_rank_2k, "syr2k"),
+    "trmm": functools.partial(_case_triangular, "trmm"),
+    "trsm": functools.partial(_case_triangular, "trsm"),
+    "trmm3": case_trmm3,
+}
+
+
+def limit_threads(num_threads):
+    if threadpool_limits is None:
+        return contextlib.nullcontext()
+    return threadpool_limits(num_threads)
+
+
+def machine_info():
+    return {
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "python": platform.python_version(),
+        "cpus": os.cpu_count(),
+        "pyblis": pyblis.__version__,
+        "numpy": np.__version__,
+        "scipy": None if scipy_blas is None else __import__("scipy").__version__,
+    }
+
+
+def run(args):
+    shapes = [
+        (family, FAMILIES[family](n))
+        for family in args.families
+        if family != "small"
+        for n in args.sizes
+    ]
+    if "small" in args.families:
+        shapes += [("small", shape) for shape in SMALL_SHAPES]
+
+    rng = np.random.default_rng(0)
+    for op in args.ops:
+        if not hasattr(libblis, f"bli_{op}_ex"):
+            print(f"{op}: not provided by this BLIS build, skipped")
+            continue
+        for dtype in map(np.dtype, args.dtypes):
+            methods = [None]
+            if dtype.kind == "c" and args.methods:
+                methods = [m for m in args.methods if m in ind.available(op)]
+            for family, (m, n, k) in shapes:
+                flops, blis, ref_np, ref_sp = CASES[op](rng, (m, n, k), dtype)
+                if dtype.kind == "c":
+                    flops *= 4
+                for num_threads in args.threads:
+                    rntm = pyblis.Rntm(num_threads=num_threads)
+                    timings = []
+                    for method in methods:
+                        with ind.using(method) if method else contextlib.nullcontext():
+                            impl = ind.implementation(op, (dtype,))
+                            seconds = best_time(lambda blis=blis, rntm=rntm: blis(rntm))
+                        timings.append(("pyblis", impl, seconds))
+                    with limit_threads(num_threads):
+                        if ref_np is not None:
+                            timings.append(("numpy", None, best_time(ref_np)))
+                        if ref_sp is not None:
+                            timings.append(("scipy", None, best_time(ref_sp)))
+                    yield [
+                        {
+                            "op": op,
+                            "dtype": dtype.char,
+                            "family": family,
+                            "shape": [m, n, k],
+                            "threads": num_threads,
+                            "lib": lib,
+                            "method": impl,
+                            "seconds": seconds,
+                            "gflops": flops / seconds / 1e9,
+                        }
+                        for lib, impl, seconds in timings
+                    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--ops", nargs="+", default=list(CASES), choices=list(CASES))
+    parser.add_argument("--sizes", type=int, nargs="+", default=[256, 1024])
+    parser.add_argument(
+        "--families",
+        nargs="+",
+        default=[*FAMILIES, "small"],
+        choices=[*FAMILIES, "small"],
+    )
+    parser.add_argument(
+        "--dtypes",
+        nargs="+",
+        default=["f", "d", "F", "D"],
+        choices=["f", "d", "F", "D"],
+    )
+    parser.add_argument(
+        "--threads", type=int, nargs="+", default=sorted({1, core._get_num_cpus()})
+    )
+    parser.add_argument(
+        "--methods",
+        nargs="+",
+        choices=ind.METHODS,
+        help="Time complex dtypes with each of these induced methods "
+        "(default: whichever BLIS picks)",
+    )
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    args = parser.parse_args()
+
+    results = []
+    print(
+        f"{'op':<7}{'dt':<3}{'family':<12}{'shape':>18}{'thr':>4}{'impl':>8}"
+        f"{'pyblis':>9}{'numpy':>9}{'scipy':>9}  GFLOPS"
+    )
+    for row in run(args):
+        results += row
+        print_row(row)
+
+    if args.output:
+        Path(args.output).write_text(
+            json.dumps({"machine": machine_info(), "results": results}, indent=1)
+        )
+
+
+def print_row(row):
+    first = row[0]
+    shape = "x".join(map(str, first["shape"]))
+    refs = {r["lib"]: r["gflops"] for r in row if r["lib"] != "pyblis"}
+    cols = "".join(
+        f"{refs[lib]:>9.2f}" if lib in refs else f"{'-':>9}"
+        for lib in ("numpy", "scipy")
+    )
+    for result in row:
+        if result["lib"] != "pyblis":
+            continue
+        print(
+            f"{first['op']:<7}{first['dtype']:<3}{first['family']:<12}{shape:>18}"
+            f"{first['threads']:>4}{result['method']:>8}{result['gflops']:>9.2f}{cols}"
+        )
+        cols = ""
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""
+Per-call overhead of the Python wrappers, timed on tiny operands where the
+BLIS work itself is negligible.
+
+    python benchmarks/bench_overhead.py [--sizes 1 4 16] [--save out.json]
+        [--baseline benchmarks/overhead_baseline.json] [--threshold 0.25]
+
+Times are also reported relative to a reference call that creates a ctypes
+object and calls into libblis, which makes them roughly comparable across
+machines. With --baseline, exits with
+status 1 if the relative time of any function, taken as the median over
+sizes, exceeds the baseline by more than the threshold, or if any timing
+has no baseline entry.
+"""
+
+from __future__ import annotations
+
+import argparse
+import ctypes
+import json
+import sys
+import timeit
+from pathlib import Path
+
+import numpy as np
+
+from pyblis import blis_l1d, blis_l1m, blis_l1v, blis_l3, core
+from pyblis.core import libblis
+
+
+def vec(n):
+    return np.linspace(1.0, 2.0, n)
+
+
+def mat(n):
+    return np.eye(n) + np.linspace(0.0, 1.0, n * n).reshape(n, n) / n
+
+
+# name -> function of n returning (callable, args). The operands are chosen
+# so that repeating an in-place call leaves them finite.
+CALLS = {
+    "l1v.addv": lambda n: (blis_l1v.addv, (vec(n), vec(n))),
+    "l1v.amaxv": lambda n: (blis_l1v.amaxv, (vec(n),)),
+    "l1v.axpyv": lambda n: (blis_l1v.axpyv, (0.0, vec(n), vec(n))),
+    "l1v.axpbyv": lambda n: (blis_l1v.axpbyv, (0.0, vec(n), 1.0, vec(n))),
+    "l1v.copyv": lambda n: (blis_l1v.copyv, (vec(n), vec(n))),
+    "l1v.dotv": lambda n: (blis_l1v.dotv, (vec(n), vec(n))),
+    "l1v.dotxv": lambda n: (blis_l1v.dotxv, (1.0, vec(n), vec(n), 0.0)),
+    "l1v.invertv": lambda n: (blis_l1v.invertv, (vec(n),)),
+    "l1v.invscalv": lambda n: (blis_l1v.invscalv, (1.0, vec(n))),
+    "l1v.scalv": lambda n: (blis_l1v.scalv, (1.0, vec(n))),
+    "l1v.scal2v": lambda n: (blis_l1v.scal2v, (1.0, vec(n), vec(n))),
+    "l1v.setv": lambda n: (blis_l1v.setv, (1.0, vec(n))),
+    "l1v.setrv": lambda n: (blis_l1v.setrv, (1.0, vec(n))),
+    "l1v.setiv": lambda n: (blis_l1v.setiv, (1.0, vec(n))),
+    "l1v.subv": lambda n: (blis_l1v.subv, (vec(n), vec(n))),
+    "l1v.swapv": lambda n: (blis_l1v.swapv, (vec(n), vec(n))),
+    "l1v.axpy2v": lambda n: (blis_l1v.axpy2v, (0.0, 0.0, vec(n), vec(n), vec(n))),
+    "l1v.dotaxpyv": lambda n: (blis_l1v.dotaxpyv, (0.0, vec(n), vec(n), vec(n))),
+    "l1m.axpym": lambda n: (blis_l1m.axpym, (0.0, mat(n), mat(n))),
+    "l1m.copym": lambda n: (blis_l1m.copym, (mat(n), mat(n))),
+    "l1m.invscalm": lambda n: (blis_l1m.invscalm, (1.0, mat(n))),
+    "l1m.scalm": lambda n: (blis_l1m.scalm, (1.0, mat(n))),
+    "l1m.scal2m": lambda n: (blis_l1m.scal2m, (1.0, mat(n), mat(n))),
+    "l1m.setm": lambda n: (blis_l1m.setm, (1.0, mat(n))),
+    "l1m.setrm": lambda n: (blis_l1m.setrm, (1.0, mat(n))),
+    "l1m.setim": lambda n: (blis_l1m.setim, (1.0, mat(n))),
+    "l1m.subm": lambda n: (blis_l1m.subm, (mat(n), mat(n))),
+    "l1d.addd": lambda n: (blis_l1d.addd, (mat(n), mat(n))),
+    "l1d.axpyd": lambda n: (blis_l1d.axpyd, (0.0, mat(n), mat(n))),
+    "l1d.copyd": lambda n: (blis_l1d.coypd, (mat(n), mat(n))),
+    "l1d.invertd": lambda n: (blis_l1d.invertd, (mat(n),)),
+    "l1d.scald": lambda n: (blis_l1d.scald, (1.0, mat(n))),
+    "l1d.scal2d": lambda n: (blis_l1d.scal2d, (1.0, mat(n), mat(n))),
+    "l1d.setd": lambda n: (blis_l1d.setd, (1.0, mat(n))),
+    "l1d.setrd": lambda n: (blis_l1d.setrd, (1.0, mat(n))),
+    "l1d.setid": lambda n: (blis_l1d.setid, (1.0, mat(n))),
+    "l1d.shiftd": lambda n: (blis_l1d.shiftd, (0.0, mat(n))),
+    "l1d.subd": lambda n: (blis_l1d.subd, (mat(n), mat(n))),
+    "l1d.xpbyd": lambda n: (blis_l1d.xpbyd, (mat(n), 0.0, mat(n))),
+    "l3.gemm": lambda n: (blis_l3.gemm, (1.0, mat(n), mat(n), 0.0, mat(n))),
+    "l3.gemmt": lambda n: (blis_l3.gemmt, (1.0, mat(n), mat(n), 0.0, mat(n))),
+    "l3.hemm": lambda n: (blis_l3.hemm, (1.0, mat(n), mat(n), 0.0, mat(n))),
+    "l3.herk": lambda n: (blis_l3.herk, (1.0, mat(n), 0.0, mat(n))),
+    "l3.her2k": lambda n: (blis_l3.her2k, (1.0, mat(n), mat(n), 0.0, mat(n))),
+    "l3.symm": lambda n: (blis_l3.symm, (1.0, mat(n), mat(n), 0.0, mat(n))),
+    "l3.syrk": lambda n: (blis_l3.syrk, (1.0, mat(n), 0.0, mat(n))),
+    "l3.syr2k": lambda n: (blis_l3.syr2k, (1.0, mat(n), mat(n), 0.0, mat(n))),
+    "l3.trmm": lambda n: (blis_l3.trmm, (1.0, np.eye(n), mat(n))),
+    "l3.trmm3": lambda n: (blis_l3.trmm3, (1.0, np.eye(n), mat(n), 0.0, mat(n))),
+    "l3.trsm": lambda n: (blis_l3.trsm, (1.0, np.eye(n), mat(n))),
+}
+
+
+_template = core._obj_t()
+
+
+def reference():
+    # Python-level work of the same kind as the wrappers do: build a ctypes
+    # object and make a foreign call. It scales with machine load much like
+    # the wrappers, unlike a bare foreign call.
+    obj = core._obj_t.from_buffer_copy(_template)
+    libblis.bli_info_get_int_type_size()
+    return ctypes.byref(obj)
+
+
+def measure(sizes, rounds=15, number=50):
+    # Every call is timed once per round and the best round is kept, so a
+    # slow spell on a busy machine cannot skew some entries but not others.
+    calls = {"reference": (reference, ())}
+    skipped = {}
+    for name, make in CALLS.items():
+        for n in sizes:
+            fn, args = make(n)
+            try:
+                fn(*args)
+            except (AssertionError, AttributeError, ValueError) as err:
+                # Not supported by this BLIS build or for these operands.
+                skipped[name] = f"{type(err).__name__}: {err}"
+                break
+            calls[f"{name}[{n}]"] = (fn, args)
+
+    best = dict.fromkeys(calls, float("inf"))
+    for _ in range(rounds):
+        for key, (fn, args) in calls.items():
+            seconds = timeit.timeit(lambda fn=fn, args=args: fn(*args), number=number)
+            best[key] = min(best[key], seconds / number)
+
+    ref_seconds = best.pop("reference")
+    results = {
+        key: {"seconds": seconds, "relative": seconds / ref_seconds}
+        for key, seconds in best.items()
+    }
+    return ref_seconds, results, skipped
+
+
+def compare(results, baseline, threshold):
+    # Compare each function by the median over sizes, which is much less
+    # noisy than any single timing. Timings without a baseline entry are
+    # returned too, so that a new wrapper cannot go ungated.
+    ratios = {}
+    missing = []
+    for key, result in results.items():
+        if key not in baseline:
+            missing.append(key)
+            continue
+        name = key.split("[")[0]
+        ratio = result["relative"] / baseline[key]["relative"]
+        ratios.setdefault(name, []).append(ratio)
+    regressions = [
+        (name, float(np.median(values)))
+        for name, values in ratios.items()
+        if np.median(values) > 1 + threshold
+    ]
+    return regressions, missing
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--save", help="Write the results to this JSON file")
+    parser.add_argument("--baseline", help="Compare against this JSON file")
+    parser.add_argument("--threshold", type=float, default=0.25)
+    args = parser.parse_args()
+
+    ref_seconds, results, skipped = measure(args.sizes)
+    baseline = {}
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())["results"]
+
+    print(f"reference call: {ref_seconds * 1e6:.2f} us")
+    print(f"{'call':<20}{'us':>9}{'x ref':>10}{'vs base':>9}")
+    for key, result in results.items():
+        ratio = ""
+        if key in baseline:
+            ratio = f"{result['relative'] / baseline[key]['relative']:>9.2f}"
+        print(
+            f"{key:<20}{result['seconds'] * 1e6:>9.2f}"
+            f"{result['relative']:>10.1f}{ratio}"
+        )
+    for name, reason in skipped.items():
+        print(f"{name:<20}skipped ({reason})")
+
+    if args.save:
+        Path(args.save).write_text(
+            json.dumps({"reference": ref_seconds, "results": results}, indent=1) + "\n"
+        )
+
+    if not args.baseline:
+        return
+    regressions, missing = compare(results, baseline, args.threshold)
+    if missing:
+        print(f"\nNot in the baseline {args.baseline} (regenerate it with --save):")
+        for key in missing:
+            print(f"  {key}")
+    if regressions:
+        print(f"\nOverhead regressed by more than {args.threshold:.0%}:")
+        for key, ratio in regressions:
+            print(f"  {key}: {ratio:.2f}x baseline")
+    if missing or regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Time starting a Python process that imports pyblis, against one that only
+imports numpy, and the first BLIS call after the import, which loads and
+initializes the library. "cold" runs with an empty cache directory, so the
+import has to find the library; "warm" reuses what the first run recorded.
+
+    python benchmarks/bench_startup.py [--repeat 20] [--module pyblis]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+# Prints the import and first-call times of the process itself, so that
+# interpreter startup is not counted.
+_PROBE = """
+import time
+t0 = time.perf_counter()
+import numpy as np
+t1 = time.perf_counter()
+import {module}
+t2 = time.perf_counter()
+from pyblis import blis_l1v
+blis_l1v.dotv(np.ones(4), np.ones(4))
+t3 = time.perf_counter()
+print(t1 - t0, t2 - t1, t3 - t2)
+"""
+
+
+def run(module, cache_dir):
+    env = {**os.environ, "PYBLIS_CACHE_DIR": cache_dir}
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(module=module)],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return [float(t) for t in out.split()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--module", default="pyblis")
+    args = parser.parse_args()
+
+    print(f"{'cache':<6}{'numpy [ms]':>12}{'import [ms]':>13}{'first call [ms]':>17}")
+    for label in ("cold", "warm"):
+        times = []
+        with tempfile.TemporaryDirectory() as cache_dir:
+            if label == "warm":
+                run(args.module, cache_dir)
+            for _ in range(args.repeat):
+                if label == "cold":
+                    with tempfile.TemporaryDirectory() as fresh:
+                        times.append(run(args.module, fresh))
+                else:
+                    times.append(run(args.module, cache_dir))
+        numpy_t, import_t, call_t = (statistics.median(col) for col in zip(*times))
+        print(
+            f"{label:<6}{numpy_t * 1e3:>12.1f}{import_t * 1e3:>13.1f}"
+            f"{call_t * 1e3:>17.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -44,6 +44,22 @@ def tests(session: nox.Session) -> None:
     session.run("pytest", *session.posargs)
 
 
+@nox.session
+def overhead(session: nox.Session) -> None:
+    """
+    Check the per-call wrapper overhead against the stored baseline. Pass
+    "--save benchmarks/overhead_baseline.json" to record a new baseline.
+    """
+    session.install(".")
+    session.run(
+        "python",
+        "benchmarks/bench_overhead.py",
+        "--baseline",
+        "benchmarks/overhead_baseline.json",
+        *session.posargs,
+    )
+
+
 @nox.session(reuse_venv=True)
 def docs(session: nox.Session) -> None:
     """
@@ -4,6 +4,22 @@ Copyright (c) 2024 Christopher Hillenbrand. All rights reserved.
 pyblis: Low-level Python wrapper for BLIS!
 """
 
+from pyblis.core import LayoutWarning
+from pyblis.linalg import dot, matmul, override
+from pyblis.profiler import profile
+from pyblis.rntm import Rntm, threads
+from pyblis.trace import trace
+
 __version__ = "0.1.0"
 
-__all__ = ["__version__"]
+__all__ = [
+    "LayoutWarning",
+    "Rntm",
+    "__version__",
+    "dot",
+    "matmul",
+    "override",
+    "profile",
+    "threads",
+    "trace",
+]
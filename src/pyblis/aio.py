@@ -0,0 +1,145 @@
+import asyncio
+import contextvars
+import functools
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+from pyblis import blis_l1d, blis_l1m, blis_l1v, blis_l3, core
+from pyblis.rntm import Rntm
+
+_pool = None
+_max_workers = None
+_max_pending = None
+_job_rntm = None
+_semaphores = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+
+
+def configure(max_workers=None, max_pending=None):
+    """
+    Set the size of the worker pool (default: the number of cores) and the
+    number of calls allowed in flight per event loop (default: twice the
+    number of workers). Takes effect for calls made afterwards.
+
+    The cores are shared out among the workers: a call run without
+    ``rntm=`` or a ``pyblis.threads()`` setting gets cores // max_workers
+    BLIS threads, so that concurrent calls do not oversubscribe them.
+    """
+    global _pool, _max_workers, _max_pending, _job_rntm  # noqa: PLW0603
+    with _lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False)
+            _pool = None
+        _max_workers = max_workers
+        _max_pending = max_pending
+        _job_rntm = None
+        _semaphores.clear()
+
+
+def _get_pool():
+    global _pool, _max_workers, _max_pending, _job_rntm  # noqa: PLW0603
+    with _lock:
+        if _pool is None:
+            cores = core._get_num_cpus()
+            if _max_workers is None:
+                _max_workers = cores
+            if _max_pending is None:
+                _max_pending = 2 * _max_workers
+            _job_rntm = Rntm(num_threads=max(1, cores // _max_workers))
+            _pool = ThreadPoolExecutor(
+                max_workers=_max_workers, thread_name_prefix="pyblis-aio"
+            )
+        return _pool
+
+
+def _get_semaphore(loop):
+    with _lock:
+        sem = _semaphores.get(loop)
+        if sem is None:
+            sem = _semaphores[loop] = asyncio.Semaphore(_max_pending)
+        return sem
+
+
+async def run(fn, *args, **kwargs):
+    """
+    Run ``fn(*args, **kwargs)`` on the worker pool and return its result
+    once BLIS finishes, without blocking the event loop.
+
+    The pool job holds the operands until BLIS is done with them, even if
+    the awaiting task is cancelled. At most ``max_pending`` calls per event
+    loop are in flight; further calls wait for a slot before submitting.
+    The caller's ``pyblis.threads()`` setting carries over to the call;
+    without one, the call gets its worker's share of the cores.
+    """
+    pool = _get_pool()
+    loop = asyncio.get_running_loop()
+    sem = _get_semaphore(loop)
+    await sem.acquire()
+    ctx = contextvars.copy_context()
+    if ctx.get(core._rntm_context) is None:
+        ctx.run(core._rntm_context.set, _job_rntm)
+    try:
+        future = pool.submit(ctx.run, fn, *args, **kwargs)
+    except BaseException:
+        sem.release()
+        raise
+    # Free the slot when BLIS finishes, not when the awaiting task does.
+    future.add_done_callback(lambda _: loop.call_soon_threadsafe(sem.release))
+    return await asyncio.wrap_future(future)
+
+
+def _awaitable(fn):
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        return await run(fn, *args, **kwargs)
+
+    return wrapper
+
+
+gemm = _awaitable(blis_l3.gemm)
+gemmt = _awaitable(blis_l3.gemmt)
+hemm = _awaitable(blis_l3.hemm)
+herk = _awaitable(blis_l3.herk)
+her2k = _awaitable(blis_l3.her2k)
+symm = _awaitable(blis_l3.symm)
+syrk = _awaitable(blis_l3.syrk)
+syr2k = _awaitable(blis_l3.syr2k)
+trmm = _awaitable(blis_l3.trmm)
+trmm3 = _awaitable(blis_l3.trmm3)
+trsm = _awaitable(blis_l3.trsm)
+
+addv = _awaitable(blis_l1v.addv)
+amaxv = _awaitable(blis_l1v.amaxv)
+axpyv = _awaitable(blis_l1v.axpyv)
+axpbyv = _awaitable(blis_l1v.axpbyv)
+copyv = _awaitable(blis_l1v.copyv)
+dotv = _awaitable(blis_l1v.dotv)
+dotxv = _awaitable(blis_l1v.dotxv)
+invertv = _awaitable(blis_l1v.invertv)
+scalv = _awaitable(blis_l1v.scalv)
+scal2v = _awaitable(blis_l1v.scal2v)
+setv = _awaitable(blis_l1v.setv)
+subv = _awaitable(blis_l1v.subv)
+swapv = _awaitable(blis_l1v.swapv)
+axpy2v = _awaitable(blis_l1v.axpy2v)
+dotaxpyv = _awaitable(blis_l1v.dotaxpyv)
+
+axpym = _awaitable(blis_l1m.axpym)
+copym = _awaitable(blis_l1m.copym)
+scalm = _awaitable(blis_l1m.scalm)
+scal2m = _awaitable(blis_l1m.scal2m)
+setm = _awaitable(blis_l1m.setm)
+subm = _awaitable(blis_l1m.subm)
+
+addd = _awaitable(blis_l1d.addd)
+axpyd = _awaitable(blis_l1d.axpyd)
+copyd = _awaitable(blis_l1d.coypd)
+invertd = _awaitable(blis_l1d.invertd)
+scald = _awaitable(blis_l1d.scald)
+scal2d = _awaitable(blis_l1d.scal2d)
+setd = _awaitable(blis_l1d.setd)
+setid = _awaitable(blis_l1d.setid)
+shiftd = _awaitable(blis_l1d.shiftd)
+subd = _awaitable(blis_l1d.subd)
+xpbyd = _awaitable(blis_l1d.xpbyd)
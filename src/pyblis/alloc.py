@@ -0,0 +1,198 @@
+import mmap
+import threading
+import weakref
+from collections import namedtuple
+from contextlib import contextmanager, suppress
+
+import numpy as np
+
+CACHE_LINE = 64
+PAGE_SIZE = mmap.PAGESIZE
+HUGE_PAGE_SIZE = 2 << 20
+DEFAULT_MAX_POOLED = 256 << 20
+
+PoolStats = namedtuple(
+    "PoolStats", ["in_use_bytes", "pooled_bytes", "hits", "misses", "peak_bytes"]
+)
+
+
+def size_class(nbytes):
+    """
+    The pooled size ``nbytes`` is rounded up to: eight classes per power of
+    two, so at most 12.5% of a buffer is wasted.
+    """
+    if nbytes <= CACHE_LINE:
+        return CACHE_LINE
+    step = 1 << max((nbytes - 1).bit_length() - 3, 6)
+    return -(-nbytes // step) * step
+
+
+def _raw_buffer(nbytes, alignment, hugepages):
+    # A uint8 array holding at least nbytes bytes, and its aligned offset.
+    if hugepages and nbytes >= HUGE_PAGE_SIZE and hasattr(mmap, "MADV_HUGEPAGE"):
+        # Mappings are page-aligned; coarser alignments need the slack.
+        mem = mmap.mmap(-1, nbytes + (alignment if alignment > PAGE_SIZE else 0))
+        with suppress(OSError):
+            mem.madvise(mmap.MADV_HUGEPAGE)
+        raw = np.frombuffer(mem, dtype=np.uint8)
+    else:
+        raw = np.empty(nbytes + alignment, dtype=np.uint8)
+    return raw, -raw.ctypes.data % alignment
+
+
+class _Block:
+    # The base object of every array handed out by a pool. It is not an
+    # ndarray, so views of pooled arrays keep it (and not the raw buffer)
+    # alive, and the buffer returns to the pool only when the last view
+    # is gone.
+    def __init__(self, raw, offset, shape, dtype, strides):
+        self._raw = raw
+        self.__array_interface__ = {
+            "version": 3,
+            "shape": shape,
+            "typestr": dtype.str,
+            "descr": dtype.descr,
+            "data": (raw.ctypes.data + offset, False),
+            "strides": strides,
+        }
+
+
+class Pool:
+    """
+    Hands out aligned NumPy arrays backed by buffers that are recycled
+    through per-size-class free lists instead of going back to malloc.
+
+    A buffer returns to the pool when the last array viewing it is garbage
+    collected, or at once through :meth:`release` or :meth:`buffer`. Up to
+    ``max_pooled`` bytes of free buffers are kept. With ``hugepages``,
+    buffers of 2 MiB and more are mapped separately and advised to use
+    transparent huge pages where the OS supports it.
+    """
+
+    def __init__(
+        self, alignment=CACHE_LINE, max_pooled=DEFAULT_MAX_POOLED, hugepages=False
+    ):
+        if alignment <= 0 or alignment & (alignment - 1):
+            msg = f"Alignment must be a power of two, got {alignment}"
+            raise ValueError(msg)
+        self.alignment = alignment
+        self.max_pooled = max_pooled
+        self.hugepages = hugepages
+        self._free = {}
+        self._lock = threading.RLock()
+        self._in_use = 0
+        self._pooled = 0
+        self._peak = 0
+        self.hits = 0
+        self.misses = 0
+
+    def empty(self, shape, dtype=np.float64, order="C"):
+        dtype = np.dtype(dtype)
+        shape = (shape,) if isinstance(shape, int) else tuple(shape)
+        if order not in ("C", "F"):
+            msg = f"Unknown order: {order}"
+            raise ValueError(msg)
+        strides = []
+        stride = dtype.itemsize
+        for extent in reversed(shape) if order == "C" else shape:
+            strides.append(stride)
+            stride *= max(extent, 1)
+        if order == "C":
+            strides.reverse()
+        nbytes = size_class(stride)
+
+        with self._lock:
+            free = self._free.get(nbytes)
+            if free:
+                raw, offset = free.pop()
+                self._pooled -= nbytes
+                self.hits += 1
+            else:
+                raw = None
+                self.misses += 1
+            self._in_use += nbytes
+            self._peak = max(self._peak, self._in_use)
+        if raw is None:
+            raw, offset = _raw_buffer(nbytes, self.alignment, self.hugepages)
+
+        block = _Block(raw, offset, shape, dtype, tuple(strides))
+        block.finalizer = weakref.finalize(block, self._recycle, raw, offset, nbytes)
+        block.finalizer.atexit = False
+        return np.asarray(block)
+
+    def zeros(self, shape, dtype=np.float64, order="C"):
+        arr = self.empty(shape, dtype, order)
+        arr[...] = 0
+        return arr
+
+    def empty_like(self, arr, dtype=None):
+        order = "F" if arr.flags.f_contiguous and not arr.flags.c_contiguous else "C"
+        return self.empty(arr.shape, arr.dtype if dtype is None else dtype, order)
+
+    def release(self, arr):
+        """
+        Return the buffer behind ``arr`` to the pool now. Every array
+        viewing it, ``arr`` included, must no longer be used.
+        """
+        block = arr.base
+        while isinstance(block, np.ndarray):
+            block = block.base
+        if not isinstance(block, _Block):
+            msg = "Array was not allocated from a pool"
+            raise TypeError(msg)
+        block.finalizer()
+
+    @contextmanager
+    def buffer(self, shape, dtype=np.float64, order="C"):
+        """A temporary array, returned to the pool when the block exits."""
+        arr = self.empty(shape, dtype, order)
+        try:
+            yield arr
+        finally:
+            self.release(arr)
+
+    def _recycle(self, raw, offset, nbytes):
+        with self._lock:
+            self._in_use -= nbytes
+            if self._pooled + nbytes <= self.max_pooled:
+                self._free.setdefault(nbytes, []).append((raw, offset))
+                self._pooled += nbytes
+
+    def stats(self):
+        with self._lock:
+            return PoolStats(
+                self._in_use, self._pooled, self.hits, self.misses, self._peak
+            )
+
+    def clear(self):
+        """Drop every pooled buffer, leaving the ones in use alone."""
+        with self._lock:
+            self._free.clear()
+            self._pooled = 0
+
+
+default_pool = Pool()
+
+
+def empty(shape, dtype=np.float64, order="C"):
+    return default_pool.empty(shape, dtype, order)
+
+
+def zeros(shape, dtype=np.float64, order="C"):
+    return default_pool.zeros(shape, dtype, order)
+
+
+def empty_like(arr, dtype=None):
+    return default_pool.empty_like(arr, dtype)
+
+
+def release(arr):
+    default_pool.release(arr)
+
+
+def buffer(shape, dtype=np.float64, order="C"):
+    return default_pool.buffer(shape, dtype, order)
+
+
+def stats():
+    return default_pool.stats()
@@ -0,0 +1,232 @@
+"""
+Per-shape threading for the level-3 operations, tuned on this host.
+
+:func:`tune` times an operation of a given shape and datatype under the
+default threading and under each way of splitting a number of threads
+over the jc, ic and jr loops, and keeps the fastest. Results are saved
+to ``autotune.json`` in ``$PYBLIS_CACHE_DIR`` (by default
+``~/.cache/pyblis``), keyed by the CPU model, BLIS version and
+sub-configuration. gemm, gemmt, herk and syrk called without ``rntm=``,
+outside :func:`pyblis.threads`, run with the tuned threading for their
+shape. Set PYBLIS_AUTOTUNE=0 to ignore the saved results.
+"""
+
+import json
+import os
+import platform
+import threading
+import timeit
+from functools import partial
+from pathlib import Path
+
+import numpy as np
+
+from pyblis import blis_l3, core, hooks
+from pyblis.core import libblis
+from pyblis.rntm import Rntm
+
+OPS = ("gemm", "gemmt", "herk", "syrk")
+
+_tuned = None
+_lock = threading.Lock()
+
+
+def cache_path():
+    return core.cache_dir() / "autotune.json"
+
+
+def cpu_model():
+    try:
+        with Path("/proc/cpuinfo").open() as f:
+            for line in f:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor() or platform.machine()
+
+
+def host_key():
+    """The key results are saved under: CPU model, BLIS version and arch."""
+    arch = core.arch_names()[libblis.bli_arch_query_id()]
+    version = libblis.bli_info_get_version_str().decode()
+    return f"{cpu_model()} / BLIS {version} / {arch}"
+
+
+def _entry_key(op, shape, typechar):
+    return f"{op} {typechar} {'x'.join(map(str, shape))}"
+
+
+def _parse_entry_key(key):
+    op, typechar, shape = key.split()
+    return op, tuple(int(n) for n in shape.split("x")), typechar
+
+
+def _read_cache():
+    try:
+        with cache_path().open() as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _load():
+    global _tuned  # noqa: PLW0603
+    tuned = {}
+    if os.environ.get("PYBLIS_AUTOTUNE", "1") != "0":
+        for key, setting in _read_cache().get(host_key(), {}).items():
+            tuned[_parse_entry_key(key)] = None if setting is None else Rntm(**setting)
+    _tuned = tuned
+    return tuned
+
+
+def reload():
+    """Re-read the saved results, e.g. after changing PYBLIS_CACHE_DIR."""
+    return len(_load())
+
+
+def lookup(op, shape, typechar):
+    """
+    The tuned Rntm for an operation, or None to run it with the default
+    threading: nothing is tuned for it, the default won, or a
+    :func:`pyblis.threads` block is active.
+    """
+    tuned = _tuned if _tuned is not None else _load()
+    if not tuned or core._rntm_context.get() is not None:
+        return None
+    return tuned.get((op, shape, typechar))
+
+
+def rntm_for(op, a, c, transa, typechar):
+    """:func:`lookup` for a call of ``op`` with operands ``a`` and ``c``."""
+    tuned = _tuned if _tuned is not None else _load()
+    if not tuned:
+        return None
+    k = a.shape[0] if transa else a.shape[1]
+    shape = (*c.shape, k) if op == "gemm" else (c.shape[0], k)
+    return lookup(op, shape, typechar)
+
+
+def _call_rntm(op, bound):
+    # The tuned rntm of an instrumented call, so that its record shows the
+    # threads the call ran with.
+    dtypes = [bound[name].dtype for name in ("a", "b", "c") if name in bound]
+    typechar = np.result_type(*dtypes).char
+    return rntm_for(op, bound["a"], bound["c"], bound.get("transa", False), typechar)
+
+
+for _op in OPS:
+    hooks.set_default_rntm(_op, partial(_call_rntm, _op))
+
+
+def clear():
+    """Forget every result for this host, in memory and on disk."""
+    with _lock:
+        cache = _read_cache()
+        if cache.pop(host_key(), None) is not None:
+            _write_cache(cache)
+        _load()
+
+
+def _write_cache(cache):
+    path = cache_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with tmp.open("w") as f:
+        json.dump(cache, f, indent=1, sort_keys=True)
+    tmp.replace(path)
+
+
+def _save(op, shape, typechar, setting):
+    with _lock:
+        cache = _read_cache()
+        cache.setdefault(host_key(), {})[_entry_key(op, shape, typechar)] = setting
+        _write_cache(cache)
+
+
+def _divisors(n):
+    return [d for d in range(1, n + 1) if n % d == 0]
+
+
+def candidates(thread_counts):
+    """
+    The settings :func:`tune` tries: None (the default threading), then
+    per thread count BLIS's own factorization and every (jc, ic, jr) split.
+    """
+    yield None
+    for nt in thread_counts:
+        yield {"num_threads": nt}
+        if nt == 1:
+            continue
+        for jc in _divisors(nt):
+            for ic in _divisors(nt // jc):
+                yield {"ways": [jc, 1, ic, nt // (jc * ic), 1]}
+
+
+def _default_thread_counts():
+    most = max(1, libblis.bli_thread_get_num_threads())
+    counts = [1 << i for i in range(most.bit_length()) if 1 << i < most]
+    return [*counts, most]
+
+
+def _runner(op, shape, dtype):
+    # A callable running op on fresh operands of the given shape.
+    rng = np.random.default_rng(0)
+    if op == "gemm":
+        m, n, k = shape
+        a = rng.random((m, k)).astype(dtype)
+        b = rng.random((k, n)).astype(dtype)
+        c = np.zeros((m, n), dtype=dtype)
+        return lambda rntm: blis_l3.gemm(1.0, a, b, 0.0, c, rntm=rntm)
+    n, k = shape
+    a = rng.random((n, k)).astype(dtype)
+    c = np.zeros((n, n), dtype=dtype)
+    if op == "gemmt":
+        b = rng.random((k, n)).astype(dtype)
+        return lambda rntm: blis_l3.gemmt(1.0, a, b, 0.0, c, rntm=rntm)
+    fn = getattr(blis_l3, op)
+    return lambda rntm: fn(1.0, a, 0.0, c, rntm=rntm)
+
+
+def tune(op, shape, dtype="d", thread_counts=None, repeat=3, save=True):
+    """
+    Time ``op`` for ``shape`` ((m, n, k) for gemm, (n, k) for the others,
+    with C n x n) and ``dtype`` under each of :func:`candidates`, remember
+    the fastest setting and return it as a Rntm, or None if the default
+    threading won. ``thread_counts`` defaults to the powers of two below
+    the global thread count and that count itself.
+    """
+    if op not in OPS:
+        msg = f"Cannot tune {op}, expected one of {OPS}"
+        raise ValueError(msg)
+    shape = tuple(int(n) for n in shape)
+    if len(shape) != (3 if op == "gemm" else 2):
+        msg = f"Expected a shape of {'(m, n, k)' if op == 'gemm' else '(n, k)'}"
+        raise ValueError(msg)
+    typechar = np.dtype(dtype).char
+    if typechar not in ("f", "d", "F", "D"):
+        msg = f"Unsupported dtype: {dtype}"
+        raise ValueError(msg)
+    if thread_counts is None:
+        thread_counts = _default_thread_counts()
+
+    tuned = _tuned if _tuned is not None else _load()
+    # Time the default threading itself, not a previously tuned setting.
+    tuned.pop((op, shape, typechar), None)
+    run = _runner(op, shape, typechar)
+    run(None)
+    number, _ = timeit.Timer(partial(run, None)).autorange()
+    # Aim for about 10 ms per measurement instead of autorange's 0.2 s.
+    number = max(1, number // 20)
+
+    best, best_time = None, float("inf")
+    for setting in candidates(thread_counts):
+        rntm = None if setting is None else Rntm(**setting)
+        seconds = min(timeit.repeat(partial(run, rntm), number=number, repeat=repeat))
+        if seconds < best_time:
+            best, best_time = setting, seconds
+
+    tuned[(op, shape, typechar)] = None if best is None else Rntm(**best)
+    if save:
+        _save(op, shape, typechar, best)
+    return tuned[(op, shape, typechar)]
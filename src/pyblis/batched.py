@@ -0,0 +1,153 @@
+import ctypes
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from pyblis import core
+from pyblis.plan import _FLAG_BITS, _resolve
+
+# Problems below this many flops run as single-threaded BLIS calls spread
+# over a worker pool (one matrix per core); larger ones run one after the
+# other, each using all of BLIS's threads. The crossover sits around
+# n = 384 for square gemm, where a multithreaded call starts to scale.
+POOL_FLOP_THRESHOLD = 2 * 384**3
+
+_pool = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    global _pool, _pool_workers  # noqa: PLW0603
+    with _pool_lock:
+        if _pool is None:
+            _pool_workers = core._get_num_cpus()
+            _pool = ThreadPoolExecutor(
+                max_workers=_pool_workers, thread_name_prefix="pyblis-batch"
+            )
+        return _pool, _pool_workers
+
+
+def batch_size(out, *inputs):
+    """
+    The common batch size of the operands. Inputs may be 2-D arrays, which
+    are broadcast over the batch; the output operand may not.
+    """
+    if _is_broadcast(out):
+        msg = "The output operand of a batched operation cannot be broadcast"
+        raise ValueError(msg)
+    sizes = {len(op) for op in (out, *inputs) if not _is_broadcast(op)}
+    if len(sizes) != 1:
+        msg = f"Inconsistent batch sizes: {sorted(sizes)}"
+        raise ValueError(msg)
+    return sizes.pop()
+
+
+def _is_broadcast(operand):
+    return isinstance(operand, np.ndarray) and operand.ndim == 2
+
+
+def batch_item_shape(operand):
+    return operand.shape[-2:] if isinstance(operand, np.ndarray) else operand[0].shape
+
+
+def batch_typechar(operand):
+    return (
+        operand.dtype.char if isinstance(operand, np.ndarray) else operand[0].dtype.char
+    )
+
+
+def batch_objs(operand, batch, bits, output=False):
+    """
+    One obj_t per batch item, with the given info bits applied.
+
+    A 3-D array needs a single descriptor lookup; the others are copies of
+    it with the buffer pointer advanced by the batch stride. A 2-D array is
+    broadcast over the batch.
+    """
+    if _is_broadcast(operand):
+        obj = core.bli_obj_create_from(operand, output)
+        obj.info = (obj.info & ~_FLAG_BITS) | bits
+        return [obj] * batch
+    if isinstance(operand, np.ndarray):
+        assert operand.ndim == 3, f"ndim is {operand.ndim}, expected 3"
+        template = core.bli_obj_create_from(operand[0], output)
+        # Items that had to be copied get their own objects below.
+        if template.buffer == operand[0].ctypes.data:
+            template.info = (template.info & ~_FLAG_BITS) | bits
+            base = template.buffer
+            stride = operand.strides[0]
+            objs = []
+            for i in range(batch):
+                obj = core._obj_t.from_buffer_copy(template)
+                obj.root = ctypes.addressof(obj)
+                obj.buffer = base + i * stride
+                objs.append(obj)
+            return objs
+    objs = []
+    for item in operand:
+        obj = core.bli_obj_create_from(item, output)
+        obj.info = (obj.info & ~_FLAG_BITS) | bits
+        objs.append(obj)
+    return objs
+
+
+def batch_scalars(value, batch, typechar):
+    if typechar in ("f", "d") and np.iscomplexobj(value):
+        if np.any(np.imag(value) != 0):
+            msg = f"Complex scalars {value} require a complex dtype"
+            raise ValueError(msg)
+        value = np.real(value)
+    if np.ndim(value) == 0:
+        return [core.bli_scalar(value, typechar)] * batch
+    if len(value) != batch:
+        msg = f"Expected {batch} scalars, got {len(value)}"
+        raise ValueError(msg)
+    return [core.bli_createscalar(v, typechar) for v in value]
+
+
+def run_batched(opname, calls, flops, side=None, mode=None, rntm=None):
+    """
+    Run ``bli_<opname>_ex`` once per entry of ``calls`` (each a tuple of
+    scalar and operand objects in BLIS argument order).
+
+    ``mode`` is "pool" (single-threaded calls spread over a worker pool),
+    "serial" (one multithreaded call after another) or None to choose by
+    the flop count of one problem. ``rntm`` applies to the serial mode;
+    pool workers always run single-threaded.
+    """
+    if not calls:
+        return
+    nobj = len(calls[0])
+    fn = _resolve(f"bli_{opname}_ex", nobj, side is not None)
+    lead = () if side is None else (side,)
+    if mode is None:
+        small = flops < POOL_FLOP_THRESHOLD and len(calls) > 1
+        mode = "pool" if small and _get_pool()[1] > 1 else "serial"
+
+    # The sup workaround for general strides then covers the whole batch.
+    objs = [obj for args in calls for obj in args]
+    if mode == "serial":
+        rntm = core.bli_rntm_arg(rntm, objs)
+        for args in calls:
+            fn(*lead, *args, None, rntm)
+        return
+    if mode != "pool":
+        msg = f"Unknown batch mode: {mode}"
+        raise ValueError(msg)
+
+    rntm = core.bli_rntm_arg(core.bli_rntm_create(num_threads=1), objs)
+
+    def run_chunk(chunk):
+        for args in chunk:
+            fn(*lead, *args, None, rntm)
+
+    pool, nworkers = _get_pool()
+    nchunks = min(nworkers, len(calls))
+    bounds = np.linspace(0, len(calls), nchunks + 1).astype(int)
+    futures = [
+        pool.submit(run_chunk, calls[lo:hi]) for lo, hi in zip(bounds[:-1], bounds[1:])
+    ]
+    for future in futures:
+        future.result()
@@ -2,6 +2,7 @@ import ctypes
 
 from pyblis import core
 from pyblis.core import libblis
+from pyblis.hooks import instrument
 
 
 def check_l1dargs(*args):
@@ -11,127 +12,199 @@ def check_l1dargs(*args):
     N = args[0].size
     c = args[0].dtype.type
     for a in args[1:]:
-        assert a.ndim == 1, f"ndim is {a.ndim}, expected 1"
+        assert a.ndim == 2, f"ndim is {a.ndim}, expected 2"
         assert a.size == N, f"size was {a.size}, expected {N}"
         assert a.dtype.type == c, f"dtype was {a.dtype.type}, expected {c}"
 
 
-def addd(a, b, diag_offset_a=0, unit_diag_a=False, transa=False, conja=False):
+@instrument
+def addd(
+    a, b, diag_offset_a=0, unit_diag_a=False, transa=False, conja=False, rntm=None
+):
     check_l1dargs(a, b)
     ao = core.bli_obj_create_from(a)
-    bo = core.bli_obj_create_from(b)
+    bo = core.bli_obj_create_from(b, output=True)
     core.bli_obj_set_conjtrans(core.get_blis_trans_t(transa, conja), ao)
     core.bli_obj_set_diag_offset(diag_offset_a, ao)
     if unit_diag_a:
         core.bli_obj_set_diag(core.BLIS_UNIT_DIAG, ao)
 
-    libblis.bli_addd(ctypes.byref(ao), ctypes.byref(bo))
-
-
-def axpyd(alpha, a, b, diag_offset_a=0, unit_diag_a=False, transa=False, conja=False):
+    libblis.bli_addd_ex(
+        ctypes.byref(ao), ctypes.byref(bo), None, core.bli_rntm_arg(rntm)
+    )
+
+
+@instrument
+def axpyd(
+    alpha,
+    a,
+    b,
+    diag_offset_a=0,
+    unit_diag_a=False,
+    transa=False,
+    conja=False,
+    rntm=None,
+):
     check_l1dargs(a, b)
-    objalpha = core.bli_createscalar(alpha)
+    objalpha = core.bli_scalar(alpha, b.dtype.char)
     ao = core.bli_obj_create_from(a)
-    bo = core.bli_obj_create_from(b)
+    bo = core.bli_obj_create_from(b, output=True)
     core.bli_obj_set_conjtrans(core.get_blis_trans_t(transa, conja), ao)
     core.bli_obj_set_diag_offset(diag_offset_a, ao)
     if unit_diag_a:
         core.bli_obj_set_diag(core.BLIS_UNIT_DIAG, ao)
 
-    libblis.bli_axpyd(ctypes.byref(objalpha), ctypes.byref(ao), ctypes.byref(bo))
+    libblis.bli_axpyd_ex(
+        ctypes.byref(objalpha),
+        ctypes.byref(ao),
+        ctypes.byref(bo),
+        None,
+        core.bli_rntm_arg(rntm),
+    )
 
 
-def coypd(a, b, diag_offset_a=0, unit_diag_a=False, transa=False, conja=False):
+@instrument(name="copyd")
+def coypd(
+    a, b, diag_offset_a=0, unit_diag_a=False, transa=False, conja=False, rntm=None
+):
     check_l1dargs(a, b)
     ao = core.bli_obj_create_from(a)
-    bo = core.bli_obj_create_from(b)
+    bo = core.bli_obj_create_from(b, output=True)
     core.bli_obj_set_conjtrans(core.get_blis_trans_t(transa, conja), ao)
     core.bli_obj_set_diag_offset(diag_offset_a, ao)
     if unit_diag_a:
         core.bli_obj_set_diag(core.BLIS_UNIT_DIAG, ao)
 
-    libblis.bli_copyd(ctypes.byref(ao), ctypes.byref(bo))
+    libblis.bli_copyd_ex(
+        ctypes.byref(ao), ctypes.byref(bo), None, core.bli_rntm_arg(rntm)
+    )
 
 
-def invertd(a, diag_offset_a=0):
-    ao = core.bli_obj_create_from(a)
+@instrument
+def invertd(a, diag_offset_a=0, rntm=None):
+    ao = core.bli_obj_create_from(a, output=True)
     core.bli_obj_set_diag_offset(diag_offset_a, ao)
-    libblis.bli_invertd(ctypes.byref(ao))
+    libblis.bli_invertd_ex(ctypes.byref(ao), None, core.bli_rntm_arg(rntm))
 
 
-def scald(alpha, a, diag_offset_a=0, unit_diag_a=False, transa=False, conja=False):
+@instrument
+def scald(
+    alpha, a, diag_offset_a=0, unit_diag_a=False, transa=False, conja=False, rntm=None
+):
     check_l1dargs(a)
-    objalpha = core.bli_createscalar(alpha)
-    ao = core.bli_obj_create_from(a)
+    objalpha = core.bli_scalar(alpha, a.dtype.char)
+    ao = core.bli_obj_create_from(a, output=True)
     core.bli_obj_set_conjtrans(core.get_blis_trans_t(transa, conja), ao)
     core.bli_obj_set_diag_offset(diag_offset_a, ao)
     if unit_diag_a:
         core.bli_obj_set_diag(core.BLIS_UNIT_DIAG, ao)
 
-    libblis.bli_scald(ctypes.byref(objalpha), ctypes.byref(ao))
-
-
-def scal2d(alpha, a, b, diag_offset_a=0, unit_diag_a=False, transa=False, conja=False):
+    libblis.bli_scald_ex(
+        ctypes.byref(objalpha), ctypes.byref(ao), None, core.bli_rntm_arg(rntm)
+    )
+
+
+@instrument
+def scal2d(
+    alpha,
+    a,
+    b,
+    diag_offset_a=0,
+    unit_diag_a=False,
+    transa=False,
+    conja=False,
+    rntm=None,
+):
     check_l1dargs(a, b)
-    objalpha = core.bli_createscalar(alpha)
+    objalpha = core.bli_scalar(alpha, b.dtype.char)
     ao = core.bli_obj_create_from(a)
-    bo = core.bli_obj_create_from(b)
+    bo = core.bli_obj_create_from(b, output=True)
     core.bli_obj_set_conjtrans(core.get_blis_trans_t(transa, conja), ao)
     core.bli_obj_set_diag_offset(diag_offset_a, ao)
     if unit_diag_a:
         core.bli_obj_set_diag(core.BLIS_UNIT_DIAG, ao)
 
-    libblis.bli_scal2d(ctypes.byref(objalpha), ctypes.byref(ao), ctypes.byref(bo))
+    libblis.bli_scal2d_ex(
+        ctypes.byref(objalpha),
+        ctypes.byref(ao),
+        ctypes.byref(bo),
+        None,
+        core.bli_rntm_arg(rntm),
+    )
 
 
-def setd(alpha, a, diag_offset_a=0):
-    objalpha = core.bli_createscalar(alpha)
-    ao = core.bli_obj_create_from(a)
+@instrument
+def setd(alpha, a, diag_offset_a=0, rntm=None):
+    objalpha = core.bli_scalar(alpha, a.dtype.char)
+    ao = core.bli_obj_create_from(a, output=True)
     core.bli_obj_set_diag_offset(diag_offset_a, ao)
-    libblis.bli_setd(ctypes.byref(objalpha), ctypes.byref(ao))
+    libblis.bli_setd_ex(
+        ctypes.byref(objalpha), ctypes.byref(ao), None, core.bli_rntm_arg(rntm)
+    )
 
 
+@instrument
 def setrd(alpha, a, diag_offset_a=0):
-    objalpha = core.bli_createscalar(alpha)
-    ao = core.bli_obj_create_from(a)
+    objalpha = core.bli_scalar(alpha, a.dtype.char)
+    ao = core.bli_obj_create_from(a, output=True)
     core.bli_obj_set_diag_offset(diag_offset_a, ao)
     libblis.bli_setrd(ctypes.byref(objalpha), ctypes.byref(ao))
 
 
-def setid(alpha, a, diag_offset_a=0):
-    objalpha = core.bli_createscalar(alpha)
-    ao = core.bli_obj_create_from(a)
+@instrument
+def setid(alpha, a, diag_offset_a=0, rntm=None):
+    objalpha = core.bli_scalar(alpha, a.dtype.char)
+    ao = core.bli_obj_create_from(a, output=True)
     core.bli_obj_set_diag_offset(diag_offset_a, ao)
-    libblis.bli_setid(ctypes.byref(objalpha), ctypes.byref(ao))
+    libblis.bli_setid_ex(
+        ctypes.byref(objalpha), ctypes.byref(ao), None, core.bli_rntm_arg(rntm)
+    )
 
 
-def shiftd(alpha, a, diag_offset_a=0):
-    objalpha = core.bli_createscalar(alpha)
-    ao = core.bli_obj_create_from(a)
+@instrument
+def shiftd(alpha, a, diag_offset_a=0, rntm=None):
+    objalpha = core.bli_scalar(alpha, a.dtype.char)
+    ao = core.bli_obj_create_from(a, output=True)
     core.bli_obj_set_diag_offset(diag_offset_a, ao)
-    libblis.bli_shiftd(ctypes.byref(objalpha), ctypes.byref(ao))
+    libblis.bli_shiftd_ex(
+        ctypes.byref(objalpha), ctypes.byref(ao), None, core.bli_rntm_arg(rntm)
+    )
 
 
-def subd(a, b, diag_offset_a=0, unit_diag_a=False, transa=False, conja=False):
+@instrument
+def subd(
+    a, b, diag_offset_a=0, unit_diag_a=False, transa=False, conja=False, rntm=None
+):
     check_l1dargs(a, b)
     ao = core.bli_obj_create_from(a)
-    bo = core.bli_obj_create_from(b)
+    bo = core.bli_obj_create_from(b, output=True)
     core.bli_obj_set_conjtrans(core.get_blis_trans_t(transa, conja), ao)
     core.bli_obj_set_diag_offset(diag_offset_a, ao)
     if unit_diag_a:
         core.bli_obj_set_diag(core.BLIS_UNIT_DIAG, ao)
 
-    libblis.bli_subd(ctypes.byref(ao), ctypes.byref(bo))
+    libblis.bli_subd_ex(
+        ctypes.byref(ao), ctypes.byref(bo), None, core.bli_rntm_arg(rntm)
+    )
 
 
-def xpbyd(a, beta, b, diag_offset_a=0, unit_diag_a=False, transa=False, conja=False):
+@instrument
+def xpbyd(
+    a, beta, b, diag_offset_a=0, unit_diag_a=False, transa=False, conja=False, rntm=None
+):
     check_l1dargs(a, b)
-    objbeta = core.bli_createscalar(beta)
+    objbeta = core.bli_scalar(beta, b.dtype.char)
     ao = core.bli_obj_create_from(a)
-    bo = core.bli_obj_create_from(b)
+    bo = core.bli_obj_create_from(b, output=True)
     core.bli_obj_set_conjtrans(core.get_blis_trans_t(transa, conja), ao)
     core.bli_obj_set_diag_offset(diag_offset_a, ao)
     if unit_diag_a:
         core.bli_obj_set_diag(core.BLIS_UNIT_DIAG, ao)
 
-    libblis.bli_xpbyd(ctypes.byref(ao), ctypes.byref(objbeta), ctypes.byref(bo))
+    libblis.bli_xpbyd_ex(
+        ctypes.byref(ao),
+        ctypes.byref(objbeta),
+        ctypes.byref(bo),
+        None,
+        core.bli_rntm_arg(rntm),
+    )
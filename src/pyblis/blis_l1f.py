@@ -0,0 +1,137 @@
+import ctypes
+from functools import lru_cache
+
+from pyblis import core
+from pyblis.blis_l2 import check_l2args
+from pyblis.core import libblis
+from pyblis.hooks import instrument
+
+
+@lru_cache(maxsize=None)
+def fusing_factor(name, typechar="d"):
+    """
+    The number of columns the level-1f kernel ``name`` ("af", "df" or
+    "xf") fuses, or None if the context cannot be read.
+    """
+    blocksizes = core.bli_blocksizes(typechar)
+    return None if blocksizes is None else blocksizes[name]
+
+
+def _panels(b, width):
+    # The kernels fall back to one level-1v call per column unless they get
+    # exactly their fusing factor of columns, so wider operands are handed
+    # over in panels of that width.
+    if width is None or b <= width:
+        return [slice(0, b)]
+    return [slice(j, min(j + width, b)) for j in range(0, b, width)]
+
+
+@instrument
+def axpyf(alpha, a, x, y, conja=False, conjx=False, rntm=None):
+    # y := y + alpha * conja(A) * conjx(x)
+    check_l2args(a, x, y)
+    m, b = a.shape
+    assert x.size == b, f"size was {x.size}, expected {b}"
+    assert y.size == m, f"size was {y.size}, expected {m}"
+    objalpha = core.bli_scalar(alpha, y.dtype.char)
+    yo = core.bli_obj_create_from(y, output=True)
+    rntm = core.bli_rntm_arg(rntm)
+    for cols in _panels(b, fusing_factor("af", y.dtype.char)):
+        ao = core.bli_obj_create_from(a[:, cols])
+        xo = core.bli_obj_create_from(x[cols])
+        if conja:
+            core.bli_obj_set_conj(core.BLIS_CONJUGATE, ao)
+        if conjx:
+            core.bli_obj_set_conj(core.BLIS_CONJUGATE, xo)
+        libblis.bli_axpyf_ex(
+            ctypes.byref(objalpha),
+            ctypes.byref(ao),
+            ctypes.byref(xo),
+            ctypes.byref(yo),
+            None,
+            rntm,
+        )
+
+
+@instrument
+def dotxf(alpha, a, x, beta, y, conjat=False, conjx=False, rntm=None):
+    # y := beta * y + alpha * conjat(A)^T * conjx(x)
+    check_l2args(a, x, y)
+    m, b = a.shape
+    assert x.size == m, f"size was {x.size}, expected {m}"
+    assert y.size == b, f"size was {y.size}, expected {b}"
+    objalpha = core.bli_scalar(alpha, y.dtype.char)
+    objbeta = core.bli_scalar(beta, y.dtype.char)
+    xo = core.bli_obj_create_from(x)
+    if conjx:
+        core.bli_obj_set_conj(core.BLIS_CONJUGATE, xo)
+    rntm = core.bli_rntm_arg(rntm)
+    for cols in _panels(b, fusing_factor("df", y.dtype.char)):
+        ao = core.bli_obj_create_from(a[:, cols])
+        yo = core.bli_obj_create_from(y[cols], output=True)
+        if conjat:
+            core.bli_obj_set_conj(core.BLIS_CONJUGATE, ao)
+        libblis.bli_dotxf_ex(
+            ctypes.byref(objalpha),
+            ctypes.byref(ao),
+            ctypes.byref(xo),
+            ctypes.byref(objbeta),
+            ctypes.byref(yo),
+            None,
+            rntm,
+        )
+
+
+@instrument
+def dotxaxpyf(
+    alpha,
+    a,
+    w,
+    x,
+    beta,
+    y,
+    z,
+    conjat=False,
+    conja=False,
+    conjw=False,
+    conjx=False,
+    rntm=None,
+):
+    # y := beta * y + alpha * conjat(A)^T * conjw(w)
+    # z :=        z + alpha * conja(A)    * conjx(x)
+    check_l2args(a, w, x, y, z)
+    m, b = a.shape
+    assert w.size == m, f"size was {w.size}, expected {m}"
+    assert x.size == b, f"size was {x.size}, expected {b}"
+    assert y.size == b, f"size was {y.size}, expected {b}"
+    assert z.size == m, f"size was {z.size}, expected {m}"
+    objalpha = core.bli_scalar(alpha, z.dtype.char)
+    objbeta = core.bli_scalar(beta, z.dtype.char)
+    wo = core.bli_obj_create_from(w)
+    zo = core.bli_obj_create_from(z, output=True)
+    if conjw:
+        core.bli_obj_set_conj(core.BLIS_CONJUGATE, wo)
+    rntm = core.bli_rntm_arg(rntm)
+    for cols in _panels(b, fusing_factor("xf", z.dtype.char)):
+        ato = core.bli_obj_create_from(a[:, cols])
+        ao = core.bli_obj_create_from(a[:, cols])
+        xo = core.bli_obj_create_from(x[cols])
+        yo = core.bli_obj_create_from(y[cols], output=True)
+        if conjat:
+            core.bli_obj_set_conj(core.BLIS_CONJUGATE, ato)
+        if conja:
+            core.bli_obj_set_conj(core.BLIS_CONJUGATE, ao)
+        if conjx:
+            core.bli_obj_set_conj(core.BLIS_CONJUGATE, xo)
+        libblis.bli_dotxaxpyf_ex(
+            ctypes.byref(objalpha),
+            ctypes.byref(ato),
+            ctypes.byref(ao),
+            ctypes.byref(wo),
+            ctypes.byref(xo),
+            ctypes.byref(objbeta),
+            ctypes.byref(yo),
+            ctypes.byref(zo),
+            None,
+            rntm,
+        )
@@ -2,6 +2,7 @@ import ctypes
 
 from pyblis import core
 from pyblis.core import libblis
+from pyblis.hooks import instrument
 
 
 def check_l1dargs(*args):
@@ -11,50 +12,98 @@ def check_l1dargs(*args):
     N = args[0].size
     c = args[0].dtype.type
     for a in args[1:]:
-        assert a.ndim == 1, f"ndim is {a.ndim}, expected 1"
+        assert a.ndim == 2, f"ndim is {a.ndim}, expected 2"
         assert a.size == N, f"size was {a.size}, expected {N}"
         assert a.dtype.type == c, f"dtype was {a.dtype.type}, expected {c}"
 
 
+@instrument
+def axpym(
+    alpha,
+    a,
+    b,
+    diag_offset_a=0,
+    unit_diag_a=False,
+    uplo_a="D",
+    transa=False,
+    conja=False,
+    rntm=None,
+):
+    check_l1dargs(a, b)
+    objalpha = core.bli_scalar(alpha, b.dtype.char)
+    ao = core.bli_obj_create_from(a)
+    bo = core.bli_obj_create_from(b, output=True)
+    core.bli_obj_set_conjtrans(core.get_blis_trans_t(transa, conja), ao)
+    core.bli_obj_set_diag_offset(diag_offset_a, ao)
+    core.bli_obj_set_uplo(core.get_blis_uplo_t(uplo_a), ao)
+    if unit_diag_a:
+        core.bli_obj_set_diag(core.BLIS_UNIT_DIAG, ao)
+
+    libblis.bli_axpym_ex(
+        ctypes.byref(objalpha),
+        ctypes.byref(ao),
+        ctypes.byref(bo),
+        None,
+        core.bli_rntm_arg(rntm),
+    )
+
+
+@instrument
 def copym(
-    a, b, diag_offset_a=0, unit_diag_a=False, uplo_a="D", transa=False, conja=False
+    a,
+    b,
+    diag_offset_a=0,
+    unit_diag_a=False,
+    uplo_a="D",
+    transa=False,
+    conja=False,
+    rntm=None,
 ):
     check_l1dargs(a, b)
     ao = core.bli_obj_create_from(a)
-    bo = core.bli_obj_create_from(b)
+    bo = core.bli_obj_create_from(b, output=True)
     core.bli_obj_set_conjtrans(core.get_blis_trans_t(transa, conja), ao)
     core.bli_obj_set_diag_offset(diag_offset_a, ao)
     core.bli_obj_set_uplo(core.get_blis_uplo_t(uplo_a), ao)
     if unit_diag_a:
         core.bli_obj_set_diag(core.BLIS_UNIT_DIAG, ao)
 
-    libblis.bli_copym(ctypes.byref(ao), ctypes.byref(bo))
+    libblis.bli_copym_ex(
+        ctypes.byref(ao), ctypes.byref(bo), None, core.bli_rntm_arg(rntm)
+    )
 
 
-def invscalm(alpha, a, diag_offset_a=0, unit_diag_a=False, uplo_a="D"):
+@instrument
+def invscalm(alpha, a, diag_offset_a=0, unit_diag_a=False, uplo_a="D", rntm=None):
     check_l1dargs(a)
-    objalpha = core.bli_createscalar(alpha)
-    ao = core.bli_obj_create_from(a)
+    objalpha = core.bli_scalar(alpha, a.dtype.char)
+    ao = core.bli_obj_create_from(a, output=True)
     core.bli_obj_set_diag_offset(diag_offset_a, ao)
     core.bli_obj_set_uplo(core.get_blis_uplo_t(uplo_a), ao)
     if unit_diag_a:
         core.bli_obj_set_diag(core.BLIS_UNIT_DIAG, ao)
 
-    libblis.bli_invscalm(ctypes.byref(objalpha), ctypes.byref(ao))
+    libblis.bli_invscalm_ex(
+        ctypes.byref(objalpha), ctypes.byref(ao), None, core.bli_rntm_arg(rntm)
+    )
 
 
-def scalm(alpha, a, diag_offset_a=0, unit_diag_a=False, uplo_a="D"):
+@instrument
+def scalm(alpha, a, diag_offset_a=0, unit_diag_a=False, uplo_a="D", rntm=None):
     check_l1dargs(a)
-    objalpha = core.bli_createscalar(alpha)
-    ao = core.bli_obj_create_from(a)
+    objalpha = core.bli_scalar(alpha, a.dtype.char)
+    ao = core.bli_obj_create_from(a, output=True)
     core.bli_obj_set_diag_offset(diag_offset_a, ao)
     core.bli_obj_set_uplo(core.get_blis_uplo_t(uplo_a), ao)
     if unit_diag_a:
         core.bli_obj_set_diag(core.BLIS_UNIT_DIAG, ao)
 
-    libblis.bli_scalm(ctypes.byref(objalpha), ctypes.byref(ao))
+    libblis.bli_scalm_ex(
+        ctypes.byref(objalpha), ctypes.byref(ao), None, core.bli_rntm_arg(rntm)
+    )
 
 
+@instrument
 def scal2m(
     alpha,
     a,
@@ -64,36 +113,47 @@ def scal2m(
     uplo_a="D",
     transa=False,
     conja=False,
+    rntm=None,
 ):
     check_l1dargs(a, b)
-    objalpha = core.bli_createscalar(alpha)
+    objalpha = core.bli_scalar(alpha, b.dtype.char)
     ao = core.bli_obj_create_from(a)
-    bo = core.bli_obj_create_from(b)
+    bo = core.bli_obj_create_from(b, output=True)
     core.bli_obj_set_conjtrans(core.get_blis_trans_t(transa, conja), ao)
     core.bli_obj_set_diag_offset(diag_offset_a, ao)
     core.bli_obj_set_uplo(core.get_blis_uplo_t(uplo_a), ao)
     if unit_diag_a:
         core.bli_obj_set_diag(core.BLIS_UNIT_DIAG, ao)
 
-    libblis.bli_scal2m(ctypes.byref(objalpha), ctypes.byref(ao), ctypes.byref(bo))
+    libblis.bli_scal2m_ex(
+        ctypes.byref(objalpha),
+        ctypes.byref(ao),
+        ctypes.byref(bo),
+        None,
+        core.bli_rntm_arg(rntm),
+    )
 
 
-def setm(alpha, a, diag_offset_a=0, unit_diag_a=False, uplo_a="D"):
+@instrument
+def setm(alpha, a, diag_offset_a=0, unit_diag_a=False, uplo_a="D", rntm=None):
     check_l1dargs(a)
-    objalpha = core.bli_createscalar(alpha)
-    ao = core.bli_obj_create_from(a)
+    objalpha = core.bli_scalar(alpha, a.dtype.char)
+    ao = core.bli_obj_create_from(a, output=True)
     core.bli_obj_set_diag_offset(diag_offset_a, ao)
     core.bli_obj_set_uplo(core.get_blis_uplo_t(uplo_a), ao)
     if unit_diag_a:
         core.bli_obj_set_diag(core.BLIS_UNIT_DIAG, ao)
 
-    libblis.bli_setm(ctypes.byref(objalpha), ctypes.byref(ao))
+    libblis.bli_setm_ex(
+        ctypes.byref(objalpha), ctypes.byref(ao), None, core.bli_rntm_arg(rntm)
+    )
 
 
+@instrument
 def setrm(alpha, a, diag_offset_a=0, unit_diag_a=False, uplo_a="D"):
     check_l1dargs(a)
-    objalpha = core.bli_createscalar(alpha)
-    ao = core.bli_obj_create_from(a)
+    objalpha = core.bli_scalar(alpha, a.dtype.char)
+    ao = core.bli_obj_create_from(a, output=True)
     core.bli_obj_set_diag_offset(diag_offset_a, ao)
     core.bli_obj_set_uplo(core.get_blis_uplo_t(uplo_a), ao)
     if unit_diag_a:
@@ -102,10 +162,11 @@ def setrm(alpha, a, diag_offset_a=0, unit_diag_a=False, uplo_a="D"):
     libblis.bli_setrm(ctypes.byref(objalpha), ctypes.byref(ao))
 
 
+@instrument
 def setim(alpha, a, diag_offset_a=0, unit_diag_a=False, uplo_a="D"):
     check_l1dargs(a)
-    objalpha = core.bli_createscalar(alpha)
-    ao = core.bli_obj_create_from(a)
+    objalpha = core.bli_scalar(alpha, a.dtype.char)
+    ao = core.bli_obj_create_from(a, output=True)
     core.bli_obj_set_diag_offset(diag_offset_a, ao)
     core.bli_obj_set_uplo(core.get_blis_uplo_t(uplo_a), ao)
     if unit_diag_a:
@@ -114,16 +175,26 @@ def setim(alpha, a, diag_offset_a=0, unit_diag_a=False, uplo_a="D"):
     libblis.bli_setim(ctypes.byref(objalpha), ctypes.byref(ao))
 
 
+@instrument
 def subm(
-    a, b, diag_offset_a=0, unit_diag_a=False, uplo_a="D", transa=False, conja=False
+    a,
+    b,
+    diag_offset_a=0,
+    unit_diag_a=False,
+    uplo_a="D",
+    transa=False,
+    conja=False,
+    rntm=None,
 ):
     check_l1dargs(a, b)
     ao = core.bli_obj_create_from(a)
-    bo = core.bli_obj_create_from(b)
+    bo = core.bli_obj_create_from(b, output=True)
     core.bli_obj_set_conjtrans(core.get_blis_trans_t(transa, conja), ao)
     core.bli_obj_set_diag_offset(diag_offset_a, ao)
     core.bli_obj_set_uplo(core.get_blis_uplo_t(uplo_a), ao)
     if unit_diag_a:
         core.bli_obj_set_diag(core.BLIS_UNIT_DIAG, ao)
 
-    libblis.bli_subm(ctypes.byref(ao), ctypes.byref(bo))
+    libblis.bli_subm_ex(
+        ctypes.byref(ao), ctypes.byref(bo), None, core.bli_rntm_arg(rntm)
+    )
@@ -4,6 +4,7 @@ import numpy as np
 
 from pyblis import core
 from pyblis.core import gint_t, libblis
+from pyblis.hooks import instrument
 
 
 def check_vecargs(*args):
@@ -18,211 +19,276 @@ def check_vecargs(*args):
         assert a.dtype.type == c, f"dtype was {a.dtype.type}, expected {c}"
 
 
-def addv(x, y, conj=False):
+@instrument
+def addv(x, y, conj=False, rntm=None):
     check_vecargs(x, y)
     xo = core.bli_obj_create_from(x)
-    yo = core.bli_obj_create_from(y)
+    yo = core.bli_obj_create_from(y, output=True)
     if conj:
-        libblis.bli_obj_set_conj(core.BLIS_CONJUGATE, ctypes.byref(xo))
-    libblis.bli_addv(ctypes.byref(xo), ctypes.byref(yo))
+        core.bli_obj_set_conj(core.BLIS_CONJUGATE, xo)
+    libblis.bli_addv_ex(
+        ctypes.byref(xo), ctypes.byref(yo), None, core.bli_rntm_arg(rntm)
+    )
 
 
-def amaxv(x):
+@instrument
+def amaxv(x, rntm=None):
     xo = core.bli_obj_create_from(x)
     into = core.bli_createscalar(0, typechar="l")
     retval = gint_t()
     libblis.bli_obj_create_1x1_with_attached_buffer(
         core.BLIS_INT, ctypes.byref(retval), ctypes.byref(into)
     )
-    libblis.bli_amaxv(ctypes.byref(xo), ctypes.byref(into))
+    libblis.bli_amaxv_ex(
+        ctypes.byref(xo), ctypes.byref(into), None, core.bli_rntm_arg(rntm)
+    )
     return core.bli_readscalar(into)
 
 
-def axpyv(alpha, x, y, conj=False):
-    objalpha = core.bli_createscalar(alpha)
+@instrument
+def axpyv(alpha, x, y, conj=False, rntm=None):
+    objalpha = core.bli_scalar(alpha, y.dtype.char)
     check_vecargs(x, y)
     if np.iscomplex(alpha):
         assert np.iscomplexobj(y)
     xo = core.bli_obj_create_from(x)
-    yo = core.bli_obj_create_from(y)
+    yo = core.bli_obj_create_from(y, output=True)
     if conj:
-        libblis.bli_obj_set_conj(core.BLIS_CONJUGATE, ctypes.byref(xo))
-    libblis.bli_axpyv(ctypes.byref(objalpha), ctypes.byref(xo), ctypes.byref(yo))
+        core.bli_obj_set_conj(core.BLIS_CONJUGATE, xo)
+    libblis.bli_axpyv_ex(
+        ctypes.byref(objalpha),
+        ctypes.byref(xo),
+        ctypes.byref(yo),
+        None,
+        core.bli_rntm_arg(rntm),
+    )
 
 
-def axpbyv(alpha, x, beta, y, conjx=False, conjy=False):
-    objalpha = core.bli_createscalar(alpha)
-    objbeta = core.bli_createscalar(beta)
+@instrument
+def axpbyv(alpha, x, beta, y, conjx=False, conjy=False, rntm=None):
+    objalpha = core.bli_scalar(alpha, y.dtype.char)
+    objbeta = core.bli_scalar(beta, y.dtype.char)
     check_vecargs(x, y)
     if np.iscomplex(alpha) or np.iscomplex(beta):
         assert np.iscomplexobj(y)
     xo = core.bli_obj_create_from(x)
-    yo = core.bli_obj_create_from(y)
+    yo = core.bli_obj_create_from(y, output=True)
     if conjx:
-        libblis.bli_obj_set_conj(core.BLIS_CONJUGATE, ctypes.byref(xo))
+        core.bli_obj_set_conj(core.BLIS_CONJUGATE, xo)
     if conjy:
-        libblis.bli_obj_set_conj(core.BLIS_CONJUGATE, ctypes.byref(yo))
-    libblis.bli_axpbyv(
+        core.bli_obj_set_conj(core.BLIS_CONJUGATE, yo)
+    libblis.bli_axpbyv_ex(
         ctypes.byref(objalpha),
         ctypes.byref(xo),
         ctypes.byref(objbeta),
         ctypes.byref(yo),
+        None,
+        core.bli_rntm_arg(rntm),
     )
 
 
-def copyv(x, y, conj=False):
+@instrument
+def copyv(x, y, conj=False, rntm=None):
     check_vecargs(x, y)
     xo = core.bli_obj_create_from(x)
-    yo = core.bli_obj_create_from(y)
+    yo = core.bli_obj_create_from(y, output=True)
     if conj:
-        libblis.bli_obj_set_conj(core.BLIS_CONJUGATE, ctypes.byref(xo))
-    libblis.bli_copyv(ctypes.byref(xo), ctypes.byref(yo))
+        core.bli_obj_set_conj(core.BLIS_CONJUGATE, xo)
+    libblis.bli_copyv_ex(
+        ctypes.byref(xo), ctypes.byref(yo), None, core.bli_rntm_arg(rntm)
+    )
 
 
-def dotv(x, y, conjx=False, conjy=False):
+@instrument
+def dotv(x, y, conjx=False, conjy=False, rntm=None):
     check_vecargs(x, y)
     xo = core.bli_obj_create_from(x)
     yo = core.bli_obj_create_from(y)
     if conjx:
-        libblis.bli_obj_set_conj(core.BLIS_CONJUGATE, ctypes.byref(xo))
+        core.bli_obj_set_conj(core.BLIS_CONJUGATE, xo)
     if conjy:
-        libblis.bli_obj_set_conj(core.BLIS_CONJUGATE, ctypes.byref(yo))
+        core.bli_obj_set_conj(core.BLIS_CONJUGATE, yo)
     resdtype = np.result_type(x, y)
     rho = core.bli_createscalar(0, resdtype.char)
-    libblis.bli_dotv(ctypes.byref(xo), ctypes.byref(yo), ctypes.byref(rho))
+    libblis.bli_dotv_ex(
+        ctypes.byref(xo),
+        ctypes.byref(yo),
+        ctypes.byref(rho),
+        None,
+        core.bli_rntm_arg(rntm),
+    )
     return core.bli_readscalar(rho)
 
 
-def dotxv(alpha, x, y, beta, conjx=False, conjy=False):
-    objalpha = core.bli_createscalar(alpha)
-    objbeta = core.bli_createscalar(beta)
+@instrument
+def dotxv(alpha, x, y, beta, conjx=False, conjy=False, rntm=None):
+    objalpha = core.bli_scalar(alpha, y.dtype.char)
+    objbeta = core.bli_scalar(beta, y.dtype.char)
     check_vecargs(x, y)
     if np.iscomplex(alpha) or np.iscomplex(beta):
         assert np.iscomplexobj(y)
     xo = core.bli_obj_create_from(x)
     yo = core.bli_obj_create_from(y)
     if conjx:
-        libblis.bli_obj_set_conj(core.BLIS_CONJUGATE, ctypes.byref(xo))
+        core.bli_obj_set_conj(core.BLIS_CONJUGATE, xo)
     if conjy:
-        libblis.bli_obj_set_conj(core.BLIS_CONJUGATE, ctypes.byref(yo))
+        core.bli_obj_set_conj(core.BLIS_CONJUGATE, yo)
     resdtype = np.result_type(x, y)
     rho = core.bli_createscalar(0, resdtype.char)
-    libblis.bli_dotxv(
+    libblis.bli_dotxv_ex(
         ctypes.byref(objalpha),
         ctypes.byref(xo),
         ctypes.byref(yo),
         ctypes.byref(objbeta),
         ctypes.byref(rho),
+        None,
+        core.bli_rntm_arg(rntm),
     )
     return core.bli_readscalar(rho)
 
 
-def invertv(x, conj=False):
-    xo = core.bli_obj_create_from(x)
+@instrument
+def invertv(x, conj=False, rntm=None):
+    xo = core.bli_obj_create_from(x, output=True)
     check_vecargs(x)
     if conj:
-        libblis.bli_obj_set_conj(core.BLIS_CONJUGATE, ctypes.byref(xo))
-    libblis.bli_invertv(ctypes.byref(xo))
+        core.bli_obj_set_conj(core.BLIS_CONJUGATE, xo)
+    libblis.bli_invertv_ex(ctypes.byref(xo), None, core.bli_rntm_arg(rntm))
 
 
-def invscalv(alpha, x):
-    objalpha = core.bli_createscalar(alpha)
+@instrument
+def invscalv(alpha, x, rntm=None):
+    objalpha = core.bli_scalar(alpha, x.dtype.char)
     check_vecargs(x)
-    xo = core.bli_obj_create_from(x)
-    libblis.bli_invscalv(ctypes.byref(objalpha), ctypes.byref(xo))
+    xo = core.bli_obj_create_from(x, output=True)
+    libblis.bli_invscalv_ex(
+        ctypes.byref(objalpha), ctypes.byref(xo), None, core.bli_rntm_arg(rntm)
+    )
 
 
-def scalv(alpha, x):
-    objalpha = core.bli_createscalar(alpha)
+@instrument
+def scalv(alpha, x, rntm=None):
+    objalpha = core.bli_scalar(alpha, x.dtype.char)
     check_vecargs(x)
-    xo = core.bli_obj_create_from(x)
-    libblis.bli_scalv(ctypes.byref(objalpha), ctypes.byref(xo))
+    xo = core.bli_obj_create_from(x, output=True)
+    libblis.bli_scalv_ex(
+        ctypes.byref(objalpha), ctypes.byref(xo), None, core.bli_rntm_arg(rntm)
+    )
 
 
-def scal2v(alpha, x, y, conj=False):
-    objalpha = core.bli_createscalar(alpha)
+@instrument
+def scal2v(alpha, x, y, conj=False, rntm=None):
+    objalpha = core.bli_scalar(alpha, y.dtype.char)
     check_vecargs(x, y)
     xo = core.bli_obj_create_from(x)
-    yo = core.bli_obj_create_from(y)
+    yo = core.bli_obj_create_from(y, output=True)
     if conj:
-        libblis.bli_obj_set_conj(core.BLIS_CONJUGATE, ctypes.byref(xo))
-    libblis.bli_scal2v(ctypes.byref(objalpha), ctypes.byref(xo), ctypes.byref(yo))
+        core.bli_obj_set_conj(core.BLIS_CONJUGATE, xo)
+    libblis.bli_scal2v_ex(
+        ctypes.byref(objalpha),
+        ctypes.byref(xo),
+        ctypes.byref(yo),
+        None,
+        core.bli_rntm_arg(rntm),
+    )
 
 
-def setv(alpha, x):
-    objalpha = core.bli_createscalar(alpha)
+@instrument
+def setv(alpha, x, rntm=None):
+    objalpha = core.bli_scalar(alpha, x.dtype.char)
     check_vecargs(x)
-    xo = core.bli_obj_create_from(x)
-    libblis.bli_setv(ctypes.byref(objalpha), ctypes.byref(xo))
+    xo = core.bli_obj_create_from(x, output=True)
+    libblis.bli_setv_ex(
+        ctypes.byref(objalpha), ctypes.byref(xo), None, core.bli_rntm_arg(rntm)
+    )
 
 
+@instrument
 def setrv(alpha, x):
-    objalpha = core.bli_createscalar(alpha)
+    objalpha = core.bli_scalar(alpha, x.dtype.char)
     check_vecargs(x)
-    xo = core.bli_obj_create_from(x)
+    xo = core.bli_obj_create_from(x, output=True)
     libblis.bli_setrv(ctypes.byref(objalpha), ctypes.byref(xo))
 
 
+@instrument
 def setiv(alpha, x):
-    objalpha = core.bli_createscalar(alpha)
+    objalpha = core.bli_scalar(alpha, x.dtype.char)
     check_vecargs(x)
-    xo = core.bli_obj_create_from(x)
+    xo = core.bli_obj_create_from(x, output=True)
     libblis.bli_setiv(ctypes.byref(objalpha), ctypes.byref(xo))
 
 
-def subv(x, y, conj=False):
+@instrument
+def subv(x, y, conj=False, rntm=None):
     check_vecargs(x, y)
     xo = core.bli_obj_create_from(x)
-    yo = core.bli_obj_create_from(y)
+    yo = core.bli_obj_create_from(y, output=True)
     if conj:
-        libblis.bli_obj_set_conj(core.BLIS_CONJUGATE, ctypes.byref(xo))
-    libblis.bli_subv(ctypes.byref(xo), ctypes.byref(yo))
+        core.bli_obj_set_conj(core.BLIS_CONJUGATE, xo)
+    libblis.bli_subv_ex(
+        ctypes.byref(xo), ctypes.byref(yo), None, core.bli_rntm_arg(rntm)
+    )
 
 
-def swapv(x, y):
+@instrument
+def swapv(x, y, rntm=None):
     check_vecargs(x, y)
-    xo = core.bli_obj_create_from(x)
-    yo = core.bli_obj_create_from(y)
-    libblis.bli_swapv(ctypes.byref(xo), ctypes.byref(yo))
+    xo = core.bli_obj_create_from(x, output=True)
+    yo = core.bli_obj_create_from(y, output=True)
+    libblis.bli_swapv_ex(
+        ctypes.byref(xo), ctypes.byref(yo), None, core.bli_rntm_arg(rntm)
+    )
 
 
-def axpy2v(alphax, alphay, x, y, z, conjx=False, conjy=False):
-    objalphax = core.bli_createscalar(alphax)
-    objalphay = core.bli_createscalar(alphay)
+@instrument
+def axpy2v(alphax, alphay, x, y, z, conjx=False, conjy=False, rntm=None):
+    objalphax = core.bli_scalar(alphax, z.dtype.char)
+    objalphay = core.bli_scalar(alphay, z.dtype.char)
     check_vecargs(x, y, z)
     if np.iscomplex(alphax) or np.iscomplex(alphay):
         assert np.iscomplexobj(y)
     xo = core.bli_obj_create_from(x)
     yo = core.bli_obj_create_from(y)
-    zo = core.bli_obj_create_from(z)
+    zo = core.bli_obj_create_from(z, output=True)
     if conjx:
-        libblis.bli_obj_set_conj(core.BLIS_CONJUGATE, ctypes.byref(xo))
+        core.bli_obj_set_conj(core.BLIS_CONJUGATE, xo)
     if conjy:
-        libblis.bli_obj_set_conj(core.BLIS_CONJUGATE, ctypes.byref(yo))
-    libblis.bli_axpy2v(
+        core.bli_obj_set_conj(core.BLIS_CONJUGATE, yo)
+    libblis.bli_axpy2v_ex(
         ctypes.byref(objalphax),
         ctypes.byref(objalphay),
         ctypes.byref(xo),
         ctypes.byref(yo),
         ctypes.byref(zo),
+        None,
+        core.bli_rntm_arg(rntm),
     )
 
 
-def dotaxpyv(alpha, x, y, z, conjx=False, conjy=False):
-    objalpha = core.bli_createscalar(alpha)
+@instrument
+def dotaxpyv(alpha, x, y, z, conjx=False, conjy=False, rntm=None):
+    # rho := conjx(x)^T conjy(y); z := z + alpha * conjx(x)
+    objalpha = core.bli_scalar(alpha, z.dtype.char)
     check_vecargs(x, y, z)
     if np.iscomplex(alpha):
         assert np.iscomplexobj(y)
     xo = core.bli_obj_create_from(x)
     yo = core.bli_obj_create_from(y)
-    zo = core.bli_obj_create_from(z)
+    zo = core.bli_obj_create_from(z, output=True)
     if conjx:
-        libblis.bli_obj_set_conj(core.BLIS_CONJUGATE, ctypes.byref(xo))
+        core.bli_obj_set_conj(core.BLIS_CONJUGATE, xo)
     if conjy:
-        libblis.bli_obj_set_conj(core.BLIS_CONJUGATE, ctypes.byref(yo))
-    libblis.bli_dotaxpyv(
+        core.bli_obj_set_conj(core.BLIS_CONJUGATE, yo)
+    rho = core.bli_createscalar(0, np.result_type(x, y).char)
+    libblis.bli_dotaxpyv_ex(
         ctypes.byref(objalpha),
         ctypes.byref(xo),
+        ctypes.byref(xo),
         ctypes.byref(yo),
+        ctypes.byref(rho),
         ctypes.byref(zo),
+        None,
+        core.bli_rntm_arg(rntm),
     )
+    return core.bli_readscalar(rho)
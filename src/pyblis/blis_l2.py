@@ -0,0 +1,272 @@
+import ctypes
+
+from pyblis import core
+from pyblis.core import libblis
+from pyblis.hooks import instrument
+
+
+def check_l2args(a, *vecs):
+    assert a.ndim == 2, f"ndim is {a.ndim}, expected 2"
+    c = a.dtype.type
+    for v in vecs:
+        assert v.ndim == 1, f"ndim is {v.ndim}, expected 1"
+        assert v.dtype.type == c, f"dtype was {v.dtype.type}, expected {c}"
+
+
+@instrument
+def gemv(alpha, a, x, beta, y, transa=False, conja=False, conjx=False, rntm=None):
+    check_l2args(a, x, y)
+    m, n = (a.shape[1], a.shape[0]) if transa else a.shape
+    assert x.size == n, f"size was {x.size}, expected {n}"
+    assert y.size == m, f"size was {y.size}, expected {m}"
+    objalpha = core.bli_scalar(alpha, a.dtype.char)
+    objbeta = core.bli_scalar(beta, a.dtype.char)
+    ao = core.bli_obj_create_from(a)
+    xo = core.bli_obj_create_from(x)
+    yo = core.bli_obj_create_from(y, output=True)
+    core.bli_obj_set_conjtrans(core.get_blis_trans_t(transa, conja), ao)
+    if conjx:
+        core.bli_obj_set_conj(core.BLIS_CONJUGATE, xo)
+
+    libblis.bli_gemv_ex(
+        ctypes.byref(objalpha),
+        ctypes.byref(ao),
+        ctypes.byref(xo),
+        ctypes.byref(objbeta),
+        ctypes.byref(yo),
+        None,
+        core.bli_rntm_arg(rntm),
+    )
+
+
+@instrument
+def ger(alpha, x, y, a, conjx=False, conjy=False, rntm=None):
+    check_l2args(a, x, y)
+    assert a.shape == (x.size, y.size), (
+        f"shape was {a.shape}, expected {(x.size, y.size)}"
+    )
+    objalpha = core.bli_scalar(alpha, a.dtype.char)
+    xo = core.bli_obj_create_from(x)
+    yo = core.bli_obj_create_from(y)
+    ao = core.bli_obj_create_from(a, output=True)
+    if conjx:
+        core.bli_obj_set_conj(core.BLIS_CONJUGATE, xo)
+    if conjy:
+        core.bli_obj_set_conj(core.BLIS_CONJUGATE, yo)
+
+    libblis.bli_ger_ex(
+        ctypes.byref(objalpha),
+        ctypes.byref(xo),
+        ctypes.byref(yo),
+        ctypes.byref(ao),
+        None,
+        core.bli_rntm_arg(rntm),
+    )
+
+
+def _hemv_symv(fn, struc, alpha, a, x, beta, y, uplo_a, conja, conjx, rntm):
+    check_l2args(a, x, y)
+    n = a.shape[0]
+    assert a.shape == (n, n), f"shape was {a.shape}, expected square"
+    assert x.size == n, f"size was {x.size}, expected {n}"
+    assert y.size == n, f"size was {y.size}, expected {n}"
+    objalpha = core.bli_scalar(alpha, a.dtype.char)
+    objbeta = core.bli_scalar(beta, a.dtype.char)
+    ao = core.bli_obj_create_from(a)
+    xo = core.bli_obj_create_from(x)
+    yo = core.bli_obj_create_from(y, output=True)
+    core.bli_obj_set_uplo(core.get_blis_uplo_t(uplo_a), ao)
+    core.bli_obj_set_struc(struc, ao)
+    if conja:
+        core.bli_obj_set_conj(core.BLIS_CONJUGATE, ao)
+    if conjx:
+        core.bli_obj_set_conj(core.BLIS_CONJUGATE, xo)
+
+    fn(
+        ctypes.byref(objalpha),
+        ctypes.byref(ao),
+        ctypes.byref(xo),
+        ctypes.byref(objbeta),
+        ctypes.byref(yo),
+        None,
+        core.bli_rntm_arg(rntm),
+    )
+
+
+@instrument
+def hemv(alpha, a, x, beta, y, uplo_a="L", conja=False, conjx=False, rntm=None):
+    _hemv_symv(
+        libblis.bli_hemv_ex,
+        core.BLIS_HERMITIAN,
+        alpha,
+        a,
+        x,
+        beta,
+        y,
+        uplo_a,
+        conja,
+        conjx,
+        rntm,
+    )
+
+
+@instrument
+def symv(alpha, a, x, beta, y, uplo_a="L", conja=False, conjx=False, rntm=None):
+    _hemv_symv(
+        libblis.bli_symv_ex,
+        core.BLIS_SYMMETRIC,
+        alpha,
+        a,
+        x,
+        beta,
+        y,
+        uplo_a,
+        conja,
+        conjx,
+        rntm,
+    )
+
+
+@instrument
+def her(alpha, x, a, uplo_a="L", conjx=False, rntm=None):
+    check_l2args(a, x)
+    assert a.shape == (x.size, x.size), (
+        f"shape was {a.shape}, expected {(x.size, x.size)}"
+    )
+    # The scaling factor of a Hermitian rank-1 update is real.
+    objalpha = core.bli_scalar(alpha, a.dtype.char.lower())
+    xo = core.bli_obj_create_from(x)
+    ao = core.bli_obj_create_from(a, output=True)
+    core.bli_obj_set_uplo(core.get_blis_uplo_t(uplo_a), ao)
+    core.bli_obj_set_struc(core.BLIS_HERMITIAN, ao)
+    if conjx:
+        core.bli_obj_set_conj(core.BLIS_CONJUGATE, xo)
+
+    libblis.bli_her_ex(
+        ctypes.byref(objalpha),
+        ctypes.byref(xo),
+        ctypes.byref(ao),
+        None,
+        core.bli_rntm_arg(rntm),
+    )
+
+
+@instrument
+def syr(alpha, x, a, uplo_a="L", conjx=False, rntm=None):
+    check_l2args(a, x)
+    assert a.shape == (x.size, x.size), (
+        f"shape was {a.shape}, expected {(x.size, x.size)}"
+    )
+    objalpha = core.bli_scalar(alpha, a.dtype.char)
+    xo = core.bli_obj_create_from(x)
+    ao = core.bli_obj_create_from(a, output=True)
+    core.bli_obj_set_uplo(core.get_blis_uplo_t(uplo_a), ao)
+    core.bli_obj_set_struc(core.BLIS_SYMMETRIC, ao)
+    if conjx:
+        core.bli_obj_set_conj(core.BLIS_CONJUGATE, xo)
+
+    libblis.bli_syr_ex(
+        ctypes.byref(objalpha),
+        ctypes.byref(xo),
+        ctypes.byref(ao),
+        None,
+        core.bli_rntm_arg(rntm),
+    )
+
+
+def _her2_syr2(fn, struc, alpha, x, y, a, uplo_a, conjx, conjy, rntm):
+    check_l2args(a, x, y)
+    n = x.size
+    assert y.size == n, f"size was {y.size}, expected {n}"
+    assert a.shape == (n, n), f"shape was {a.shape}, expected {(n, n)}"
+    objalpha = core.bli_scalar(alpha, a.dtype.char)
+    xo = core.bli_obj_create_from(x)
+    yo = core.bli_obj_create_from(y)
+    ao = core.bli_obj_create_from(a, output=True)
+    core.bli_obj_set_uplo(core.get_blis_uplo_t(uplo_a), ao)
+    core.bli_obj_set_struc(struc, ao)
+    if conjx:
+        core.bli_obj_set_conj(core.BLIS_CONJUGATE, xo)
+    if conjy:
+        core.bli_obj_set_conj(core.BLIS_CONJUGATE, yo)
+
+    fn(
+        ctypes.byref(objalpha),
+        ctypes.byref(xo),
+        ctypes.byref(yo),
+        ctypes.byref(ao),
+        None,
+        core.bli_rntm_arg(rntm),
+    )
+
+
+@instrument
+def her2(alpha, x, y, a, uplo_a="L", conjx=False, conjy=False, rntm=None):
+    _her2_syr2(
+        libblis.bli_her2_ex,
+        core.BLIS_HERMITIAN,
+        alpha,
+        x,
+        y,
+        a,
+        uplo_a,
+        conjx,
+        conjy,
+        rntm,
+    )
+
+
+@instrument
+def syr2(alpha, x, y, a, uplo_a="L", conjx=False, conjy=False, rntm=None):
+    _her2_syr2(
+        libblis.bli_syr2_ex,
+        core.BLIS_SYMMETRIC,
+        alpha,
+        x,
+        y,
+        a,
+        uplo_a,
+        conjx,
+        conjy,
+        rntm,
+    )
+
+
+def _trmv_trsv(fn, alpha, a, x, uplo_a, transa, conja, unit_diag_a, rntm):
+    check_l2args(a, x)
+    n = x.size
+    assert a.shape == (n, n), f"shape was {a.shape}, expected {(n, n)}"
+    objalpha = core.bli_scalar(alpha, a.dtype.char)
+    ao = core.bli_obj_create_from(a)
+    xo = core.bli_obj_create_from(x, output=True)
+    core.bli_obj_set_conjtrans(core.get_blis_trans_t(transa, conja), ao)
+    core.bli_obj_set_uplo(core.get_blis_uplo_t(uplo_a), ao)
+    core.bli_obj_set_struc(core.BLIS_TRIANGULAR, ao)
+    if unit_diag_a:
+        core.bli_obj_set_diag(core.BLIS_UNIT_DIAG, ao)
+
+    fn(
+        ctypes.byref(objalpha),
+        ctypes.byref(ao),
+        ctypes.byref(xo),
+        None,
+        core.bli_rntm_arg(rntm),
+    )
+
+
+@instrument
+def trmv(
+    alpha, a, x, uplo_a="L", transa=False, conja=False, unit_diag_a=False, rntm=None
+):
+    _trmv_trsv(
+        libblis.bli_trmv_ex, alpha, a, x, uplo_a, transa, conja, unit_diag_a, rntm
+    )
+
+
+@instrument
+def trsv(
+    alpha, a, x, uplo_a="L", transa=False, conja=False, unit_diag_a=False, rntm=None
+):
+    _trmv_trsv(
+        libblis.bli_trsv_ex, alpha, a, x, uplo_a, transa, conja, unit_diag_a, rntm
+    )
@@ -1,27 +1,86 @@
 import ctypes
 
-from pyblis import core
+import numpy as np
+
+from pyblis import autotune, core, ind
+from pyblis.batched import (
+    batch_item_shape,
+    batch_objs,
+    batch_scalars,
+    batch_size,
+    batch_typechar,
+    run_batched,
+)
 from pyblis.core import libblis
+from pyblis.hooks import instrument
+from pyblis.packed import PackedMatrix
+from pyblis.plan import Plan, info_bits
 
 
-def gemm(alpha, a, b, beta, c, transa=False, transb=False, conja=False, conjb=False):
-    objalpha = core.bli_createscalar(alpha)
-    objbeta = core.bli_createscalar(beta)
-    ao = core.bli_obj_create_from(a)
-    bo = core.bli_obj_create_from(b)
-    co = core.bli_obj_create_from(c)
+@instrument
+def gemm(
+    alpha,
+    a,
+    b,
+    beta,
+    c,
+    transa=False,
+    transb=False,
+    conja=False,
+    conjb=False,
+    rntm=None,
+    compute_precision=None,
+    method=None,
+):
+    # A, B and C may have different datatypes, which BLIS multiplies
+    # natively without converting the operands. The computation is done in
+    # C's precision unless compute_precision (a dtype or "single"/"double")
+    # says otherwise.
+    prescale = scale = None
+    if a.dtype == b.dtype == c.dtype:
+        typechar = c.dtype.char
+    else:
+        typechar = np.result_type(a.dtype, b.dtype, c.dtype).char
+        if complex(alpha).imag != 0:
+            # Mixed-datatype gemm aborts on an alpha with an imaginary
+            # part, so compute alpha * (op(A) op(B) + beta / alpha * C).
+            if c.dtype.kind != "c":
+                msg = f"A complex alpha needs a complex output, got {c.dtype}"
+                raise ValueError(msg)
+            if beta != 0:
+                prescale = beta / alpha
+            alpha, beta, scale = 1.0, (1.0 if beta != 0 else 0.0), alpha
+    objalpha = core.bli_scalar(alpha, typechar)
+    objbeta = core.bli_scalar(beta, typechar)
+    ao = a.descriptor() if isinstance(a, PackedMatrix) else core.bli_obj_create_from(a)
+    bo = b.descriptor() if isinstance(b, PackedMatrix) else core.bli_obj_create_from(b)
+    co = core.bli_obj_create_from(c, output=True)
 
     core.bli_obj_set_conjtrans(core.get_blis_trans_t(transa, conja), ao)
     core.bli_obj_set_conjtrans(core.get_blis_trans_t(transb, conjb), bo)
-    libblis.bli_gemm(
+    if rntm is None:
+        rntm = autotune.rntm_for("gemm", a, c, transa, typechar)
+    if compute_precision is not None:
+        core.bli_obj_set_comp_prec(core.get_blis_prec_t(compute_precision), co)
+    fn = libblis.bli_gemm_ex if method is None else ind.function("gemm", method)
+    rntm = core.bli_rntm_arg(rntm, (ao, bo, co))
+    # C is rescaled in place only once nothing else can fail.
+    if prescale is not None:
+        c *= prescale
+    fn(
         ctypes.byref(objalpha),
         ctypes.byref(ao),
         ctypes.byref(bo),
         ctypes.byref(objbeta),
         ctypes.byref(co),
+        None,
+        rntm,
     )
+    if scale is not None:
+        c *= scale
 
 
+@instrument
 def gemmt(
     alpha,
     a,
@@ -33,34 +92,53 @@ def gemmt(
     conja=False,
     conjb=False,
     uplo_c="D",
+    rntm=None,
+    method=None,
 ):
-    objalpha = core.bli_createscalar(alpha)
-    objbeta = core.bli_createscalar(beta)
+    objalpha = core.bli_scalar(alpha, c.dtype.char)
+    objbeta = core.bli_scalar(beta, c.dtype.char)
     ao = core.bli_obj_create_from(a)
     bo = core.bli_obj_create_from(b)
-    co = core.bli_obj_create_from(c)
+    co = core.bli_obj_create_from(c, output=True)
 
     core.bli_obj_set_conjtrans(core.get_blis_trans_t(transa, conja), ao)
     core.bli_obj_set_conjtrans(core.get_blis_trans_t(transb, conjb), bo)
     core.bli_obj_set_uplo(core.get_blis_uplo_t(uplo_c), co)
+    if rntm is None:
+        rntm = autotune.rntm_for("gemmt", a, c, transa, c.dtype.char)
 
-    libblis.bli_gemmt(
+    fn = libblis.bli_gemmt_ex if method is None else ind.function("gemmt", method)
+    fn(
         ctypes.byref(objalpha),
         ctypes.byref(ao),
         ctypes.byref(bo),
         ctypes.byref(objbeta),
         ctypes.byref(co),
+        None,
+        core.bli_rntm_arg(rntm, (ao, bo, co)),
     )
 
 
+@instrument
 def hemm(
-    alpha, a, b, beta, c, side_a="L", uplo_a="D", conja=False, transb=False, conjb=False
+    alpha,
+    a,
+    b,
+    beta,
+    c,
+    side_a="L",
+    uplo_a="D",
+    conja=False,
+    transb=False,
+    conjb=False,
+    rntm=None,
+    method=None,
 ):
-    objalpha = core.bli_createscalar(alpha)
-    objbeta = core.bli_createscalar(beta)
+    objalpha = core.bli_scalar(alpha, c.dtype.char)
+    objbeta = core.bli_scalar(beta, c.dtype.char)
     ao = core.bli_obj_create_from(a)
     bo = core.bli_obj_create_from(b)
-    co = core.bli_obj_create_from(c)
+    co = core.bli_obj_create_from(c, output=True)
 
     if conja:
         core.bli_obj_set_conj(core.BLIS_CONJUGATE, ao)
@@ -68,34 +146,48 @@ def hemm(
     core.bli_obj_set_conjtrans(core.get_blis_trans_t(transb, conjb), bo)
 
     core.bli_obj_set_uplo(core.get_blis_uplo_t(uplo_a), ao)
+    core.bli_obj_set_struc(core.BLIS_HERMITIAN, ao)
 
-    libblis.bli_hemm(
-        ctypes.c_int(core.get_blis_side_t(side_a)),
+    fn = libblis.bli_hemm_ex if method is None else ind.function("hemm", method)
+    fn(
+        core.get_blis_side_t(side_a),
         ctypes.byref(objalpha),
         ctypes.byref(ao),
         ctypes.byref(bo),
         ctypes.byref(objbeta),
         ctypes.byref(co),
+        None,
+        core.bli_rntm_arg(rntm, (ao, bo, co)),
     )
 
 
-def herk(alpha, a, beta, c, uplo_c="D", transa=False, conja=False):
-    objalpha = core.bli_createscalar(alpha)
-    objbeta = core.bli_createscalar(beta)
+@instrument
+def herk(
+    alpha, a, beta, c, uplo_c="D", transa=False, conja=False, rntm=None, method=None
+):
+    objalpha = core.bli_scalar(alpha, c.dtype.char)
+    objbeta = core.bli_scalar(beta, c.dtype.char)
     ao = core.bli_obj_create_from(a)
-    co = core.bli_obj_create_from(c)
+    co = core.bli_obj_create_from(c, output=True)
 
     core.bli_obj_set_conjtrans(core.get_blis_trans_t(transa, conja), ao)
     core.bli_obj_set_uplo(core.get_blis_uplo_t(uplo_c), co)
+    core.bli_obj_set_struc(core.BLIS_HERMITIAN, co)
+    if rntm is None:
+        rntm = autotune.rntm_for("herk", a, c, transa, c.dtype.char)
 
-    libblis.bli_herk(
+    fn = libblis.bli_herk_ex if method is None else ind.function("herk", method)
+    fn(
         ctypes.byref(objalpha),
         ctypes.byref(ao),
         ctypes.byref(objbeta),
         ctypes.byref(co),
+        None,
+        core.bli_rntm_arg(rntm, (ao, co)),
     )
 
 
+@instrument
 def her2k(
     alpha,
     a,
@@ -107,34 +199,52 @@ def her2k(
     transb=False,
     conja=False,
     conjb=False,
+    rntm=None,
+    method=None,
 ):
-    objalpha = core.bli_createscalar(alpha)
-    objbeta = core.bli_createscalar(beta)
+    objalpha = core.bli_scalar(alpha, c.dtype.char)
+    objbeta = core.bli_scalar(beta, c.dtype.char)
     ao = core.bli_obj_create_from(a)
     bo = core.bli_obj_create_from(b)
-    co = core.bli_obj_create_from(c)
+    co = core.bli_obj_create_from(c, output=True)
 
     core.bli_obj_set_conjtrans(core.get_blis_trans_t(transa, conja), ao)
     core.bli_obj_set_conjtrans(core.get_blis_trans_t(transb, conjb), bo)
     core.bli_obj_set_uplo(core.get_blis_uplo_t(uplo_c), co)
+    core.bli_obj_set_struc(core.BLIS_HERMITIAN, co)
 
-    libblis.bli_her2k(
+    fn = libblis.bli_her2k_ex if method is None else ind.function("her2k", method)
+    fn(
         ctypes.byref(objalpha),
         ctypes.byref(ao),
         ctypes.byref(bo),
         ctypes.byref(objbeta),
         ctypes.byref(co),
+        None,
+        core.bli_rntm_arg(rntm, (ao, bo, co)),
     )
 
 
+@instrument
 def symm(
-    alpha, a, b, beta, c, side_a="L", uplo_a="D", conja=False, transb=False, conjb=False
+    alpha,
+    a,
+    b,
+    beta,
+    c,
+    side_a="L",
+    uplo_a="D",
+    conja=False,
+    transb=False,
+    conjb=False,
+    rntm=None,
+    method=None,
 ):
-    objalpha = core.bli_createscalar(alpha)
-    objbeta = core.bli_createscalar(beta)
+    objalpha = core.bli_scalar(alpha, c.dtype.char)
+    objbeta = core.bli_scalar(beta, c.dtype.char)
     ao = core.bli_obj_create_from(a)
     bo = core.bli_obj_create_from(b)
-    co = core.bli_obj_create_from(c)
+    co = core.bli_obj_create_from(c, output=True)
 
     if conja:
         core.bli_obj_set_conj(core.BLIS_CONJUGATE, ao)
@@ -142,34 +252,48 @@ def symm(
     core.bli_obj_set_conjtrans(core.get_blis_trans_t(transb, conjb), bo)
 
     core.bli_obj_set_uplo(core.get_blis_uplo_t(uplo_a), ao)
+    core.bli_obj_set_struc(core.BLIS_SYMMETRIC, ao)
 
-    libblis.bli_symm(
-        ctypes.c_int(core.get_blis_side_t(side_a)),
+    fn = libblis.bli_symm_ex if method is None else ind.function("symm", method)
+    fn(
+        core.get_blis_side_t(side_a),
         ctypes.byref(objalpha),
         ctypes.byref(ao),
         ctypes.byref(bo),
         ctypes.byref(objbeta),
         ctypes.byref(co),
+        None,
+        core.bli_rntm_arg(rntm, (ao, bo, co)),
     )
 
 
-def syrk(alpha, a, beta, c, uplo_c="D", transa=False, conja=False):
-    objalpha = core.bli_createscalar(alpha)
-    objbeta = core.bli_createscalar(beta)
+@instrument
+def syrk(
+    alpha, a, beta, c, uplo_c="D", transa=False, conja=False, rntm=None, method=None
+):
+    objalpha = core.bli_scalar(alpha, c.dtype.char)
+    objbeta = core.bli_scalar(beta, c.dtype.char)
     ao = core.bli_obj_create_from(a)
-    co = core.bli_obj_create_from(c)
+    co = core.bli_obj_create_from(c, output=True)
 
     core.bli_obj_set_conjtrans(core.get_blis_trans_t(transa, conja), ao)
     core.bli_obj_set_uplo(core.get_blis_uplo_t(uplo_c), co)
+    core.bli_obj_set_struc(core.BLIS_SYMMETRIC, co)
+    if rntm is None:
+        rntm = autotune.rntm_for("syrk", a, c, transa, c.dtype.char)
 
-    libblis.bli_syrk(
+    fn = libblis.bli_syrk_ex if method is None else ind.function("syrk", method)
+    fn(
         ctypes.byref(objalpha),
         ctypes.byref(ao),
         ctypes.byref(objbeta),
         ctypes.byref(co),
+        None,
+        core.bli_rntm_arg(rntm, (ao, co)),
     )
 
 
+@instrument
 def syr2k(
     alpha,
     a,
@@ -181,46 +305,67 @@ def syr2k(
     transb=False,
     conja=False,
     conjb=False,
+    rntm=None,
+    method=None,
 ):
-    objalpha = core.bli_createscalar(alpha)
-    objbeta = core.bli_createscalar(beta)
+    objalpha = core.bli_scalar(alpha, c.dtype.char)
+    objbeta = core.bli_scalar(beta, c.dtype.char)
     ao = core.bli_obj_create_from(a)
     bo = core.bli_obj_create_from(b)
-    co = core.bli_obj_create_from(c)
+    co = core.bli_obj_create_from(c, output=True)
 
     core.bli_obj_set_conjtrans(core.get_blis_trans_t(transa, conja), ao)
     core.bli_obj_set_conjtrans(core.get_blis_trans_t(transb, conjb), bo)
     core.bli_obj_set_uplo(core.get_blis_uplo_t(uplo_c), co)
+    core.bli_obj_set_struc(core.BLIS_SYMMETRIC, co)
 
-    libblis.bli_syr2k(
+    fn = libblis.bli_syr2k_ex if method is None else ind.function("syr2k", method)
+    fn(
         ctypes.byref(objalpha),
         ctypes.byref(ao),
         ctypes.byref(bo),
         ctypes.byref(objbeta),
         ctypes.byref(co),
+        None,
+        core.bli_rntm_arg(rntm, (ao, bo, co)),
     )
 
 
+@instrument
 def trmm(
-    alpha, a, b, side_a="L", uplo_a="D", transa=False, conja=False, unit_diag_a=False
+    alpha,
+    a,
+    b,
+    side_a="L",
+    uplo_a="D",
+    transa=False,
+    conja=False,
+    unit_diag_a=False,
+    rntm=None,
+    method=None,
 ):
-    objalpha = core.bli_createscalar(alpha)
+    objalpha = core.bli_scalar(alpha, b.dtype.char)
     ao = core.bli_obj_create_from(a)
-    bo = core.bli_obj_create_from(b)
+    bo = core.bli_obj_create_from(b, output=True)
 
     core.bli_obj_set_conjtrans(core.get_blis_trans_t(transa, conja), ao)
     core.bli_obj_set_uplo(core.get_blis_uplo_t(uplo_a), ao)
+    core.bli_obj_set_struc(core.BLIS_TRIANGULAR, ao)
     if unit_diag_a:
         core.bli_obj_set_diag(core.BLIS_UNIT_DIAG, ao)
 
-    libblis.bli_trmm(
-        ctypes.c_int(core.get_blis_side_t(side_a)),
+    fn = libblis.bli_trmm_ex if method is None else ind.function("trmm", method)
+    fn(
+        core.get_blis_side_t(side_a),
         ctypes.byref(objalpha),
         ctypes.byref(ao),
         ctypes.byref(bo),
+        None,
+        core.bli_rntm_arg(rntm, (ao, bo)),
     )
 
 
+@instrument
 def trmm3(
     alpha,
     a,
@@ -234,44 +379,878 @@ def trmm3(
     unit_diag_a=False,
     transb=False,
     conjb=False,
+    rntm=None,
+    method=None,
 ):
-    objalpha = core.bli_createscalar(alpha)
-    objbeta = core.bli_createscalar(beta)
+    objalpha = core.bli_scalar(alpha, c.dtype.char)
+    objbeta = core.bli_scalar(beta, c.dtype.char)
     ao = core.bli_obj_create_from(a)
     bo = core.bli_obj_create_from(b)
-    co = core.bli_obj_create_from(c)
+    co = core.bli_obj_create_from(c, output=True)
 
     core.bli_obj_set_conjtrans(core.get_blis_trans_t(transa, conja), ao)
     core.bli_obj_set_conjtrans(core.get_blis_trans_t(transb, conjb), bo)
     core.bli_obj_set_uplo(core.get_blis_uplo_t(uplo_a), ao)
+    core.bli_obj_set_struc(core.BLIS_TRIANGULAR, ao)
     if unit_diag_a:
         core.bli_obj_set_diag(core.BLIS_UNIT_DIAG, ao)
 
-    libblis.bli_trmm3(
-        ctypes.c_int(core.get_blis_side_t(side_a)),
+    fn = libblis.bli_trmm3_ex if method is None else ind.function("trmm3", method)
+    fn(
+        core.get_blis_side_t(side_a),
         ctypes.byref(objalpha),
         ctypes.byref(ao),
         ctypes.byref(bo),
         ctypes.byref(objbeta),
         ctypes.byref(co),
+        None,
+        core.bli_rntm_arg(rntm, (ao, bo, co)),
     )
 
 
+@instrument
 def trsm(
-    alpha, a, b, side_a="L", uplo_a="D", transa=False, conja=False, unit_diag_a=False
+    alpha,
+    a,
+    b,
+    side_a="L",
+    uplo_a="D",
+    transa=False,
+    conja=False,
+    unit_diag_a=False,
+    rntm=None,
+    method=None,
 ):
-    objalpha = core.bli_createscalar(alpha)
+    objalpha = core.bli_scalar(alpha, b.dtype.char)
     ao = core.bli_obj_create_from(a)
-    bo = core.bli_obj_create_from(b)
+    bo = core.bli_obj_create_from(b, output=True)
 
     core.bli_obj_set_conjtrans(core.get_blis_trans_t(transa, conja), ao)
     core.bli_obj_set_uplo(core.get_blis_uplo_t(uplo_a), ao)
+    core.bli_obj_set_struc(core.BLIS_TRIANGULAR, ao)
     if unit_diag_a:
         core.bli_obj_set_diag(core.BLIS_UNIT_DIAG, ao)
 
-    libblis.bli_trsm(
-        ctypes.c_int(core.get_blis_side_t(side_a)),
+    fn = libblis.bli_trsm_ex if method is None else ind.function("trsm", method)
+    fn(
+        core.get_blis_side_t(side_a),
         ctypes.byref(objalpha),
         ctypes.byref(ao),
         ctypes.byref(bo),
+        None,
+        core.bli_rntm_arg(rntm, (ao, bo)),
+    )
+
+
+def _op_shape(shape, trans):
+    m, n = shape
+    return (n, m) if trans else (m, n)
+
+
+def _check_dim(what, got, expected):
+    if got != expected:
+        msg = f"Dimension mismatch in {what}: {got} != {expected}"
+        raise ValueError(msg)
+
+
+def _check_batch_dim(what, operand, expected, trans=False):
+    # Every item of a list operand, or the item shape of an array one.
+    if isinstance(operand, np.ndarray):
+        shapes = {operand.shape[-2:]}
+    else:
+        shapes = {item.shape for item in operand}
+    for shape in shapes:
+        _check_dim(what, _op_shape(shape, trans), expected)
+
+
+def _side_dim(side_a, b_shape):
+    # The order of the triangular/structured matrix A for the given side.
+    return b_shape[0] if core.get_blis_side_t(side_a) == core.BLIS_LEFT else b_shape[1]
+
+
+def plan_gemm(
+    a_shape,
+    b_shape,
+    dtype,
+    alpha=1.0,
+    beta=0.0,
+    transa=False,
+    transb=False,
+    conja=False,
+    conjb=False,
+    num_threads=None,
+    ways=None,
+):
+    m, k = _op_shape(a_shape, transa)
+    kb, n = _op_shape(b_shape, transb)
+    _check_dim("gemm k", kb, k)
+    return Plan(
+        "gemm",
+        [a_shape, b_shape, (m, n)],
+        dtype,
+        [
+            info_bits(core.get_blis_trans_t(transa, conja)),
+            info_bits(core.get_blis_trans_t(transb, conjb)),
+            info_bits(),
+        ],
+        alpha,
+        beta,
+        num_threads=num_threads,
+        ways=ways,
+    )
+
+
+def plan_gemmt(
+    a_shape,
+    b_shape,
+    dtype,
+    alpha=1.0,
+    beta=0.0,
+    transa=False,
+    transb=False,
+    conja=False,
+    conjb=False,
+    uplo_c="D",
+    num_threads=None,
+    ways=None,
+):
+    m, k = _op_shape(a_shape, transa)
+    kb, n = _op_shape(b_shape, transb)
+    _check_dim("gemmt k", kb, k)
+    _check_dim("gemmt n", n, m)
+    return Plan(
+        "gemmt",
+        [a_shape, b_shape, (m, m)],
+        dtype,
+        [
+            info_bits(core.get_blis_trans_t(transa, conja)),
+            info_bits(core.get_blis_trans_t(transb, conjb)),
+            info_bits(uplo=core.get_blis_uplo_t(uplo_c)),
+        ],
+        alpha,
+        beta,
+        num_threads=num_threads,
+        ways=ways,
+    )
+
+
+def _plan_hemm_symm(
+    opname,
+    a_shape,
+    b_shape,
+    dtype,
+    alpha,
+    beta,
+    side_a,
+    uplo_a,
+    conja,
+    transb,
+    conjb,
+    num_threads,
+    ways,
+):
+    c_shape = _op_shape(b_shape, transb)
+    order = _side_dim(side_a, c_shape)
+    _check_dim(f"{opname} A", tuple(a_shape), (order, order))
+    struc = core.BLIS_HERMITIAN if opname == "hemm" else core.BLIS_SYMMETRIC
+    return Plan(
+        opname,
+        [a_shape, b_shape, c_shape],
+        dtype,
+        [
+            info_bits(
+                core.get_blis_trans_t(False, conja),
+                uplo=core.get_blis_uplo_t(uplo_a),
+                struc=struc,
+            ),
+            info_bits(core.get_blis_trans_t(transb, conjb)),
+            info_bits(),
+        ],
+        alpha,
+        beta,
+        side=core.get_blis_side_t(side_a),
+        num_threads=num_threads,
+        ways=ways,
+    )
+
+
+def plan_hemm(
+    a_shape,
+    b_shape,
+    dtype,
+    alpha=1.0,
+    beta=0.0,
+    side_a="L",
+    uplo_a="D",
+    conja=False,
+    transb=False,
+    conjb=False,
+    num_threads=None,
+    ways=None,
+):
+    return _plan_hemm_symm(
+        "hemm",
+        a_shape,
+        b_shape,
+        dtype,
+        alpha,
+        beta,
+        side_a,
+        uplo_a,
+        conja,
+        transb,
+        conjb,
+        num_threads,
+        ways,
+    )
+
+
+def plan_symm(
+    a_shape,
+    b_shape,
+    dtype,
+    alpha=1.0,
+    beta=0.0,
+    side_a="L",
+    uplo_a="D",
+    conja=False,
+    transb=False,
+    conjb=False,
+    num_threads=None,
+    ways=None,
+):
+    return _plan_hemm_symm(
+        "symm",
+        a_shape,
+        b_shape,
+        dtype,
+        alpha,
+        beta,
+        side_a,
+        uplo_a,
+        conja,
+        transb,
+        conjb,
+        num_threads,
+        ways,
+    )
+
+
+def _plan_rank_k(
+    opname, a_shape, dtype, alpha, beta, uplo_c, transa, conja, num_threads, ways
+):
+    n, _ = _op_shape(a_shape, transa)
+    struc = core.BLIS_HERMITIAN if opname == "herk" else core.BLIS_SYMMETRIC
+    return Plan(
+        opname,
+        [a_shape, (n, n)],
+        dtype,
+        [
+            info_bits(core.get_blis_trans_t(transa, conja)),
+            info_bits(uplo=core.get_blis_uplo_t(uplo_c), struc=struc),
+        ],
+        alpha,
+        beta,
+        num_threads=num_threads,
+        ways=ways,
+    )
+
+
+def plan_herk(
+    a_shape,
+    dtype,
+    alpha=1.0,
+    beta=0.0,
+    uplo_c="D",
+    transa=False,
+    conja=False,
+    num_threads=None,
+    ways=None,
+):
+    return _plan_rank_k(
+        "herk", a_shape, dtype, alpha, beta, uplo_c, transa, conja, num_threads, ways
+    )
+
+
+def plan_syrk(
+    a_shape,
+    dtype,
+    alpha=1.0,
+    beta=0.0,
+    uplo_c="D",
+    transa=False,
+    conja=False,
+    num_threads=None,
+    ways=None,
+):
+    return _plan_rank_k(
+        "syrk", a_shape, dtype, alpha, beta, uplo_c, transa, conja, num_threads, ways
+    )
+
+
+def _plan_rank_2k(
+    opname,
+    a_shape,
+    b_shape,
+    dtype,
+    alpha,
+    beta,
+    uplo_c,
+    transa,
+    transb,
+    conja,
+    conjb,
+    num_threads,
+    ways,
+):
+    n, k = _op_shape(a_shape, transa)
+    _check_dim(f"{opname} B", _op_shape(b_shape, transb), (n, k))
+    struc = core.BLIS_HERMITIAN if opname == "her2k" else core.BLIS_SYMMETRIC
+    return Plan(
+        opname,
+        [a_shape, b_shape, (n, n)],
+        dtype,
+        [
+            info_bits(core.get_blis_trans_t(transa, conja)),
+            info_bits(core.get_blis_trans_t(transb, conjb)),
+            info_bits(uplo=core.get_blis_uplo_t(uplo_c), struc=struc),
+        ],
+        alpha,
+        beta,
+        num_threads=num_threads,
+        ways=ways,
+    )
+
+
+def plan_her2k(
+    a_shape,
+    b_shape,
+    dtype,
+    alpha=1.0,
+    beta=0.0,
+    uplo_c="D",
+    transa=False,
+    transb=False,
+    conja=False,
+    conjb=False,
+    num_threads=None,
+    ways=None,
+):
+    return _plan_rank_2k(
+        "her2k",
+        a_shape,
+        b_shape,
+        dtype,
+        alpha,
+        beta,
+        uplo_c,
+        transa,
+        transb,
+        conja,
+        conjb,
+        num_threads,
+        ways,
+    )
+
+
+def plan_syr2k(
+    a_shape,
+    b_shape,
+    dtype,
+    alpha=1.0,
+    beta=0.0,
+    uplo_c="D",
+    transa=False,
+    transb=False,
+    conja=False,
+    conjb=False,
+    num_threads=None,
+    ways=None,
+):
+    return _plan_rank_2k(
+        "syr2k",
+        a_shape,
+        b_shape,
+        dtype,
+        alpha,
+        beta,
+        uplo_c,
+        transa,
+        transb,
+        conja,
+        conjb,
+        num_threads,
+        ways,
+    )
+
+
+def _plan_triangular(
+    opname,
+    a_shape,
+    b_shape,
+    dtype,
+    alpha,
+    side_a,
+    uplo_a,
+    transa,
+    conja,
+    unit_diag_a,
+    num_threads,
+    ways,
+):
+    order = _side_dim(side_a, b_shape)
+    _check_dim(f"{opname} A", tuple(a_shape), (order, order))
+    return Plan(
+        opname,
+        [a_shape, b_shape],
+        dtype,
+        [
+            info_bits(
+                core.get_blis_trans_t(transa, conja),
+                uplo=core.get_blis_uplo_t(uplo_a),
+                unit_diag=unit_diag_a,
+                struc=core.BLIS_TRIANGULAR,
+            ),
+            info_bits(),
+        ],
+        alpha,
+        side=core.get_blis_side_t(side_a),
+        num_threads=num_threads,
+        ways=ways,
+    )
+
+
+def plan_trmm(
+    a_shape,
+    b_shape,
+    dtype,
+    alpha=1.0,
+    side_a="L",
+    uplo_a="D",
+    transa=False,
+    conja=False,
+    unit_diag_a=False,
+    num_threads=None,
+    ways=None,
+):
+    return _plan_triangular(
+        "trmm",
+        a_shape,
+        b_shape,
+        dtype,
+        alpha,
+        side_a,
+        uplo_a,
+        transa,
+        conja,
+        unit_diag_a,
+        num_threads,
+        ways,
+    )
+
+
+def plan_trsm(
+    a_shape,
+    b_shape,
+    dtype,
+    alpha=1.0,
+    side_a="L",
+    uplo_a="D",
+    transa=False,
+    conja=False,
+    unit_diag_a=False,
+    num_threads=None,
+    ways=None,
+):
+    return _plan_triangular(
+        "trsm",
+        a_shape,
+        b_shape,
+        dtype,
+        alpha,
+        side_a,
+        uplo_a,
+        transa,
+        conja,
+        unit_diag_a,
+        num_threads,
+        ways,
+    )
+
+
+def plan_trmm3(
+    a_shape,
+    b_shape,
+    dtype,
+    alpha=1.0,
+    beta=0.0,
+    side_a="L",
+    uplo_a="D",
+    transa=False,
+    conja=False,
+    unit_diag_a=False,
+    transb=False,
+    conjb=False,
+    num_threads=None,
+    ways=None,
+):
+    c_shape = _op_shape(b_shape, transb)
+    order = _side_dim(side_a, c_shape)
+    _check_dim("trmm3 A", tuple(a_shape), (order, order))
+    return Plan(
+        "trmm3",
+        [a_shape, b_shape, c_shape],
+        dtype,
+        [
+            info_bits(
+                core.get_blis_trans_t(transa, conja),
+                uplo=core.get_blis_uplo_t(uplo_a),
+                unit_diag=unit_diag_a,
+                struc=core.BLIS_TRIANGULAR,
+            ),
+            info_bits(core.get_blis_trans_t(transb, conjb)),
+            info_bits(),
+        ],
+        alpha,
+        beta,
+        side=core.get_blis_side_t(side_a),
+        num_threads=num_threads,
+        ways=ways,
+    )
+
+
+class _StreamingRankK:
+    # Accumulates op(A)^T op(A) into one triangle of a persistent C.
+    _conj = False
+
+    def __init__(self, n, dtype, uplo="L", rntm=None):
+        if uplo.upper() not in ("L", "U"):
+            msg = f"uplo must be 'L' or 'U', got {uplo!r}"
+            raise ValueError(msg)
+        self.n = n
+        self.dtype = np.dtype(dtype)
+        self.uplo = uplo.upper()
+        self.rows = 0
+        self.rntm = rntm
+        self._c = np.zeros((n, n), dtype=self.dtype)
+
+    def update(self, block, alpha=1.0):
+        block = np.asarray(block, dtype=self.dtype)
+        if block.ndim != 2 or block.shape[1] != self.n:
+            msg = f"Expected a block of shape (rows, {self.n}), got {block.shape}"
+            raise ValueError(msg)
+        if block.shape[0]:
+            self._rank_k(alpha, block)
+        self.rows += block.shape[0]
+
+    def reset(self):
+        self._c[...] = 0
+        self.rows = 0
+
+    @property
+    def triangle(self):
+        """The accumulated triangle; the other one is left at zero."""
+        return self._c
+
+    def finalize(self):
+        """The full accumulated matrix, with the stored triangle mirrored."""
+        tri = np.tril if self.uplo == "L" else np.triu
+        strict = tri(self._c, -1 if self.uplo == "L" else 1)
+        if self._conj:
+            strict = strict.conj()
+        return tri(self._c) + strict.T
+
+
+class StreamingSyrk(_StreamingRankK):
+    """
+    C = sum of A_i^T A_i over row blocks A_i of a tall matrix A that is
+    never held in memory, e.g. a Gram matrix over streamed rows::
+
+        acc = StreamingSyrk(n, np.float64)
+        for block in blocks:
+            acc.update(block)
+        gram = acc.finalize()
+
+    Each update is a syrk with beta=1 into the ``uplo`` triangle of an
+    n x n accumulator.
+    """
+
+    def _rank_k(self, alpha, block):
+        syrk(alpha, block, 1.0, self._c, self.uplo, transa=True, rntm=self.rntm)
+
+
+class StreamingHerk(_StreamingRankK):
+    """
+    Like :class:`StreamingSyrk`, but accumulates A_i^H A_i with herk, so
+    ``alpha`` must be real and the result is Hermitian.
+    """
+
+    _conj = True
+
+    def _rank_k(self, alpha, block):
+        herk(
+            alpha,
+            block,
+            1.0,
+            self._c,
+            self.uplo,
+            transa=True,
+            conja=True,
+            rntm=self.rntm,
+        )
+
+
+class StreamingGemm:
+    """
+    C = sum of A_i^T B_i (A_i^H B_i if ``conj``) over matching row blocks
+    of two streamed matrices with m and n columns, by gemm with beta=1.
+    """
+
+    def __init__(self, m, n, dtype, conj=False, rntm=None):
+        self.m = m
+        self.n = n
+        self.dtype = np.dtype(dtype)
+        self.conj = conj
+        self.rows = 0
+        self.rntm = rntm
+        self._c = np.zeros((m, n), dtype=self.dtype)
+
+    def update(self, a_block, b_block, alpha=1.0):
+        a_block = np.asarray(a_block, dtype=self.dtype)
+        b_block = np.asarray(b_block, dtype=self.dtype)
+        if (
+            a_block.ndim != 2
+            or b_block.ndim != 2
+            or a_block.shape[1] != self.m
+            or b_block.shape[1] != self.n
+            or a_block.shape[0] != b_block.shape[0]
+        ):
+            msg = (
+                f"Expected blocks of shape (rows, {self.m}) and (rows, {self.n}), "
+                f"got {a_block.shape} and {b_block.shape}"
+            )
+            raise ValueError(msg)
+        if a_block.shape[0]:
+            gemm(
+                alpha,
+                a_block,
+                b_block,
+                1.0,
+                self._c,
+                transa=True,
+                conja=self.conj,
+                rntm=self.rntm,
+            )
+        self.rows += a_block.shape[0]
+
+    def reset(self):
+        self._c[...] = 0
+        self.rows = 0
+
+    def finalize(self):
+        return self._c.copy()
+
+
+def gemm_batched(
+    alpha,
+    a,
+    b,
+    beta,
+    c,
+    transa=False,
+    transb=False,
+    conja=False,
+    conjb=False,
+    mode=None,
+    rntm=None,
+):
+    batch = batch_size(c, a, b)
+    m, n = batch_item_shape(c)
+    _, k = _op_shape(batch_item_shape(a), transa)
+    _check_batch_dim("gemm C", c, (m, n))
+    _check_batch_dim("gemm A", a, (m, k), transa)
+    _check_batch_dim("gemm B", b, (k, n), transb)
+    typechar = batch_typechar(c)
+    calls = list(
+        zip(
+            batch_scalars(alpha, batch, typechar),
+            batch_objs(a, batch, info_bits(core.get_blis_trans_t(transa, conja))),
+            batch_objs(b, batch, info_bits(core.get_blis_trans_t(transb, conjb))),
+            batch_scalars(beta, batch, typechar),
+            batch_objs(c, batch, info_bits(), output=True),
+        )
+    )
+    run_batched("gemm", calls, 2 * m * n * k, mode=mode, rntm=rntm)
+
+
+def _hemm_symm_batched(
+    opname, alpha, a, b, beta, c, side_a, uplo_a, conja, transb, conjb, mode, rntm
+):
+    batch = batch_size(c, a, b)
+    m, n = batch_item_shape(c)
+    order = _side_dim(side_a, (m, n))
+    _check_batch_dim(f"{opname} C", c, (m, n))
+    _check_batch_dim(f"{opname} A", a, (order, order))
+    _check_batch_dim(f"{opname} B", b, (m, n), transb)
+    struc = core.BLIS_HERMITIAN if opname == "hemm" else core.BLIS_SYMMETRIC
+    typechar = batch_typechar(c)
+    abits = info_bits(
+        core.get_blis_trans_t(False, conja),
+        uplo=core.get_blis_uplo_t(uplo_a),
+        struc=struc,
+    )
+    calls = list(
+        zip(
+            batch_scalars(alpha, batch, typechar),
+            batch_objs(a, batch, abits),
+            batch_objs(b, batch, info_bits(core.get_blis_trans_t(transb, conjb))),
+            batch_scalars(beta, batch, typechar),
+            batch_objs(c, batch, info_bits(), output=True),
+        )
+    )
+    run_batched(
+        opname,
+        calls,
+        2 * order * m * n,
+        side=core.get_blis_side_t(side_a),
+        mode=mode,
+        rntm=rntm,
+    )
+
+
+def hemm_batched(
+    alpha,
+    a,
+    b,
+    beta,
+    c,
+    side_a="L",
+    uplo_a="D",
+    conja=False,
+    transb=False,
+    conjb=False,
+    mode=None,
+    rntm=None,
+):
+    _hemm_symm_batched(
+        "hemm", alpha, a, b, beta, c, side_a, uplo_a, conja, transb, conjb, mode, rntm
+    )
+
+
+def symm_batched(
+    alpha,
+    a,
+    b,
+    beta,
+    c,
+    side_a="L",
+    uplo_a="D",
+    conja=False,
+    transb=False,
+    conjb=False,
+    mode=None,
+    rntm=None,
+):
+    _hemm_symm_batched(
+        "symm", alpha, a, b, beta, c, side_a, uplo_a, conja, transb, conjb, mode, rntm
+    )
+
+
+def _rank_k_batched(opname, alpha, a, beta, c, uplo_c, transa, conja, mode, rntm):
+    batch = batch_size(c, a)
+    n, k = _op_shape(batch_item_shape(a), transa)
+    _check_batch_dim(f"{opname} A", a, (n, k), transa)
+    _check_batch_dim(f"{opname} C", c, (n, n))
+    struc = core.BLIS_HERMITIAN if opname == "herk" else core.BLIS_SYMMETRIC
+    typechar = batch_typechar(c)
+    calls = list(
+        zip(
+            batch_scalars(alpha, batch, typechar),
+            batch_objs(a, batch, info_bits(core.get_blis_trans_t(transa, conja))),
+            batch_scalars(beta, batch, typechar),
+            batch_objs(
+                c,
+                batch,
+                info_bits(uplo=core.get_blis_uplo_t(uplo_c), struc=struc),
+                output=True,
+            ),
+        )
+    )
+    run_batched(opname, calls, n * n * k, mode=mode, rntm=rntm)
+
+
+def herk_batched(
+    alpha, a, beta, c, uplo_c="D", transa=False, conja=False, mode=None, rntm=None
+):
+    _rank_k_batched("herk", alpha, a, beta, c, uplo_c, transa, conja, mode, rntm)
+
+
+def syrk_batched(
+    alpha, a, beta, c, uplo_c="D", transa=False, conja=False, mode=None, rntm=None
+):
+    _rank_k_batched("syrk", alpha, a, beta, c, uplo_c, transa, conja, mode, rntm)
+
+
+def _triangular_batched(
+    opname, alpha, a, b, side_a, uplo_a, transa, conja, unit_diag_a, mode, rntm
+):
+    batch = batch_size(b, a)
+    m, n = batch_item_shape(b)
+    order = _side_dim(side_a, (m, n))
+    _check_batch_dim(f"{opname} B", b, (m, n))
+    _check_batch_dim(f"{opname} A", a, (order, order))
+    abits = info_bits(
+        core.get_blis_trans_t(transa, conja),
+        uplo=core.get_blis_uplo_t(uplo_a),
+        unit_diag=unit_diag_a,
+        struc=core.BLIS_TRIANGULAR,
+    )
+    calls = list(
+        zip(
+            batch_scalars(alpha, batch, batch_typechar(b)),
+            batch_objs(a, batch, abits),
+            batch_objs(b, batch, info_bits(), output=True),
+        )
+    )
+    run_batched(
+        opname,
+        calls,
+        order * m * n,
+        side=core.get_blis_side_t(side_a),
+        mode=mode,
+        rntm=rntm,
+    )
+
+
+def trmm_batched(
+    alpha,
+    a,
+    b,
+    side_a="L",
+    uplo_a="D",
+    transa=False,
+    conja=False,
+    unit_diag_a=False,
+    mode=None,
+    rntm=None,
+):
+    _triangular_batched(
+        "trmm", alpha, a, b, side_a, uplo_a, transa, conja, unit_diag_a, mode, rntm
+    )
+
+
+def trsm_batched(
+    alpha,
+    a,
+    b,
+    side_a="L",
+    uplo_a="D",
+    transa=False,
+    conja=False,
+    unit_diag_a=False,
+    mode=None,
+    rntm=None,
+):
+    _triangular_batched(
+        "trsm", alpha, a, b, side_a, uplo_a, transa, conja, unit_diag_a, mode, rntm
     )
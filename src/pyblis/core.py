@@ -1,31 +1,48 @@
+import contextvars
 import ctypes
+import functools
+import json
+import math
 import os
+import re
 import sys
+import threading
+import warnings
+from collections import OrderedDict, namedtuple
 from ctypes import c_byte, c_int
 from pathlib import Path
 
 import numpy as np
 
+from pyblis import alloc
 
-def _get_num_cpus():
-    try:
-        import psutil
 
-        p = psutil.Process()
-        if hasattr(p, "cpu_affinity"):
-            maxcpus = min(psutil.cpu_count(logical=False), len(p.cpu_affinity()))
-        else:
-            maxcpus = psutil.cpu_count(logical=False)
-        if maxcpus is not None:
-            return maxcpus
-    except ImportError:
-        pass
-    if hasattr(os, "sched_getaffinity"):
-        return len(os.sched_getaffinity(0))
-    return os.cpu_count()
+def cache_dir():
+    """Where pyblis keeps what it learns about the host between runs."""
+    path = os.environ.get("PYBLIS_CACHE_DIR")
+    if path is None:
+        xdg = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+        path = Path(xdg) / "pyblis"
+    return Path(path)
 
 
-def _load_blis():
+def _get_num_cpus():
+    # Physical cores the process may run on: hyperthreads of one core list
+    # the same thread siblings.
+    if not hasattr(os, "sched_getaffinity"):
+        return os.cpu_count()
+    cpus = os.sched_getaffinity(0)
+    cores = set()
+    for cpu in cpus:
+        topology = Path(f"/sys/devices/system/cpu/cpu{cpu}/topology")
+        try:
+            cores.add((topology / "thread_siblings_list").read_text().strip())
+        except OSError:
+            return len(cpus)
+    return len(cores)
+
+
+def _search_paths():
     blis_search_paths = []
     if "LD_LIBRARY_PATH" in os.environ:
         blis_search_paths.extend(os.environ["LD_LIBRARY_PATH"].split(":"))
@@ -36,8 +53,12 @@ def _load_blis():
             Path(sys.prefix) / "lib64",
         ]
     )
+    return [str(path) for path in blis_search_paths]
+
+
+def _find_blis(search_paths):
     for blis_name in ("libblis", "blis"):
-        for path in blis_search_paths:
+        for path in search_paths:
             try:
                 return np.ctypeslib.load_library(blis_name, path)
             except OSError:
@@ -45,21 +66,190 @@ def _load_blis():
     return ctypes.CDLL("libblis.so")
 
 
-_blis_lib = _load_blis()
-_blis_lib.bli_init()
+def _stat(path):
+    try:
+        st = Path(path).stat()
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
 
-libblis = _blis_lib
+# What pyblis needs to know about the library before loading it: its
+# path and the ABI facts the ctypes structures below depend on. It is kept
+# in the cache directory, keyed on the search path and the library file, so
+# that importing pyblis does not load BLIS.
+_PROFILE_FILE = "library.json"
+
+
+def _read_profile():
+    search_paths = _search_paths()
+    try:
+        profile = json.loads((cache_dir() / _PROFILE_FILE).read_text())
+        if profile["search_paths"] == search_paths and profile["stat"] == _stat(
+            profile["path"]
+        ):
+            return profile
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return {"search_paths": search_paths}
+
+
+def _write_profile():
+    path = cache_dir() / _PROFILE_FILE
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(json.dumps(_profile))
+        tmp.replace(path)
+    except OSError:
+        pass
 
-if "BLIS_NUM_THREADS" not in os.environ and "OMP_NUM_THREADS" not in os.environ:
-    libblis.bli_thread_set_num_threads(c_int(_get_num_cpus()))
 
-if libblis.bli_info_get_int_type_size() == 64:
-    int_type_size = 64
+def _profile_value(key, probe):
+    if key not in _profile:
+        _profile[key] = probe()
+        _write_profile()
+    return _profile[key]
+
+
+_profile = _read_profile()
+
+# Function prototypes, set on each function when the library is loaded.
+_prototypes = {}
+
+
+def declare(name, restype=c_int, argtypes=None):
+    """Give a BLIS function a prototype other than ctypes' int(...) default."""
+    _prototypes[name] = (restype, argtypes)
+    if libblis._lib is not None:
+        _set_prototype(libblis._lib, name)
+
+
+def _set_prototype(lib, name):
+    restype, argtypes = _prototypes[name]
+    fn = getattr(lib, name)
+    fn.restype = restype
+    if argtypes is not None:
+        fn.argtypes = argtypes
+
+
+class _LazyLibrary:
+    """
+    Stands in for the BLIS library until one of its functions is needed.
+    The first attribute access loads and initializes BLIS; after that,
+    functions are cached on the proxy and cost a plain attribute lookup.
+    """
+
+    def __init__(self):
+        self._lib = None
+        self._lock = threading.RLock()
+
+    def __getattr__(self, name):
+        lib = self._load()
+        attr = getattr(lib, name)
+        self.__dict__[name] = attr
+        return attr
+
+    def _load(self):
+        # Reentrant, so that initialization itself may go through the proxy.
+        with self._lock:
+            if self._lib is None:
+                lib = self._open()
+                for name in _prototypes:
+                    _set_prototype(lib, name)
+                self._lib = lib
+                try:
+                    _init_blis(lib)
+                except BaseException:
+                    # Forget the functions cached while initializing.
+                    self.__dict__ = {"_lib": None, "_lock": self._lock}
+                    raise
+            return self._lib
+
+    def _open(self):
+        path = _profile.get("path")
+        if path is not None:
+            try:
+                return ctypes.CDLL(path)
+            except OSError:
+                pass
+        lib = _find_blis(_profile["search_paths"])
+        _profile.update(path=lib._name, stat=_stat(lib._name))
+        _write_profile()
+        return lib
+
+
+libblis = _LazyLibrary()
+declare("bli_arch_string", ctypes.c_char_p)
+declare("bli_info_get_version_str", ctypes.c_char_p)
+
+
+def arch_names():
+    """The arch_t names of this BLIS release, in order, "generic" last."""
+    names = []
+    for arch in range(64):
+        name = libblis.bli_arch_string(arch).decode()
+        names.append(name)
+        if name == "generic":
+            break
+    return tuple(names)
+
+
+def built_archs():
+    """The sub-configurations compiled into the library."""
+    return tuple(
+        name for name in arch_names() if hasattr(libblis, f"bli_cntx_init_{name}")
+    )
+
+
+def _request_arch(name):
+    # BLIS picks its sub-configuration once, when it is initialized, from
+    # BLIS_ARCH_TYPE (an arch_t value) if set and the CPU otherwise.
+    if name not in built_archs():
+        msg = (
+            f"PYBLIS_ARCH={name} is not a sub-configuration of this BLIS build, "
+            f"expected one of {built_archs()}"
+        )
+        raise ValueError(msg)
+    os.environ["BLIS_ARCH_TYPE"] = str(arch_names().index(name))
+
+
+def _init_blis(lib):
+    requested_arch = os.environ.get("PYBLIS_ARCH")
+    previous = os.environ.get("BLIS_ARCH_TYPE")
+    try:
+        if requested_arch:
+            _request_arch(requested_arch)
+        lib.bli_init()
+        active_arch = lib.bli_arch_string(lib.bli_arch_query_id()).decode()
+    finally:
+        # BLIS has read BLIS_ARCH_TYPE by now; the process gets its own back.
+        if previous is None:
+            os.environ.pop("BLIS_ARCH_TYPE", None)
+        else:
+            os.environ["BLIS_ARCH_TYPE"] = previous
+    if requested_arch and active_arch != requested_arch:
+        warnings.warn(
+            f"BLIS ignored PYBLIS_ARCH={requested_arch} and runs the "
+            f"{active_arch} sub-configuration; BLIS_ARCH_TYPE is honored "
+            "from BLIS 0.8 on",
+            stacklevel=1,
+        )
+
+    if "BLIS_NUM_THREADS" not in os.environ and "OMP_NUM_THREADS" not in os.environ:
+        lib.bli_thread_set_num_threads(c_int(_get_num_cpus()))
+
+
+def _probe_int_type_size():
+    return libblis.bli_info_get_int_type_size()
+
+
+int_type_size = _profile_value("int_type_size", _probe_int_type_size)
+if int_type_size == 64:
     gint_t = ctypes.c_int64
     obj_t_buffer_offset = 64
     guint_t = ctypes.c_uint64
-elif libblis.bli_info_get_int_type_size() == 32:
-    int_type_size = 32
+elif int_type_size == 32:
     gint_t = ctypes.c_int32
     obj_t_buffer_offset = 40
     guint_t = ctypes.c_uint32
@@ -152,27 +342,27 @@ BLIS_SCALAR_DOMAIN_BIT = ((1 << BLIS_DOMAIN_NUM_BITS) - 1) << BLIS_SCALAR_DOMAIN
 BLIS_SCALAR_PREC_BIT = ((1 << BLIS_PRECISION_NUM_BITS) - 1) << BLIS_SCALAR_PREC_SHIFT
 
 
-BLIS_NO_TRANSPOSE = c_int(0)
-BLIS_TRANSPOSE = c_int(8)
-BLIS_CONJ_NO_TRANSPOSE = c_int(16)
-BLIS_CONJ_TRANSPOSE = c_int(24)
+BLIS_NO_TRANSPOSE = 0
+BLIS_TRANSPOSE = 8
+BLIS_CONJ_NO_TRANSPOSE = 16
+BLIS_CONJ_TRANSPOSE = 24
 
-BLIS_NO_CONJUGATE = c_int(0)
-BLIS_CONJUGATE = c_int(16)
+BLIS_NO_CONJUGATE = 0
+BLIS_CONJUGATE = 16
 
-BLIS_ZEROS = c_int(0)
-BLIS_LOWER = c_int(192)
-BLIS_UPPER = c_int(96)
-BLIS_DENSE = c_int(224)
+BLIS_ZEROS = 0
+BLIS_LOWER = 192
+BLIS_UPPER = 96
+BLIS_DENSE = 224
 
-BLIS_LEFT = c_int(0)
-BLIS_RIGHT = c_int(1)
+BLIS_LEFT = 0
+BLIS_RIGHT = 1
 
-BLIS_NONUNIT_DIAG = c_int(0)
-BLIS_UNIT_DIAG = c_int(256)
+BLIS_NONUNIT_DIAG = 0
+BLIS_UNIT_DIAG = 256
 
-BLIS_NO_INVERT_DIAG = c_int(0)
-BLIS_INVERT_DIAG = c_int(512)
+BLIS_NO_INVERT_DIAG = 0
+BLIS_INVERT_DIAG = 512
 
 BLIS_FLOAT = 0
 BLIS_DOUBLE = 2
@@ -183,11 +373,11 @@ BLIS_CONSTANT = 5
 BLIS_DT_LO = 0
 BLIS_DT_HI = 3
 
-BLIS_REAL = c_int(0)
-BLIS_COMPLEX = c_int(1)
+BLIS_REAL = 0
+BLIS_COMPLEX = 1
 
-BLIS_SINGLE_PREC = c_int(0)
-BLIS_DOUBLE_PREC = c_int(2)
+BLIS_SINGLE_PREC = 0
+BLIS_DOUBLE_PREC = 2
 
 _obj_t = c_byte * MAX_OBJ_T_SIZE
 
@@ -319,77 +509,448 @@ class _obj_t(ctypes.Structure):
 
 # } obj_t;
 
-libblis.bli_amaxv.argtypes = [ctypes.POINTER(_obj_t), ctypes.POINTER(_obj_t)]
-libblis.bli_amaxv.restype = None
-libblis.bli_obj_create.argtypes = [
-    c_int,
-    gint_t,
-    gint_t,
-    gint_t,
-    gint_t,
-    ctypes.POINTER(_obj_t),
-]
-libblis.bli_obj_create.restype = None
+declare("bli_amaxv", None, [ctypes.POINTER(_obj_t), ctypes.POINTER(_obj_t)])
+declare(
+    "bli_obj_create",
+    None,
+    [c_int, gint_t, gint_t, gint_t, gint_t, ctypes.POINTER(_obj_t)],
+)
 
 
-def bli_obj_create_from(mat):
-    if mat.ndim == 1:
-        mat = mat.reshape(-1, 1)
-    assert mat.ndim == 2
+def _has_legacy_info_layout():
+    # BLIS releases before 0.9 also keep target and execution datatypes in
+    # the info bits, which pushes the structure and computation precision
+    # fields further up. A freshly created object has its target datatype
+    # set, so look for it.
+    buf = ctypes.c_double()
+    probe = _obj_t()
+    one = gint_t(1)
+    libblis.bli_obj_create_with_attached_buffer(
+        BLIS_DOUBLE, one, one, ctypes.byref(buf), one, one, ctypes.byref(probe)
+    )
+    return (probe.info >> 10) & 0x7 == BLIS_DOUBLE
 
-    m = gint_t(mat.shape[0])
-    n = gint_t(mat.shape[1])
 
-    rs = gint_t(mat.strides[0] // mat.itemsize)
-    cs = gint_t(mat.strides[1] // mat.itemsize)
-    dt = get_blis_dtype(mat)
+BLIS_LEGACY_INFO_LAYOUT = _profile_value("legacy_info_layout", _has_legacy_info_layout)
+if BLIS_LEGACY_INFO_LAYOUT:
+    BLIS_STRUC_SHIFT = 27
+    BLIS_COMP_PREC_SHIFT = 30
+    BLIS_STRUC_BITS = ((1 << BLIS_STRUC_NUM_BITS) - 1) << BLIS_STRUC_SHIFT
+    BLIS_COMP_PREC_BIT = ((1 << BLIS_PRECISION_NUM_BITS) - 1) << BLIS_COMP_PREC_SHIFT
 
-    obj = _obj_t()
-    libblis.bli_obj_create_with_attached_buffer(
-        dt, m, n, mat.ctypes.data_as(ctypes.c_void_p), rs, cs, ctypes.pointer(obj)
+BLIS_GENERAL = 0
+BLIS_HERMITIAN = 1 << BLIS_STRUC_SHIFT
+BLIS_SYMMETRIC = 2 << BLIS_STRUC_SHIFT
+BLIS_TRIANGULAR = 3 << BLIS_STRUC_SHIFT
+
+
+BLIS_NUM_LOOPS = 6
+
+# Indices into rntm_t.thrloop (these are the bszid_t values of the
+# corresponding cache/register blocksizes).
+BLIS_KR = 0
+BLIS_MR = 1
+BLIS_NR = 2
+BLIS_MC = 3
+BLIS_KC = 4
+BLIS_NC = 5
+
+# bszid_t values of the level-1f fusing factors.
+BLIS_AF = 8
+BLIS_DF = 9
+BLIS_XF = 10
+
+
+def _probe_version():
+    return libblis.bli_info_get_version_str().decode()
+
+
+BLIS_VERSION = _profile_value("version", _probe_version)
+_version_info = tuple(int(part) for part in re.findall(r"\d+", BLIS_VERSION)[:2])
+
+# BLIS 0.8 replaced the gint_t-sized bool_t with C's bool, and 1.0 added
+# thread_impl at the front.
+_rntm_bool = ctypes.c_bool if _version_info >= (0, 8) else gint_t
+_rntm_impl = [("thread_impl", c_int)] if _version_info >= (1, 0) else []
+
+
+class _rntm_t(ctypes.Structure):
+    _fields_ = [  # noqa: RUF012
+        *_rntm_impl,
+        ("auto_factor", _rntm_bool),
+        ("num_threads", gint_t),
+        ("thrloop", gint_t * BLIS_NUM_LOOPS),
+        ("pack_a", _rntm_bool),
+        ("pack_b", _rntm_bool),
+        ("l3_sup", _rntm_bool),
+        ("pad", ctypes.c_byte * 64),
+    ]
+
+
+# typedef struct rntm_s
+# {
+# 	// "External" fields: these may be queried by the end-user.
+# 	timpl_t   thread_impl; // 1.0 and later
+
+# 	bool      auto_factor; // bool_t before 0.8
+
+# 	dim_t     num_threads;
+# 	dim_t     thrloop[ BLIS_NUM_LOOPS ];
+# 	bool      pack_a; // enable/disable packing of left-hand matrix A.
+# 	bool      pack_b; // enable/disable packing of right-hand matrix B.
+# 	bool      l3_sup; // enable/disable small matrix handling in level-3 ops.
+# } rntm_t;
+
+declare("bli_rntm_init_from_global", None, [ctypes.POINTER(_rntm_t)])
+
+
+_RNTM_WAYS = ("jc", "pc", "ic", "jr", "ir")
+
+
+def bli_rntm_init(rntm, num_threads=None, ways=None):
+    """
+    Initialize a rntm_t from the global runtime settings, overriding either
+    the total thread count or the (jc, pc, ic, jr, ir) ways of parallelism.
+    ``ways`` may be a 5-tuple or a mapping with those keys (missing loops
+    get one way).
+    """
+    libblis.bli_rntm_init_from_global(ctypes.byref(rntm))
+    if ways is not None:
+        if hasattr(ways, "keys"):
+            unknown = set(ways) - set(_RNTM_WAYS)
+            if unknown:
+                msg = f"Unknown loops in ways: {sorted(unknown)}"
+                raise ValueError(msg)
+            ways = tuple(ways.get(loop, 1) for loop in _RNTM_WAYS)
+        jc, pc, ic, jr, ir = ways
+        if num_threads is not None and num_threads != jc * pc * ic * jr * ir:
+            msg = f"num_threads={num_threads} does not match ways={ways}"
+            raise ValueError(msg)
+        rntm.thrloop[BLIS_NC] = jc
+        rntm.thrloop[BLIS_KC] = pc
+        rntm.thrloop[BLIS_MC] = ic
+        rntm.thrloop[BLIS_NR] = jr
+        rntm.thrloop[BLIS_MR] = ir
+        rntm.thrloop[BLIS_KR] = 1
+        rntm.num_threads = -1
+    elif num_threads is not None:
+        rntm.num_threads = num_threads
+        for i in range(BLIS_NUM_LOOPS):
+            rntm.thrloop[i] = -1
+    return rntm
+
+
+def bli_rntm_create(num_threads=None, ways=None):
+    return bli_rntm_init(_rntm_t(), num_threads, ways)
+
+
+# The rntm_t used by calls that do not pass one explicitly; set by
+# pyblis.threads(). None means BLIS's global settings.
+_rntm_context = contextvars.ContextVar("pyblis_rntm", default=None)
+
+
+def bli_rntm_arg(rntm, objs=()):
+    if rntm is None:
+        rntm = _rntm_context.get()
+    # The small-matrix (sup) gemm path of some BLIS releases gets general
+    # strides wrong, so operations on such operands skip it.
+    for obj in objs:
+        if abs(obj.rs) != 1 and abs(obj.cs) != 1:
+            return ctypes.byref(_rntm_without_sup(rntm))
+    if rntm is None:
+        return None
+    return ctypes.byref(rntm)
+
+
+def _rntm_without_sup(rntm):
+    copy = _rntm_t()
+    if rntm is None:
+        libblis.bli_rntm_init_from_global(ctypes.byref(copy))
+    else:
+        ctypes.pointer(copy)[0] = rntm
+    copy.l3_sup = False
+    return copy
+
+
+for _name in ("num_threads", "jc_nt", "pc_nt", "ic_nt", "jr_nt", "ir_nt"):
+    declare(f"bli_thread_get_{_name}", gint_t)
+
+
+def bli_rntm_num_threads(rntm=None):
+    """
+    The number of threads an operation run with ``rntm`` uses. None means
+    the pyblis.threads() setting, or failing that the global one.
+    """
+    if rntm is None:
+        rntm = _rntm_context.get()
+    if rntm is None:
+        num_threads = libblis.bli_thread_get_num_threads()
+        ways = [getattr(libblis, f"bli_thread_get_{loop}_nt")() for loop in _RNTM_WAYS]
+    else:
+        num_threads = rntm.num_threads
+        loops = (BLIS_NC, BLIS_KC, BLIS_MC, BLIS_NR, BLIS_MR)
+        ways = [rntm.thrloop[loop] for loop in loops]
+    if num_threads > 0:
+        return num_threads
+    return max(1, math.prod(way for way in ways if way > 0))
+
+
+declare("bli_gks_query_cntx", ctypes.c_void_p)
+
+_BLKSZ_NAMES = {
+    "kr": BLIS_KR,
+    "mr": BLIS_MR,
+    "nr": BLIS_NR,
+    "mc": BLIS_MC,
+    "kc": BLIS_KC,
+    "nc": BLIS_NC,
+    "af": BLIS_AF,
+    "df": BLIS_DF,
+    "xf": BLIS_XF,
+}
+
+# typedef struct blksz_s
+# {
+# 	dim_t v[ BLIS_NUM_FP_TYPES ];  // default blocksizes
+# 	dim_t e[ BLIS_NUM_FP_TYPES ];  // maximum blocksizes
+# } blksz_t;
+#
+# cntx_t starts with blksz_t blkszs[ BLIS_NUM_BLKSZS ] up to BLIS 0.9.
+
+
+def bli_blocksizes(typechar="d"):
+    """
+    The default register and cache blocksizes (kr, mr, nr, mc, kc, nc) and
+    level-1f fusing factors (af, df, xf) of the active context for a
+    datatype, or None if the context does not have the layout this reads.
+    """
+    dt = typechar_to_blis_dt[typechar]
+    cntx = libblis.bli_gks_query_cntx()
+    table = (gint_t * ((BLIS_XF + 1) * 8)).from_address(cntx)
+    sizes = {name: table[bszid * 8 + dt] for name, bszid in _BLKSZ_NAMES.items()}
+    plausible = (
+        0 < sizes["mr"] <= 64
+        and 0 < sizes["nr"] <= 64
+        and sizes["kc"] > 0
+        and sizes["mc"] % sizes["mr"] == 0
+        and sizes["nc"] % sizes["nr"] == 0
+        and all(0 < sizes[name] <= 64 for name in ("af", "df", "xf"))
     )
+    return sizes if plausible else None
+
+
+# cntx_t of BLIS 0.7 goes on after the blocksizes with
+#
+# 	bszid_t   bmults[ BLIS_NUM_BLKSZS ];
+# 	func_t    l3_vir_ukrs[ BLIS_NUM_LEVEL3_UKRS ];
+# 	func_t    l3_nat_ukrs[ BLIS_NUM_LEVEL3_UKRS ];
+# 	mbool_t   l3_nat_ukrs_prefs[ BLIS_NUM_LEVEL3_UKRS ];
+# 	blksz_t   l3_sup_thresh[ BLIS_NUM_THRESH ];
+#
+# with 11 blocksizes, 5 level-3 microkernels, func_t holding a pointer and
+# mbool_t a bool_t (a gint_t in 0.7) per datatype. Later releases reorder
+# the context.
+_SUP_THRESH_OFFSET = (
+    11 * 8 * ctypes.sizeof(gint_t)
+    + -(-11 * 4 // 8) * 8
+    + 2 * 5 * 4 * ctypes.sizeof(ctypes.c_void_p)
+    + 5 * 4 * ctypes.sizeof(gint_t)
+)
+
+
+def bli_sup_thresholds(typechar="d"):
+    """
+    The (mt, nt, kt) thresholds below which gemm takes the small/unpacked
+    (sup) path, 0 for datatypes without one, or None if the context does
+    not have the layout this reads.
+    """
+    if _version_info != (0, 7):
+        return None
+    dt = typechar_to_blis_dt[typechar]
+    cntx = libblis.bli_gks_query_cntx()
+    table = (gint_t * (3 * 8)).from_address(cntx + _SUP_THRESH_OFFSET)
+    sizes = {name: table[i * 8 + dt] for i, name in enumerate(("mt", "nt", "kt"))}
+    plausible = all(0 <= size < 1 << 20 for size in sizes.values())
+    return sizes if plausible else None
+
+
+ObjCacheInfo = namedtuple("ObjCacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+def bli_obj_copy(template):
+    """A private copy of an object descriptor, viewing the same buffer."""
+    obj = _obj_t.from_buffer_copy(template)
+    # BLIS makes a fresh object its own root.
+    obj.root = ctypes.addressof(obj)
     return obj
 
 
-def bli_allocmatrix(shape, order="C", dtype=np.float64):
-    dt = ctypes.c_int(typechar_to_blis_dt[np.dtype(dtype).char])
-    assert len(shape) == 2
-    m = shape[0]
-    n = shape[1]
-    if order == "C":
-        rs = 1
-        cs = m
-    elif order == "F":
-        rs = n
-        cs = 1
+class _ObjCache:
+    """
+    LRU cache of obj_t templates, keyed on (data pointer, shape, strides, dtype).
+
+    The descriptor BLIS builds for an attached buffer depends on nothing but
+    the key, so a template may be reused for any array with the same key.
+    Callers always receive a private copy of the template: the info bits
+    (conjtrans, uplo, diag) and diagonal offset start out at their defaults
+    on every call, and the same array may appear more than once in a call.
+    """
+
+    def __init__(self, maxsize=512):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._templates = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, mat):
+        key = (mat.ctypes.data, mat.shape, mat.strides, mat.dtype.char)
+        with self._lock:
+            template = self._templates.get(key)
+            if template is not None:
+                self._templates.move_to_end(key)
+                self.hits += 1
+        if template is None:
+            template = _obj_create_with_attached_buffer(mat)
+            with self._lock:
+                self.misses += 1
+                if self.maxsize > 0:
+                    self._templates[key] = template
+                    while len(self._templates) > self.maxsize:
+                        self._templates.popitem(last=False)
+        return bli_obj_copy(template)
+
+    def info(self):
+        with self._lock:
+            return ObjCacheInfo(
+                self.hits, self.misses, self.maxsize, len(self._templates)
+            )
+
+    def clear(self):
+        with self._lock:
+            self._templates.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def resize(self, maxsize):
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._templates) > max(maxsize, 0):
+                self._templates.popitem(last=False)
+
+
+_obj_cache = _ObjCache()
+
+
+def obj_cache_info():
+    return _obj_cache.info()
+
+
+def obj_cache_clear():
+    _obj_cache.clear()
+
+
+def set_obj_cache_size(maxsize):
+    _obj_cache.resize(maxsize)
+
+
+class LayoutWarning(UserWarning):
+    """An operand was copied because BLIS cannot address its memory layout."""
+
+
+class _UnsupportedLayout(ValueError):
+    pass
+
+
+def _blis_layout(mat):
+    # (m, n, rs, cs) with strides in elements, or the reason BLIS cannot use
+    # the array in place. The stride of a unit extent is never followed, so
+    # it is chosen to give BLIS a unit-stride dimension where possible.
+    if mat.ndim == 1:
+        m, n = mat.size, 1
+        strides = (mat.strides[0], 0)
     else:
-        msg = f"Unknown order: {order}"
-        raise ValueError(msg)
+        assert mat.ndim == 2
+        (m, n), strides = mat.shape, mat.strides
+    if not mat.flags.aligned or strides[0] % mat.itemsize or strides[1] % mat.itemsize:
+        return "misaligned"
+    rs = strides[0] // mat.itemsize
+    cs = strides[1] // mat.itemsize
+    if m == 0 or n == 0:
+        return m, n, max(n, 1), 1
+    if m == 1:
+        rs = n if abs(cs) == 1 else 1
+    if n == 1:
+        cs = m if abs(rs) == 1 else 1
+
+    # The checks of bli_check_matrix_strides: BLIS takes negative strides
+    # but rejects zero strides and layouts where elements may overlap.
+    if rs == 0 or cs == 0:
+        return "zero-stride"
+    ars, acs = abs(rs), abs(cs)
+    if ars != 1 and acs != 1:
+        ok = acs >= m * ars if acs >= ars else ars >= n * acs
+    elif ars == 1 and acs == 1:
+        ok = m == 1 or n == 1
+    else:
+        ok = acs >= m if ars == 1 else ars >= n
+    if not ok:
+        return "overlapping"
+    return m, n, rs, cs
+
+
+def _obj_create_with_attached_buffer(mat):
+    layout = _blis_layout(mat)
+    if isinstance(layout, str):
+        raise _UnsupportedLayout(layout)
+    m, n, rs, cs = layout
     obj = _obj_t()
+    libblis.bli_obj_create_with_attached_buffer(
+        get_blis_dtype(mat),
+        gint_t(m),
+        gint_t(n),
+        mat.ctypes.data_as(ctypes.c_void_p),
+        gint_t(rs),
+        gint_t(cs),
+        ctypes.pointer(obj),
+    )
+    return obj
 
-    libblis.bli_obj_create.argtypes = [
-        ctypes.c_int,
-        ctypes.c_long,
-        ctypes.c_long,
-        ctypes.c_long,
-        ctypes.c_long,
-        ctypes.POINTER(_obj_t),
-    ]
-    libblis.bli_obj_create.restype = None
 
-    libblis.bli_obj_create(dt, m, n, rs, cs, ctypes.byref(obj))
+def bli_obj_create_from(mat, output=False):
+    """
+    A BLIS object viewing ``mat`` in place, whatever its strides. The few
+    layouts BLIS cannot address (zero strides from broadcasting, overlapping
+    or misaligned elements) are copied with a :class:`LayoutWarning`, or
+    rejected with ValueError for an ``output`` operand.
+    """
+    try:
+        return _obj_cache.get(mat)
+    except _UnsupportedLayout as e:
+        reason = str(e)
+    desc = f"{reason} array of shape {mat.shape} and strides {mat.strides}"
+    if output:
+        msg = f"BLIS cannot write to a {desc}"
+        raise ValueError(msg)
+    warnings.warn(f"Copying a {desc} for BLIS", LayoutWarning, stacklevel=4)
+    copy = np.ascontiguousarray(mat)
+    obj = _obj_create_with_attached_buffer(copy)
+    # The object points into the copy, which must live as long as it does.
+    obj._copy = copy
+    return obj
+
 
-    nelem = (m - 1) * obj.rs + (n - 1) * obj.cs + 1
-    nbytes = nelem * obj.elem_size
-    bufptr = ctypes.cast(obj.buffer, ctypes.POINTER(ctypes.c_byte))
-    arr = np.ctypeslib.as_array(bufptr, shape=(nbytes,))
-    arr = arr.view(np.dtype(dtype))
-    arr = np.lib.stride_tricks.as_strided(
-        arr, shape, (obj.rs * arr.itemsize, obj.cs * arr.itemsize)
-    )
-    return obj, arr
-    libblis.bli_obj_free(ctypes.byref(obj))
-    return None, None
+def bli_allocmatrix(shape, order="C", dtype=np.float64, pool=None):
+    # A pooled array and a BLIS object viewing it. The object does not own
+    # its buffer, so it must not be passed to bli_obj_free; the memory goes
+    # back to the pool with the array.
+    if len(shape) != 2:
+        msg = f"Expected a 2-D shape, got {shape}"
+        raise ValueError(msg)
+    if pool is None:
+        pool = alloc.default_pool
+    arr = pool.empty(shape, dtype, order)
+    return _obj_create_with_attached_buffer(arr), arr
 
 
 def bli_createscalar(alpha, typechar="d"):
@@ -403,13 +964,54 @@ def bli_createscalar(alpha, typechar="d"):
 
     if typechar in ("F", "D"):
         alpha = complex(alpha)
-        scalarptr.contents.value.real = alpha.real
-        scalarptr.contents.value.imag = alpha.imag
+        scalarptr.contents.real = alpha.real
+        scalarptr.contents.imag = alpha.imag
     else:
         scalarptr.contents.value = alpha
     return obj
 
 
+# Shared scalar objects, the counterparts of BLIS_ZERO, BLIS_ONE and
+# BLIS_MINUS_ONE in each datatype. BLIS only reads alpha and beta, and
+# nothing here may write to these either. Created on first use, as that
+# loads the library.
+_SCALAR_CONSTANTS = {}
+
+
+def _create_scalar_constants():
+    return {
+        (value, typechar): bli_createscalar(value, typechar)
+        for typechar in ("f", "d", "F", "D")
+        for value in (0, 1, -1)
+    }
+
+
+@functools.lru_cache(maxsize=256)
+def _cached_scalar(value, typechar):
+    if typechar in ("f", "d") and np.iscomplexobj(value):
+        if value.imag != 0:
+            msg = f"Complex scalar {value} requires a complex dtype"
+            raise ValueError(msg)
+        value = value.real
+    return bli_createscalar(value, typechar)
+
+
+def bli_scalar(value, typechar="d"):
+    """
+    A read-only scalar object for ``value`` in the datatype given by
+    ``typechar``, interned for 0, 1 and -1 and cached for recently used
+    values. Use :func:`bli_createscalar` for scalars BLIS writes to.
+    """
+    if not _SCALAR_CONSTANTS:
+        _SCALAR_CONSTANTS.update(_create_scalar_constants())
+    try:
+        obj = _SCALAR_CONSTANTS.get((value, typechar))
+        return obj if obj is not None else _cached_scalar(value, typechar)
+    except TypeError:
+        # Unhashable, such as a 0-d array.
+        return _cached_scalar.__wrapped__(value, typechar)
+
+
 def bli_readscalar(obj):
     dt = obj.info & 0x7
     if dt == BLIS_FLOAT:
@@ -448,5 +1050,27 @@ def bli_obj_set_diag(diag, obj):
     obj.info = (obj.info & ~BLIS_DIAG_BIT) | diag
 
 
+def bli_obj_set_struc(struc, obj):
+    obj.info = (obj.info & ~BLIS_STRUC_BITS) | struc
+
+
+def bli_obj_set_comp_prec(prec, obj):
+    # prec is BLIS_SINGLE_PREC or BLIS_DOUBLE_PREC. The legacy layout
+    # stores it as a bare precision bit, one place above the current one.
+    if BLIS_LEGACY_INFO_LAYOUT:
+        prec >>= BLIS_PRECISION_SHIFT
+    obj.info = (obj.info & ~BLIS_COMP_PREC_BIT) | (prec << BLIS_COMP_PREC_SHIFT)
+
+
+def get_blis_prec_t(precision):
+    # A dtype or dtype name ("single", "double", np.float32, "complex128",
+    # ...) to the BLIS precision it is stored in.
+    typechar = np.dtype(precision).char
+    if typechar not in ("f", "d", "F", "D"):
+        msg = f"Unsupported computation precision: {precision}"
+        raise ValueError(msg)
+    return typechar_to_blis_dt[typechar] & BLIS_PRECISION_BIT
+
+
 def bli_obj_set_diag_offset(diag_off, obj):
     obj.diag_off = diag_off
@@ -0,0 +1,68 @@
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from pyblis import core
+from pyblis.rntm import Rntm
+
+_local = threading.local()
+
+
+def _available_cpus():
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def current_partition():
+    """The CPUs of the partition the calling executor worker runs on."""
+    return getattr(_local, "cpus", None)
+
+
+class PartitionedExecutor(ThreadPoolExecutor):
+    """
+    An executor for running independent BLIS calls concurrently without
+    oversubscribing the machine.
+
+    The CPU set is split into ``partitions`` disjoint groups, each served by
+    one worker thread. A worker pins itself to its group (where the OS
+    supports it) and runs every call with as many BLIS threads as the group
+    has CPUs, so concurrent calls share the cores instead of each starting
+    a full set of threads. Calls that pass an explicit ``rntm=`` keep it.
+    """
+
+    def __init__(self, partitions=None, cpus=None, pin=True):
+        cpus = _available_cpus() if cpus is None else list(cpus)
+        if partitions is None:
+            partitions = len(cpus)
+        if not 1 <= partitions <= len(cpus):
+            msg = f"Cannot split {len(cpus)} CPUs into {partitions} partitions"
+            raise ValueError(msg)
+        size, extra = divmod(len(cpus), partitions)
+        bounds = [i * size + min(i, extra) for i in range(partitions + 1)]
+        self.partitions = [
+            tuple(cpus[lo:hi]) for lo, hi in zip(bounds[:-1], bounds[1:])
+        ]
+        self._pin = pin and hasattr(os, "sched_setaffinity")
+        self._free = queue.SimpleQueue()
+        for partition in self.partitions:
+            self._free.put(partition)
+        super().__init__(
+            max_workers=partitions,
+            thread_name_prefix="pyblis-partition",
+            initializer=self._claim_partition,
+        )
+
+    def _claim_partition(self):
+        # Runs once in each worker thread; there are exactly as many
+        # workers as partitions.
+        cpus = self._free.get_nowait()
+        if self._pin:
+            os.sched_setaffinity(0, cpus)
+        _local.cpus = cpus
+        core._rntm_context.set(Rntm(num_threads=len(cpus)))
+
+    def __repr__(self):
+        sizes = [len(p) for p in self.partitions]
+        return f"<PartitionedExecutor partitions={sizes}>"
@@ -0,0 +1,259 @@
+import functools
+import inspect
+import math
+import threading
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from pyblis import core, ind
+from pyblis.packed import PackedMatrix
+
+# Callables that receive a CallRecord after every instrumented operation.
+# While the list is empty, instrumented wrappers only pay for the check.
+_observers = []
+_observers_lock = threading.Lock()
+
+CallRecord = namedtuple(
+    "CallRecord",
+    [
+        "op",
+        "dtype",
+        "shapes",
+        "flags",
+        "threads",
+        "thread_id",
+        "start",
+        "seconds",
+        "flops",
+        "bytes",
+        "method",
+    ],
+)
+
+_FLAG_PREFIXES = (
+    "trans",
+    "conj",
+    "uplo",
+    "side",
+    "unit_diag",
+    "diag_offset",
+    "compute_precision",
+)
+
+
+# Per-operation functions of a call's bound arguments giving the rntm it
+# runs with when it is not passed one, for wrappers that choose their own.
+_default_rntms = {}
+
+
+def set_default_rntm(op, fn):
+    _default_rntms[op] = fn
+
+
+def add_observer(observer):
+    with _observers_lock:
+        _observers.append(observer)
+
+
+def remove_observer(observer):
+    with _observers_lock:
+        _observers.remove(observer)
+
+
+def _vector(shapes):
+    return math.prod(shapes[0])
+
+
+def _diagonal(shapes):
+    return min(shapes[0])
+
+
+def _matrix(shapes):
+    return next(math.prod(shape) for shape in shapes if len(shape) == 2)
+
+
+def _half_matrix(shapes):
+    return _matrix(shapes) / 2
+
+
+def _gemm(shapes):
+    # op(A) is m x k whatever the transposition, so m * k is its size.
+    a, _, c = shapes
+    return math.prod(a) * c[1]
+
+
+def _gemmt(shapes):
+    return _gemm(shapes) / 2
+
+
+def _hemm(shapes):
+    a, _, c = shapes
+    return a[0] * c[0] * c[1]
+
+
+def _rank_k(shapes):
+    a, c = shapes[0], shapes[-1]
+    return c[0] * math.prod(a) / 2
+
+
+def _rank_2k(shapes):
+    return 2 * _rank_k(shapes)
+
+
+def _triangular(shapes):
+    a, out = shapes[0], shapes[-1]
+    return a[0] * out[0] * out[1] / 2
+
+
+# op -> (count, real flops per count, complex flops per count). Level-1 ops
+# count elements, level-2 and level-3 ops count multiply-adds.
+_COSTS = {
+    "addv": (_vector, 1, 2),
+    "amaxv": (_vector, 1, 2),
+    "axpyv": (_vector, 2, 8),
+    "axpbyv": (_vector, 3, 14),
+    "copyv": (_vector, 0, 0),
+    "dotv": (_vector, 2, 8),
+    "dotxv": (_vector, 2, 8),
+    "invertv": (_vector, 1, 6),
+    "invscalv": (_vector, 1, 6),
+    "scalv": (_vector, 1, 6),
+    "scal2v": (_vector, 1, 6),
+    "setv": (_vector, 0, 0),
+    "setrv": (_vector, 0, 0),
+    "setiv": (_vector, 0, 0),
+    "subv": (_vector, 1, 2),
+    "swapv": (_vector, 0, 0),
+    "axpy2v": (_vector, 4, 16),
+    "dotaxpyv": (_vector, 4, 16),
+    "axpym": (_matrix, 2, 8),
+    "copym": (_matrix, 0, 0),
+    "invscalm": (_matrix, 1, 6),
+    "scalm": (_matrix, 1, 6),
+    "scal2m": (_matrix, 1, 6),
+    "setm": (_matrix, 0, 0),
+    "setrm": (_matrix, 0, 0),
+    "setim": (_matrix, 0, 0),
+    "subm": (_matrix, 1, 2),
+    "addd": (_diagonal, 1, 2),
+    "axpyd": (_diagonal, 2, 8),
+    "copyd": (_diagonal, 0, 0),
+    "invertd": (_diagonal, 1, 6),
+    "scald": (_diagonal, 1, 6),
+    "scal2d": (_diagonal, 1, 6),
+    "setd": (_diagonal, 0, 0),
+    "setrd": (_diagonal, 0, 0),
+    "setid": (_diagonal, 0, 0),
+    "shiftd": (_diagonal, 1, 2),
+    "subd": (_diagonal, 1, 2),
+    "xpbyd": (_diagonal, 2, 8),
+    "axpyf": (_matrix, 2, 8),
+    "dotxf": (_matrix, 2, 8),
+    "dotxaxpyf": (_matrix, 4, 16),
+    "gemv": (_matrix, 2, 8),
+    "ger": (_matrix, 2, 8),
+    "hemv": (_matrix, 2, 8),
+    "symv": (_matrix, 2, 8),
+    "her": (_half_matrix, 2, 8),
+    "syr": (_half_matrix, 2, 8),
+    "her2": (_matrix, 2, 8),
+    "syr2": (_matrix, 2, 8),
+    "trmv": (_half_matrix, 2, 8),
+    "trsv": (_half_matrix, 2, 8),
+    "gemm": (_gemm, 2, 8),
+    "gemmt": (_gemmt, 2, 8),
+    "hemm": (_hemm, 2, 8),
+    "symm": (_hemm, 2, 8),
+    "herk": (_rank_k, 2, 8),
+    "syrk": (_rank_k, 2, 8),
+    "her2k": (_rank_2k, 2, 8),
+    "syr2k": (_rank_2k, 2, 8),
+    "trmm": (_triangular, 2, 8),
+    "trsm": (_triangular, 2, 8),
+    "trmm3": (_triangular, 2, 8),
+}
+
+
+def op_cost(op, shapes, dtype):
+    """
+    Analytic (flops, bytes) of one operation. Bytes count every operand
+    read or written once, the minimum memory traffic of the call.
+    """
+    dtype = np.dtype(dtype)
+    nbytes = sum(math.prod(shape) for shape in shapes) * dtype.itemsize
+    if op not in _COSTS:
+        return 0, nbytes
+    count, real, cplx = _COSTS[op]
+    return count(shapes) * (cplx if dtype.kind == "c" else real), nbytes
+
+
+def notify(op, dtype, shapes, flags, rntm, start, seconds, method=None):
+    flops, nbytes = op_cost(op, shapes, dtype)
+    record = CallRecord(
+        op,
+        np.dtype(dtype).char,
+        shapes,
+        flags,
+        core.bli_rntm_num_threads(rntm),
+        threading.get_ident(),
+        start,
+        seconds,
+        flops,
+        nbytes,
+        method,
+    )
+    for observer in tuple(_observers):
+        observer(record)
+
+
+def instrument(fn=None, *, name=None):
+    """
+    Report calls of a wrapper to the registered observers. The operation
+    name defaults to the function name.
+    """
+    if fn is None:
+        return functools.partial(instrument, name=name)
+    op = name or fn.__name__
+    sig = inspect.signature(fn)
+    flag_defaults = {
+        param.name: param.default
+        for param in sig.parameters.values()
+        if param.name.startswith(_FLAG_PREFIXES)
+    }
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if not _observers:
+            return fn(*args, **kwargs)
+        bound = sig.bind(*args, **kwargs).arguments
+        arrays = [
+            v.array if isinstance(v, PackedMatrix) else v
+            for v in bound.values()
+            if isinstance(v, (np.ndarray, PackedMatrix))
+        ]
+        flags = tuple(
+            (key, bound[key])
+            for key, default in flag_defaults.items()
+            if key in bound and bound[key] != default
+        )
+        rntm = bound.get("rntm")
+        if rntm is None and op in _default_rntms:
+            rntm = _default_rntms[op](bound)
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        seconds = time.perf_counter() - start
+        notify(
+            op,
+            arrays[0].dtype,
+            tuple(arr.shape for arr in arrays),
+            flags,
+            rntm,
+            start,
+            seconds,
+            ind.implementation(op, [arr.dtype for arr in arrays], bound.get("method")),
+        )
+        return result
+
+    return wrapper
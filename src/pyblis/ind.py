@@ -0,0 +1,194 @@
+import ctypes
+import functools
+from contextlib import contextmanager
+
+import numpy as np
+
+from pyblis import core
+from pyblis.core import libblis
+
+core.declare("bli_ind_get_impl_string", ctypes.c_char_p)
+core.declare("bli_ind_oper_get_avail_impl_string", ctypes.c_char_p)
+
+
+@functools.lru_cache(maxsize=None)
+def _method_names():
+    # The ind_t values, in order. Native execution is always the last one,
+    # whichever induced methods the BLIS release still has.
+    names = []
+    for method in range(16):
+        name = libblis.bli_ind_get_impl_string(method).decode()
+        names.append(name)
+        if name == "native":
+            break
+    return tuple(names)
+
+
+@functools.lru_cache(maxsize=None)
+def _operation_names():
+    # The level-3 opid_t values, in order. gemmt is only in newer releases.
+    return (
+        "gemm",
+        *(("gemmt",) if hasattr(libblis, "bli_gemmt") else ()),
+        "hemm",
+        "herk",
+        "her2k",
+        "symm",
+        "syrk",
+        "syr2k",
+        "trmm3",
+        "trmm",
+        "trsm",
+    )
+
+
+def __getattr__(name):
+    # METHODS and OPERATIONS come from the library, which is only loaded
+    # once it is needed.
+    if name == "METHODS":
+        return _method_names()
+    if name == "OPERATIONS":
+        return _operation_names()
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
+
+
+# Suffixes of the per-method entry points, e.g. bli_gemm1m, where they
+# differ from the method name.
+_SUFFIXES = {"native": "nat", "4m1b": "4mb", "4m1a": "4m1"}
+
+_functions = {}
+
+
+def _method_id(method):
+    methods = _method_names()
+    if method not in methods:
+        msg = f"Unknown induced method {method!r}, expected one of {methods}"
+        raise ValueError(msg)
+    return methods.index(method)
+
+
+def _opid(op):
+    operations = _operation_names()
+    if op not in operations:
+        msg = f"Induced methods apply to level-3 operations, not {op!r}"
+        raise ValueError(msg)
+    return operations.index(op)
+
+
+def _complex_dts(dtype):
+    if dtype is None:
+        return (core.BLIS_SCOMPLEX, core.BLIS_DCOMPLEX)
+    typechar = np.dtype(dtype).char
+    if typechar not in ("F", "D"):
+        msg = f"Induced methods apply to complex dtypes, not {np.dtype(dtype)}"
+        raise ValueError(msg)
+    return (core.typechar_to_blis_dt[typechar],)
+
+
+def available(op="gemm"):
+    """The methods BLIS implements for ``op``, native execution last."""
+    opid = _opid(op)
+    return tuple(
+        name
+        for method, name in enumerate(_method_names())
+        if name == "native" or libblis.bli_ind_oper_is_impl(opid, method)
+    )
+
+
+def enable(method, dtype=None):
+    """
+    Enable an induced method for every level-3 operation, in ``dtype`` or
+    in both complex dtypes. BLIS uses the enabled method it ranks highest.
+    """
+    method = _method_id(method)
+    for dt in _complex_dts(dtype):
+        libblis.bli_ind_enable_dt(method, dt)
+
+
+def disable(method, dtype=None):
+    method = _method_id(method)
+    for dt in _complex_dts(dtype):
+        libblis.bli_ind_disable_dt(method, dt)
+
+
+def disable_all(dtype=None):
+    """Go back to native complex kernels."""
+    for dt in _complex_dts(dtype):
+        libblis.bli_ind_disable_all_dt(dt)
+
+
+def is_enabled(method, op="gemm", dtype=np.complex128):
+    (dt,) = _complex_dts(dtype)
+    return bool(libblis.bli_l3_ind_oper_get_enable(_opid(op), _method_id(method), dt))
+
+
+def current(op="gemm", dtype=np.complex128):
+    """The method ``op`` currently runs with on complex operands."""
+    (dt,) = _complex_dts(dtype)
+    return libblis.bli_ind_oper_get_avail_impl_string(_opid(op), dt).decode()
+
+
+@contextmanager
+def using(method, dtype=None):
+    """
+    Run every complex level-3 operation in the block with ``method`` (or
+    natively, for "native"), restoring the previous settings on exit.
+
+    The settings are global to the process, so operations on other
+    threads are affected too; pass ``method=`` to a single operation to
+    avoid that.
+    """
+    method_id = _method_id(method)
+    dts = _complex_dts(dtype)
+    induced = range(len(_method_names()) - 1)
+    saved = [
+        (opid, ind, dt, libblis.bli_l3_ind_oper_get_enable(opid, ind, dt))
+        for opid in range(len(_operation_names()))
+        for ind in induced
+        for dt in dts
+    ]
+    for dt in dts:
+        libblis.bli_ind_disable_all_dt(dt)
+        if method != "native":
+            libblis.bli_ind_enable_dt(method_id, dt)
+    try:
+        yield
+    finally:
+        for opid, ind, dt, status in saved:
+            libblis.bli_l3_ind_oper_set_enable(opid, ind, dt, status)
+
+
+def function(op, method):
+    """
+    The BLIS entry point running ``op`` with ``method`` regardless of the
+    global settings, such as bli_gemm1m. It takes the same arguments as
+    bli_<op>_ex.
+    """
+    key = (op, method)
+    fn = _functions.get(key)
+    if fn is None:
+        _opid(op)
+        _method_id(method)
+        try:
+            fn = getattr(libblis, f"bli_{op}{_SUFFIXES.get(method, method)}")
+        except AttributeError:
+            msg = f"This BLIS build has no {method} implementation of {op}"
+            raise ValueError(msg) from None
+        _functions[key] = fn
+    return fn
+
+
+def implementation(op, dtypes, method=None):
+    """
+    The name of the implementation a call of ``op`` on operands of the
+    given dtypes runs with, or None for operations without induced
+    methods.
+    """
+    if op not in _operation_names():
+        return None
+    if method is not None:
+        return method
+    if not all(np.dtype(dtype).kind == "c" for dtype in dtypes):
+        return "native"
+    return current(op, dtypes[-1])
@@ -0,0 +1,136 @@
+"""
+The configuration of the loaded BLIS library: version, sub-configuration,
+SIMD and blocksize parameters, threading and microkernels.
+
+    python -m pyblis.info
+
+prints all of it as JSON. Set PYBLIS_ARCH to the name of a
+sub-configuration (see :func:`built_archs`) before pyblis is imported to
+run that one instead of the one BLIS picks for the CPU.
+"""
+
+import ctypes
+import json
+
+from pyblis import core, ind
+from pyblis.core import arch_names, built_archs, libblis
+
+_TYPECHARS = ("f", "d", "F", "D")
+_UKRS = ("gemm", "gemmtrsm_l", "gemmtrsm_u", "trsm_l", "trsm_u")
+
+for _name in _UKRS:
+    core.declare(f"bli_info_get_{_name}_ukr_impl_string", ctypes.c_char_p)
+
+# BLIS's abbreviations in the microkernel implementation strings.
+_UKR_IMPLS = {
+    "refrnce": "reference",
+    "virtual": "virtual",
+    "optimzd": "optimized",
+    "notappl": "not applicable",
+}
+
+
+def version():
+    return libblis.bli_info_get_version_str().decode()
+
+
+def arch():
+    """The sub-configuration BLIS runs."""
+    return arch_names()[libblis.bli_arch_query_id()]
+
+
+def detected_arch():
+    """The sub-configuration BLIS picks for this CPU."""
+    return arch_names()[libblis.bli_cpuid_query_id()]
+
+
+def arch_override_supported():
+    """
+    Whether PYBLIS_ARCH can select a sub-configuration: the library must
+    hold more than one and honor BLIS_ARCH_TYPE, which BLIS does from 0.8.
+    """
+    major, minor = (int(part) for part in version().split(".")[:2])
+    return len(built_archs()) > 1 and (major, minor) >= (0, 8)
+
+
+def simd():
+    """
+    The SIMD limits BLIS was compiled with: the largest register size (in
+    bytes) and register count over every configuration built in, which
+    need not be those of the active arch, and the alignment it uses.
+    """
+    return {
+        "max_register_size": libblis.bli_info_get_simd_size(),
+        "max_num_registers": libblis.bli_info_get_simd_num_registers(),
+        "align_size": libblis.bli_info_get_simd_align_size(),
+    }
+
+
+def blocksizes(typechar=None):
+    """
+    The blocksizes and fusing factors of :func:`pyblis.core.bli_blocksizes`
+    for one datatype, or a dict of them for every datatype.
+    """
+    if typechar is not None:
+        return core.bli_blocksizes(typechar)
+    return {t: core.bli_blocksizes(t) for t in _TYPECHARS}
+
+
+def sup_thresholds(typechar=None):
+    """
+    The thresholds of :func:`pyblis.core.bli_sup_thresholds` for one
+    datatype, or a dict of them for every datatype.
+    """
+    if typechar is not None:
+        return core.bli_sup_thresholds(typechar)
+    return {t: core.bli_sup_thresholds(t) for t in _TYPECHARS}
+
+
+def threading_config():
+    if libblis.bli_info_get_enable_openmp():
+        backend = "openmp"
+    elif libblis.bli_info_get_enable_pthreads():
+        backend = "pthreads"
+    else:
+        backend = "none"
+    return {"backend": backend, "num_threads": libblis.bli_thread_get_num_threads()}
+
+
+def microkernels(typechar=None):
+    """
+    Whether the native level-3 microkernels of the active configuration
+    are optimized or reference implementations, per datatype.
+    """
+    if typechar is None:
+        return {t: microkernels(t) for t in _TYPECHARS}
+    native = len(ind.METHODS) - 1
+    dt = core.typechar_to_blis_dt[typechar]
+    impls = {}
+    for name in _UKRS:
+        impl = getattr(libblis, f"bli_info_get_{name}_ukr_impl_string")(native, dt)
+        impls[name] = _UKR_IMPLS.get(impl.decode(), impl.decode())
+    return impls
+
+
+def summary():
+    return {
+        "version": version(),
+        "arch": arch(),
+        "detected_arch": detected_arch(),
+        "built_archs": list(built_archs()),
+        "arch_override_supported": arch_override_supported(),
+        "int_type_size": core.int_type_size,
+        "simd": simd(),
+        "blocksizes": blocksizes(),
+        "sup_thresholds": sup_thresholds(),
+        "threading": threading_config(),
+        "microkernels": microkernels(),
+    }
+
+
+def main():
+    print(json.dumps(summary(), indent=2))  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,469 @@
+from collections import namedtuple
+
+import numpy as np
+
+from pyblis import blis_l1m, blis_l1v, blis_l2, blis_l3
+
+_BLIS_TYPECHARS = "fdFD"
+
+# A leaf array as it enters a BLIS call: op(array), where op transposes
+# and/or conjugates.
+Operand = namedtuple("Operand", ["array", "trans", "conj"])
+
+# One term of an expression in normal form: coef * op(a) for a leaf
+# (b is None), or coef * op(a) @ op(b) for a product.
+Term = namedtuple("Term", ["coef", "a", "b"])
+
+
+def _view(operand):
+    # op(array) as an array, with any conjugation left to the BLIS call.
+    return operand.array.T if operand.trans else operand.array
+
+
+def _is_scalar(value):
+    return isinstance(value, (int, float, complex, np.number))
+
+
+class Expr:
+    """
+    A deferred computation on arrays. Combining expressions with ``+``,
+    ``-``, scalar ``*`` and ``/``, ``@``, :attr:`T`, :attr:`H` and
+    :meth:`conj` builds a larger expression; nothing runs until
+    :meth:`evaluate` (or np.asarray) is called, which maps the whole
+    expression onto as few fused BLIS calls as it can.
+    """
+
+    __array_ufunc__ = None
+
+    shape = ()
+    dtype = None
+
+    @property
+    def ndim(self):
+        return len(self.shape)
+
+    def __add__(self, other):
+        other = _as_expr(other)
+        if other is NotImplemented:
+            return NotImplemented
+        return Sum((self, other))
+
+    def __radd__(self, other):
+        other = _as_expr(other)
+        if other is NotImplemented:
+            return NotImplemented
+        return Sum((other, self))
+
+    def __sub__(self, other):
+        other = _as_expr(other)
+        if other is NotImplemented:
+            return NotImplemented
+        return Sum((self, Scale(-1, other)))
+
+    def __rsub__(self, other):
+        other = _as_expr(other)
+        if other is NotImplemented:
+            return NotImplemented
+        return Sum((other, Scale(-1, self)))
+
+    def __neg__(self):
+        return Scale(-1, self)
+
+    def __mul__(self, other):
+        if not _is_scalar(other):
+            return NotImplemented
+        return Scale(other, self)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        if not _is_scalar(other):
+            return NotImplemented
+        return Scale(1 / other, self)
+
+    def __matmul__(self, other):
+        other = _as_expr(other)
+        if other is NotImplemented:
+            return NotImplemented
+        return MatMul(self, other)
+
+    def __rmatmul__(self, other):
+        other = _as_expr(other)
+        if other is NotImplemented:
+            return NotImplemented
+        return MatMul(other, self)
+
+    @property
+    def T(self):
+        return Flip(self, trans=True, conj=False)
+
+    @property
+    def H(self):
+        return Flip(self, trans=True, conj=True)
+
+    def conj(self):
+        return Flip(self, trans=False, conj=True)
+
+    def terms(self):
+        """The expression in normal form, as a list of :class:`Term`."""
+        return _terms(self, 1, False, False)
+
+    def evaluate(self, out=None):
+        """
+        Compute the expression, into ``out`` if given. ``out`` may appear in
+        the expression itself, as in ``(2 * a @ b + c).evaluate(out=c)``,
+        which then updates it in place.
+        """
+        return _evaluate(self, out)
+
+    def __array__(self, dtype=None, copy=None):
+        result = np.asarray(self.evaluate())
+        return result if dtype is None else result.astype(dtype, copy=False)
+
+
+class Leaf(Expr):
+    def __init__(self, array):
+        if array.dtype.char not in _BLIS_TYPECHARS:
+            msg = f"Lazy expressions need a BLIS dtype, got {array.dtype}"
+            raise TypeError(msg)
+        if array.ndim > 2:
+            msg = f"Lazy expressions take 1-D and 2-D arrays, got {array.ndim}-D"
+            raise ValueError(msg)
+        self.array = array
+        self.shape = array.shape
+        self.dtype = array.dtype
+
+
+class Scale(Expr):
+    def __init__(self, alpha, child):
+        self.alpha = alpha
+        self.child = child
+        self.shape = child.shape
+        self.dtype = np.result_type(child.dtype, alpha)
+
+
+class Sum(Expr):
+    def __init__(self, children):
+        shapes = {child.shape for child in children}
+        if len(shapes) != 1:
+            msg = f"Cannot add operands of shapes {sorted(shapes)}"
+            raise ValueError(msg)
+        self.children = children
+        self.shape = children[0].shape
+        self.dtype = np.result_type(*(child.dtype for child in children))
+
+
+class Flip(Expr):
+    # Transposition and/or conjugation.
+    def __init__(self, child, trans, conj):
+        self.child = child
+        self.trans = trans and child.ndim == 2
+        self.conj = conj
+        self.shape = child.shape[::-1] if self.trans else child.shape
+        self.dtype = child.dtype
+
+
+class MatMul(Expr):
+    def __init__(self, a, b):
+        if a.shape[-1] != b.shape[0]:
+            msg = f"Shapes {a.shape} and {b.shape} are not aligned"
+            raise ValueError(msg)
+        self.a = a
+        self.b = b
+        self.shape = a.shape[:-1] + b.shape[1:]
+        self.dtype = np.result_type(a.dtype, b.dtype)
+
+
+def array(arr):
+    """A lazy expression standing for ``arr``."""
+    return Leaf(np.asarray(arr))
+
+
+def _as_expr(value):
+    if isinstance(value, Expr):
+        return value
+    if isinstance(value, np.ndarray):
+        return Leaf(value)
+    return NotImplemented
+
+
+def _terms(expr, coef, trans, conj):
+    # The terms of op(coef * expr), op transposing and/or conjugating.
+    if isinstance(expr, Leaf):
+        return [Term(coef, Operand(expr.array, trans and expr.ndim == 2, conj), None)]
+    if isinstance(expr, Scale):
+        alpha = np.conj(expr.alpha) if conj else expr.alpha
+        return _terms(expr.child, coef * alpha, trans, conj)
+    if isinstance(expr, Sum):
+        return [
+            term for child in expr.children for term in _terms(child, coef, trans, conj)
+        ]
+    if isinstance(expr, Flip):
+        return _terms(expr.child, coef, trans != expr.trans, conj != expr.conj)
+
+    # (A B)^T = B^T A^T; vectors are their own transposes.
+    a, b = expr.a, expr.b
+    if trans and expr.ndim == 2:
+        a, b = b, a
+    a_coef, a_op = _factor(a, trans and expr.ndim == 2, conj)
+    b_coef, b_op = _factor(b, trans and expr.ndim == 2, conj)
+    return [Term(coef * a_coef * b_coef, a_op, b_op)]
+
+
+def _factor(expr, trans, conj):
+    # A factor of a product as coef * op(array), evaluating it first if it
+    # is not a scaled leaf.
+    terms = _terms(expr, 1, trans, conj)
+    if len(terms) == 1 and terms[0].b is None:
+        return terms[0].coef, terms[0].a
+    flipped = Flip(expr, trans, conj) if trans or conj else expr
+    return 1, Operand(flipped.evaluate(), False, False)
+
+
+def _evaluate(expr, out):
+    terms = expr.terms()
+    dtype = expr.dtype
+    if expr.ndim == 0:
+        return dtype.type(sum(_dot(term, dtype) for term in terms))
+
+    beta = 0
+    accumulate = False
+    if out is None:
+        # A sum of leaves goes into a zeroed output, in the leaves' element
+        # order if they share one. The allocator zeroes it without a pass
+        # over memory, so the first two leaves fuse into one axpy2v too.
+        if len(terms) > 1 and all(term.b is None for term in terms):
+            order = (
+                "F" if all(_view(term.a).flags.f_contiguous for term in terms) else "C"
+            )
+            out = np.zeros(expr.shape, dtype=dtype, order=order)
+            beta, accumulate = 1, True
+        else:
+            out = np.empty(expr.shape, dtype=dtype)
+    elif out.shape != expr.shape:
+        msg = f"Output has shape {out.shape}, expected {expr.shape}"
+        raise ValueError(msg)
+
+    # A leaf that is the output itself is accumulated in place. Any other
+    # operand overlapping the output is copied first.
+    operands = []
+    for term in terms:
+        if (
+            term.b is None
+            and term.a.array is out
+            and not term.a.trans
+            and not term.a.conj
+        ):
+            beta += term.coef
+            accumulate = True
+        else:
+            operands.append(
+                Term(term.coef, _unaliased(term.a, out), _unaliased(term.b, out))
+            )
+    if accumulate and beta == 1 and not operands:
+        return out
+
+    products = [term for term in operands if term.b is not None]
+    leaves = [term for term in operands if term.b is None]
+    for term in products:
+        _product(term, beta if accumulate else 0, out)
+        beta, accumulate = 1, True
+    if out.ndim == 2 and leaves:
+        flat = _flatten(out, [_view(term.a) for term in leaves])
+        if flat is not None:
+            out_flat, views = flat
+            leaves = [
+                Term(term.coef, Operand(view, False, term.a.conj), None)
+                for term, view in zip(leaves, views)
+            ]
+            _vector_sum(leaves, out_flat, dtype, beta, accumulate)
+        else:
+            _matrix_sum(leaves, out, dtype, beta, accumulate)
+    elif out.ndim == 1 and leaves:
+        _vector_sum(leaves, out, dtype, beta, accumulate)
+    elif not products:
+        _scale(beta, out)
+    return out
+
+
+def _unaliased(operand, out):
+    if operand is None or not np.may_share_memory(operand.array, out):
+        return operand
+    return operand._replace(array=operand.array.copy())
+
+
+def _cast(operand, dtype):
+    return operand._replace(array=operand.array.astype(dtype, copy=False))
+
+
+def _dot(term, dtype):
+    if term.b is None:
+        return term.coef * term.a.array[()]
+    x, y = _cast(term.a, dtype), _cast(term.b, dtype)
+    return term.coef * blis_l1v.dotv(x.array, y.array, conjx=x.conj, conjy=y.conj)
+
+
+def _product(term, beta, out):
+    a, b = term.a, term.b
+    if out.ndim == 2:
+        if np.iscomplexobj(term.coef) and not (
+            a.array.dtype == b.array.dtype == out.dtype
+        ):
+            # Mixed-datatype gemm does not take a complex alpha.
+            a, b = _cast(a, out.dtype), _cast(b, out.dtype)
+        blis_l3.gemm(
+            term.coef,
+            a.array,
+            b.array,
+            beta,
+            out,
+            transa=a.trans,
+            transb=b.trans,
+            conja=a.conj,
+            conjb=b.conj,
+        )
+        return
+    a, b = _cast(a, out.dtype), _cast(b, out.dtype)
+    if a.array.ndim == 2:
+        blis_l2.gemv(
+            term.coef,
+            a.array,
+            b.array,
+            beta,
+            out,
+            transa=a.trans,
+            conja=a.conj,
+            conjx=b.conj,
+        )
+    else:
+        # x^T B = B^T x
+        blis_l2.gemv(
+            term.coef,
+            b.array,
+            a.array,
+            beta,
+            out,
+            transa=not b.trans,
+            conja=b.conj,
+            conjx=a.conj,
+        )
+
+
+def _flatten(out, views):
+    # 1-D views of out and of the leaves in one common element order, if
+    # they all have one.
+    for order, flag in (("C", "C_CONTIGUOUS"), ("F", "F_CONTIGUOUS")):
+        if all(arr.flags[flag] for arr in (out, *views)):
+            return out.ravel(order), [view.ravel(order) for view in views]
+    return None
+
+
+def _scale(beta, out):
+    if out.ndim == 2:
+        blis_l1m.scalm(beta, out)
+    else:
+        blis_l1v.scalv(beta, out)
+
+
+def _vector_sum(leaves, out, dtype, beta, accumulate):
+    # out := beta * out + sum(coef * x): axpbyv folds the scaling of out
+    # into the first leaf, and axpy2v takes the rest two at a time.
+    terms = [Term(term.coef, _cast(term.a, dtype), None) for term in leaves]
+    if not accumulate:
+        first = terms.pop(0)
+        blis_l1v.scal2v(first.coef, first.a.array, out, conj=first.a.conj)
+    elif beta != 1:
+        first = terms.pop(0)
+        blis_l1v.axpbyv(first.coef, first.a.array, beta, out, conjx=first.a.conj)
+    for x, y in zip(terms[::2], terms[1::2]):
+        blis_l1v.axpy2v(
+            x.coef, y.coef, x.a.array, y.a.array, out, conjx=x.a.conj, conjy=y.a.conj
+        )
+    if len(terms) % 2:
+        last = terms[-1]
+        blis_l1v.axpyv(last.coef, last.a.array, out, conj=last.a.conj)
+
+
+def _matrix_sum(leaves, out, dtype, beta, accumulate):
+    # out := beta * out + sum(coef * op(a)) through scal2m or scalm, then
+    # axpym.
+    leaves = list(leaves)
+    if not accumulate:
+        first = leaves.pop(0)
+        a = _cast(first.a, dtype)
+        blis_l1m.scal2m(first.coef, a.array, out, transa=a.trans, conja=a.conj)
+    elif beta != 1:
+        blis_l1m.scalm(beta, out)
+    for term in leaves:
+        a = _cast(term.a, dtype)
+        blis_l1m.axpym(term.coef, a.array, out, transa=a.trans, conja=a.conj)
+
+
+def evaluate(*exprs, out=None):
+    """
+    Compute several expressions together, into the arrays of ``out`` where
+    given. A dot product ``x @ y`` evaluated with an update ``z + alpha * x``
+    of one of its vectors is fused into a single dotaxpyv pass over x.
+    """
+    outs = [None] * len(exprs) if out is None else list(out)
+    results = [None] * len(exprs)
+    for i, j, coef, alpha, x, y, z in _dotaxpy_pairs(exprs, outs):
+        target = outs[j]
+        if target is None:
+            target = z.copy()
+        elif target is not z:
+            target[...] = z
+        rho = blis_l1v.dotaxpyv(
+            alpha, x.array, y.array, target, conjx=x.conj, conjy=y.conj
+        )
+        results[i] = exprs[i].dtype.type(coef * rho)
+        results[j] = target
+    for k, expr in enumerate(exprs):
+        if results[k] is None:
+            results[k] = expr.evaluate(out=outs[k])
+    return tuple(results)
+
+
+def _dotaxpy_pairs(exprs, outs):
+    # Yields (i, j, coef, alpha, x, y, z) for each dot product
+    # exprs[i] = coef * op(x) @ op(y) that dotaxpyv can compute together
+    # with an update exprs[j] = z + alpha * op(x), all of one dtype.
+    terms = [expr.terms() for expr in exprs]
+    dots = [
+        i
+        for i, expr in enumerate(exprs)
+        if expr.ndim == 0 and len(terms[i]) == 1 and terms[i][0].b is not None
+    ]
+    updates = [
+        j
+        for j, expr in enumerate(exprs)
+        if expr.ndim == 1
+        and len(terms[j]) == 2
+        and all(term.b is None for term in terms[j])
+    ]
+    for i in dots:
+        (dot,) = terms[i]
+        for j in updates:
+            match = _dotaxpy_match(dot, terms[j], exprs[j].dtype, outs[j])
+            if match is not None:
+                updates.remove(j)
+                yield (i, j, dot.coef, *match)
+                break
+
+
+def _dotaxpy_match(dot, update, dtype, out):
+    for z_term, x_term in (update, update[::-1]):
+        for x, y in ((dot.a, dot.b), (dot.b, dot.a)):
+            z = z_term.a.array
+            target = z if out is None else out
+            if (
+                x.array is x_term.a.array
+                and x.conj == x_term.a.conj
+                and z_term.coef == 1
+                and not z_term.a.conj
+                and x.array.dtype == y.array.dtype == z.dtype == dtype
+                and not np.may_share_memory(target, x.array)
+                and not np.may_share_memory(target, y.array)
+            ):
+                return x_term.coef, x, y, z
+    return None
@@ -0,0 +1,255 @@
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+
+from pyblis import blis_l1v, blis_l2, blis_l3
+
+# The NumPy functions, saved before override() can replace them.
+_np_matmul = np.matmul
+_np_dot = np.dot
+
+_BLIS_TYPECHARS = "fdFD"
+
+
+def _supported(*arrays):
+    # gemm takes each operand in its own dtype, so every one of them (not
+    # only the result type) must be one BLIS computes with.
+    return all(arr is None or arr.dtype.char in _BLIS_TYPECHARS for arr in arrays)
+
+
+def _numpy_matmul(a, b, out, alpha, beta):
+    if alpha == 1 and beta == 0:
+        return _np_matmul(a, b, out=out)
+    result = alpha * _np_matmul(a, b)
+    if out is None:
+        return result
+    if beta != 0:
+        result = result + beta * out
+    out[...] = result
+    return out
+
+
+def _check_out(out, shape, dtype):
+    if out.shape != shape:
+        msg = f"Output has shape {out.shape}, expected {shape}"
+        raise ValueError(msg)
+    if not np.can_cast(dtype, out.dtype, "same_kind"):
+        msg = f"Cannot write a {dtype} product to an output of dtype {out.dtype}"
+        raise TypeError(msg)
+
+
+def _batch_operand(arr, batch):
+    # An operand of gemm_batched: a 2-D array for operands broadcast over
+    # the whole batch, a 3-D array when that is the batch as is, and a
+    # list of 2-D views otherwise.
+    if all(extent == 1 for extent in arr.shape[:-2]):
+        return arr.reshape(arr.shape[-2:])
+    if len(batch) == 1 and arr.shape[:-2] == batch:
+        return arr
+    arr = np.broadcast_to(arr, batch + arr.shape[-2:])
+    return [arr[idx] for idx in np.ndindex(*batch)]
+
+
+def matmul(a, b, out=None, alpha=1.0, beta=0.0, rntm=None):
+    """
+    out := alpha * (a @ b) + beta * out, following np.matmul's rules for
+    1-D and stacked operands.
+
+    Matrix products run through gemm (gemm_batched for stacks),
+    matrix-vector products through gemv and vector products through dotv.
+    ``out`` is allocated only when not given; a nonzero ``beta`` needs it.
+    Dtypes BLIS does not support and empty operands are left to NumPy.
+    """
+    a = np.asarray(a)
+    b = np.asarray(b)
+    if a.ndim == 0 or b.ndim == 0:
+        msg = "matmul operands must have at least one dimension"
+        raise ValueError(msg)
+    if beta != 0 and out is None:
+        msg = "A nonzero beta needs an output to accumulate into"
+        raise ValueError(msg)
+    dtype = np.result_type(a, b)
+    if not _supported(a, b, out) or a.size == 0 or b.size == 0:
+        return _numpy_matmul(a, b, out, alpha, beta)
+
+    if a.ndim == 1 and b.ndim == 1:
+        if a.size != b.size:
+            msg = f"matmul shapes {a.shape} and {b.shape} are not aligned"
+            raise ValueError(msg)
+        # Level-1/2 operands share one dtype, so mixed ones are converted.
+        rho = alpha * blis_l1v.dotv(
+            a.astype(dtype, copy=False), b.astype(dtype, copy=False), rntm=rntm
+        )
+        if out is None:
+            return dtype.type(rho)
+        _check_out(out, (), dtype)
+        out[...] = rho + beta * out if beta != 0 else rho
+        return out
+
+    a2 = a[np.newaxis] if a.ndim == 1 else a
+    b2 = b[:, np.newaxis] if b.ndim == 1 else b
+    if a2.shape[-1] != b2.shape[-2]:
+        msg = f"matmul shapes {a.shape} and {b.shape} are not aligned"
+        raise ValueError(msg)
+    batch = np.broadcast_shapes(a2.shape[:-2], b2.shape[:-2])
+    shape = batch + a.shape[-2:-1] + (b.shape[-1:] if b.ndim > 1 else ())
+    if out is None:
+        out = np.empty(shape, dtype=dtype)
+    else:
+        _check_out(out, shape, dtype)
+        if np.may_share_memory(out, a) or np.may_share_memory(out, b):
+            # BLIS would overwrite inputs it has yet to read.
+            tmp = out.copy() if beta != 0 else None
+            out[...] = matmul(a, b, tmp, alpha, beta, rntm)
+            return out
+
+    if a.ndim == 2 and b.ndim == 2:
+        blis_l3.gemm(alpha, a, b, beta, out, rntm=rntm)
+    elif not batch:
+        work = out if out.dtype == dtype else out.astype(dtype)
+        a, b = a.astype(dtype, copy=False), b.astype(dtype, copy=False)
+        if b.ndim == 1:
+            blis_l2.gemv(alpha, a, b, beta, work, rntm=rntm)
+        else:
+            blis_l2.gemv(alpha, b, a, beta, work, transa=True, rntm=rntm)
+        if work is not out:
+            out[...] = work
+    else:
+        c = out
+        if a.ndim == 1:
+            c = c[..., np.newaxis, :]
+        if b.ndim == 1:
+            c = c[..., np.newaxis]
+        if len(batch) > 1:
+            c = [c[idx] for idx in np.ndindex(*batch)]
+        blis_l3.gemm_batched(
+            alpha,
+            _batch_operand(a2, batch),
+            _batch_operand(b2, batch),
+            beta,
+            c,
+            rntm=rntm,
+        )
+    return out
+
+
+def dot(a, b, out=None, rntm=None):
+    """
+    np.dot through BLIS: matmul for operands of up to two dimensions, and
+    one gemm over the flattened operands for higher-dimensional ones.
+    """
+    a = np.asarray(a)
+    b = np.asarray(b)
+    dtype = np.result_type(a, b)
+    if a.ndim == 0 or b.ndim == 0:
+        return np.multiply(a, b, out=out)
+    if a.ndim < 2 or b.ndim < 3:
+        return matmul(a, b, out=out, rntm=rntm)
+    if not _supported(a, b, out) or a.size == 0 or b.size == 0:
+        return _np_dot(a, b, out=out)
+    # dot(a, b)[i, j, :] sums a[i, :] * b[j, :, :] over the shared axis,
+    # which is one matrix product once b's stacks are laid side by side.
+    k = b.shape[-2]
+    if a.shape[-1] != k:
+        msg = f"dot shapes {a.shape} and {b.shape} are not aligned"
+        raise ValueError(msg)
+    shape = a.shape[:-1] + b.shape[:-2] + b.shape[-1:]
+    result = matmul(a.reshape(-1, k), np.moveaxis(b, -2, 0).reshape(k, -1))
+    result = result.reshape(shape)
+    if out is None:
+        return result
+    _check_out(out, shape, dtype)
+    out[...] = result
+    return out
+
+
+class BlisArray(np.ndarray):
+    """
+    An ndarray whose matrix products (``@``, np.matmul, np.dot and the
+    dot method) run through BLIS. Other operations behave as on ndarray;
+    arrays they return are BlisArrays too.
+    """
+
+    def __array_ufunc__(self, ufunc, method, *inputs, out=None, **kwargs):
+        inputs = tuple(_unwrap(x) for x in inputs)
+        outputs = None if out is None else tuple(_unwrap(x) for x in out)
+        if ufunc is _np_matmul and method == "__call__" and not kwargs:
+            result = matmul(*inputs, out=None if out is None else outputs[0])
+        else:
+            if out is not None:
+                kwargs["out"] = outputs
+            result = getattr(ufunc, method)(*inputs, **kwargs)
+        if out is not None:
+            return out[0] if len(out) == 1 else out
+        if isinstance(result, tuple):
+            return tuple(_wrap(x) for x in result)
+        return _wrap(result)
+
+    def __array_function__(self, func, types, args, kwargs):
+        if func is _np_dot:
+            return _dot(*args, **kwargs)
+        return super().__array_function__(func, types, args, kwargs)
+
+    def dot(self, b, out=None):
+        return _dot(self, b, out)
+
+
+def _dot(a, b, out=None):
+    result = dot(_unwrap(a), _unwrap(b), out=_unwrap(out))
+    return _wrap(result) if out is None else out
+
+
+def _unwrap(x):
+    return x.view(np.ndarray) if isinstance(x, BlisArray) else x
+
+
+def _wrap(x):
+    return x.view(BlisArray) if type(x) is np.ndarray else x
+
+
+def asblis(arr):
+    """A BlisArray view of ``arr``."""
+    return np.asarray(arr).view(BlisArray)
+
+
+def _matmul_override(a, b, out=None, **kwargs):
+    if kwargs:
+        return _np_matmul(a, b, out=out, **kwargs)
+    if isinstance(out, tuple):
+        (out,) = out
+    return matmul(a, b, out=out)
+
+
+def _dot_override(a, b, out=None):
+    return dot(a, b, out=out)
+
+
+_override_lock = threading.Lock()
+_override_depth = 0
+
+
+@contextmanager
+def override():
+    """
+    Route np.matmul and np.dot calls to BLIS while the block runs, for
+    code that calls them through the numpy module.
+
+    This replaces the module attributes, so it affects every thread, and
+    neither the ``@`` operator nor ndarray.dot on plain arrays is covered;
+    use :func:`asblis` operands for those.
+    """
+    global _override_depth  # noqa: PLW0603
+    with _override_lock:
+        if _override_depth == 0:
+            np.matmul = _matmul_override
+            np.dot = _dot_override
+        _override_depth += 1
+    try:
+        yield
+    finally:
+        with _override_lock:
+            _override_depth -= 1
+            if _override_depth == 0:
+                np.matmul = _np_matmul
+                np.dot = _np_dot
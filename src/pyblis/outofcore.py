@@ -0,0 +1,155 @@
+import math
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from pyblis import alloc, blis_l3, core
+
+DEFAULT_MEMORY_BUDGET = 1 << 30
+
+# Used when the blocksizes cannot be read from the BLIS context.
+_FALLBACK_BLOCKSIZES = {"mr": 8, "nr": 8, "mc": 256, "kc": 256, "nc": 4096}
+
+
+def _round_down(value, multiple):
+    return value // multiple * multiple
+
+
+def tile_sizes(m, n, k, dtype, memory_budget=DEFAULT_MEMORY_BUDGET):
+    """
+    The (tm, tn, tk) tiling :func:`gemm` uses: a tm x tn tile of C and two
+    tm x tk panels of A and two tk x tn panels of B (the second of each is
+    being prefetched) fit in ``memory_budget`` bytes. Tiles are multiples of
+    the BLIS cache blocksizes where the budget allows.
+    """
+    if m == 0 or n == 0:
+        # An empty C is never tiled.
+        return m, n, k
+    dtype = np.dtype(dtype)
+    blk = core.bli_blocksizes(dtype.char) or _FALLBACK_BLOCKSIZES
+    elems = memory_budget // dtype.itemsize
+    # Start from a few kc-deep panels and the largest square C tile that
+    # fits with them (shallower panels if the budget is tight), then give
+    # whatever budget is left to k.
+    tk = min(k, 4 * blk["kc"])
+    while True:
+        side = int(math.sqrt(4 * tk * tk + elems) - 2 * tk)
+        tm = (
+            m
+            if m <= side
+            else _round_down(side, blk["mc"]) or _round_down(side, blk["mr"])
+        )
+        tn = (
+            n
+            if n <= side
+            else _round_down(side, blk["nc"]) or _round_down(side, blk["nr"])
+        )
+        if tm and tn:
+            break
+        if tk == 1:
+            msg = f"A memory budget of {memory_budget} bytes is too small"
+            raise ValueError(msg)
+        tk //= 2
+    tk_max = (elems - tm * tn) // (2 * (tm + tn))
+    return tm, tn, min(k, max(tk, _round_down(tk_max, blk["kc"]) or tk_max))
+
+
+def _panel(arr, trans, rows, cols):
+    # The rows x cols block of op(arr).
+    return arr[cols, rows] if trans else arr[rows, cols]
+
+
+def gemm(
+    alpha,
+    a,
+    b,
+    beta,
+    c,
+    transa=False,
+    transb=False,
+    conja=False,
+    conjb=False,
+    memory_budget=DEFAULT_MEMORY_BUDGET,
+    rntm=None,
+):
+    """
+    C := beta * C + alpha * op(A) op(B) for operands that need not fit in
+    memory, such as np.memmap arrays backed by large files.
+
+    C is computed tile by tile, each tile accumulating over panels of A and
+    B copied into resident buffers. The panels for the next step are read
+    on a background thread while BLIS works on the current ones, and each
+    finished tile is written back to C. At most about ``memory_budget``
+    bytes of operand data are resident at a time.
+    """
+    m, n = c.shape
+    k = a.shape[0] if transa else a.shape[1]
+    b_rows, b_cols = (b.shape[1], b.shape[0]) if transb else b.shape
+    a_rows = a.shape[1] if transa else a.shape[0]
+    if (a_rows, b_rows, b_cols) != (m, k, n):
+        msg = f"Dimension mismatch in out-of-core gemm: {a.shape}, {b.shape}, {c.shape}"
+        raise ValueError(msg)
+    if not a.dtype == b.dtype == c.dtype:
+        msg = f"Operand dtypes differ: {a.dtype}, {b.dtype}, {c.dtype}"
+        raise ValueError(msg)
+    if m == 0 or n == 0:
+        return
+    if k == 0:
+        # BLIS semantics: beta == 0 overwrites C, NaN or Inf included.
+        if beta == 0:
+            c[...] = 0
+        else:
+            c *= beta
+        return
+
+    tm, tn, tk = tile_sizes(m, n, k, c.dtype, memory_budget)
+    a_shape = (tk, tm) if transa else (tm, tk)
+    b_shape = (tn, tk) if transb else (tk, tn)
+    a_bufs = [alloc.empty(a_shape, dtype=c.dtype) for _ in range(2)]
+    b_bufs = [alloc.empty(b_shape, dtype=c.dtype) for _ in range(2)]
+    c_buf = alloc.empty((tm, tn), dtype=c.dtype)
+
+    steps = [
+        (slice(i, min(i + tm, m)), slice(j, min(j + tn, n)), slice(p, min(p + tk, k)))
+        for j in range(0, n, tn)
+        for i in range(0, m, tm)
+        for p in range(0, k, tk)
+    ]
+
+    def load(step, slot):
+        rows, cols, inner = step
+        a_src = _panel(a, transa, rows, inner)
+        b_src = _panel(b, transb, inner, cols)
+        a_dst = a_bufs[slot][: a_src.shape[0], : a_src.shape[1]]
+        b_dst = b_bufs[slot][: b_src.shape[0], : b_src.shape[1]]
+        np.copyto(a_dst, a_src)
+        np.copyto(b_dst, b_src)
+        return a_dst, b_dst
+
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="pyblis-prefetch") as io:
+        pending = io.submit(load, steps[0], 0)
+        for t, (rows, cols, inner) in enumerate(steps):
+            a_panel, b_panel = pending.result()
+            if t + 1 < len(steps):
+                pending = io.submit(load, steps[t + 1], (t + 1) % 2)
+
+            c_tile = c_buf[: rows.stop - rows.start, : cols.stop - cols.start]
+            first = inner.start == 0
+            if first and beta != 0:
+                np.copyto(c_tile, c[rows, cols])
+            blis_l3.gemm(
+                alpha,
+                a_panel,
+                b_panel,
+                beta if first else 1.0,
+                c_tile,
+                transa=transa,
+                transb=transb,
+                conja=conja,
+                conjb=conjb,
+                rntm=rntm,
+            )
+            if inner.stop == k:
+                c[rows, cols] = c_tile
+    if isinstance(c, np.memmap):
+        c.flush()
@@ -0,0 +1,91 @@
+import numpy as np
+
+from pyblis import alloc, core
+
+
+def _leading_dim(extent, itemsize):
+    # Pad the leading dimension to whole cache lines, as bli_obj_create
+    # does, so that every row or column starts cache-line aligned.
+    per_line = alloc.CACHE_LINE // itemsize
+    return -(-extent // per_line) * per_line
+
+
+class PackedMatrix:
+    """
+    A gemm operand prepared once for many calls, such as a weight matrix
+    multiplied by a stream of different left-hand sides.
+
+    op(matrix) (with ``transpose`` and ``conjugate`` applied) is copied
+    into a cache-line-aligned buffer with padded rows or columns, in the
+    element order BLIS packs that operand from: row-major for ``operand``
+    "b", column-major for "a". Its BLIS descriptor is built once as well.
+    :func:`pyblis.blis_l3.gemm` accepts a PackedMatrix in place of the
+    array; its transposition and conjugation flags apply to op(matrix).
+
+    BLIS 0.7 has no public entry point for handing gemm micro-panels that
+    are already packed, so BLIS still packs the operand on every call. The
+    copy makes that packing a sequential, aligned read.
+    """
+
+    def __init__(
+        self,
+        matrix,
+        operand="b",
+        transpose=False,
+        conjugate=False,
+        dtype=None,
+        pool=None,
+    ):
+        if operand not in ("a", "b"):
+            msg = f"Unknown operand: {operand}, expected 'a' or 'b'"
+            raise ValueError(msg)
+        matrix = np.asarray(matrix)
+        if matrix.ndim != 2:
+            msg = f"Expected a 2-D matrix, got {matrix.ndim}-D"
+            raise ValueError(msg)
+        dtype = np.dtype(matrix.dtype if dtype is None else dtype)
+        if dtype.char not in ("f", "d", "F", "D"):
+            msg = f"Unsupported dtype: {dtype}"
+            raise ValueError(msg)
+        if pool is None:
+            pool = alloc.default_pool
+
+        source = matrix.T if transpose else matrix
+        if conjugate:
+            source = source.conj()
+        m, n = source.shape
+        if operand == "b":
+            buf = pool.empty((m, _leading_dim(n, dtype.itemsize)), dtype)
+            self.array = buf[:, :n]
+        else:
+            buf = pool.empty((_leading_dim(m, dtype.itemsize), n), dtype, order="F")
+            self.array = buf[:m, :]
+        np.copyto(self.array, source, casting="same_kind")
+        self.operand = operand
+        self._buffer = buf
+        self._obj = core.bli_obj_create_from(self.array)
+
+    @property
+    def shape(self):
+        return self.array.shape
+
+    @property
+    def dtype(self):
+        return self.array.dtype
+
+    @property
+    def ndim(self):
+        return 2
+
+    def descriptor(self):
+        """A private copy of the BLIS object viewing the packed copy."""
+        return core.bli_obj_copy(self._obj)
+
+    def __array__(self, dtype=None, copy=None):
+        array = self.array if dtype is None else self.array.astype(dtype, copy=False)
+        if copy and array is self.array:
+            return array.copy()
+        if copy is False and array is not self.array:
+            msg = f"Converting to {dtype} requires a copy"
+            raise ValueError(msg)
+        return array
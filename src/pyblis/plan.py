@@ -0,0 +1,131 @@
+import ctypes
+import time
+
+import numpy as np
+
+from pyblis import alloc, core, hooks, ind
+from pyblis.core import libblis
+
+_FLAG_BITS = (
+    core.BLIS_CONJTRANS_BITS
+    | core.BLIS_UPLO_BITS
+    | core.BLIS_UNIT_DIAG_BIT
+    | core.BLIS_STRUC_BITS
+)
+
+
+def info_bits(
+    conjtrans=0, uplo=core.BLIS_DENSE, unit_diag=False, struc=core.BLIS_GENERAL
+):
+    bits = conjtrans | uplo | struc
+    if unit_diag:
+        bits |= core.BLIS_UNIT_DIAG
+    return bits
+
+
+def _resolve(fn_name, nobj, has_side):
+    # A private function pointer, so that setting argtypes here does not
+    # affect other users of the same symbol.
+    fn = libblis._FuncPtr((fn_name, libblis))
+    argtypes = [ctypes.c_int] if has_side else []
+    argtypes += [ctypes.POINTER(core._obj_t)] * nobj
+    argtypes += [ctypes.c_void_p, ctypes.POINTER(core._rntm_t)]
+    fn.argtypes = argtypes
+    fn.restype = None
+    return fn
+
+
+class Plan:
+    """
+    A level-3 operation with its shapes, datatype, flags, scalars and
+    threading fixed up front, in the spirit of FFTW plans.
+
+    Calling a plan does no argument checking or flag parsing: the operands
+    must have the shapes and datatype the plan was built for. A plan built
+    without ``num_threads`` or ``ways`` follows ``pyblis.threads()``.
+    """
+
+    def __init__(
+        self,
+        opname,
+        shapes,
+        dtype,
+        flags,
+        alpha,
+        beta=None,
+        side=None,
+        num_threads=None,
+        ways=None,
+    ):
+        self.opname = opname
+        self.shapes = tuple(tuple(shape) for shape in shapes)
+        self.dtype = np.dtype(dtype)
+        typechar = self.dtype.char
+        if typechar not in ("f", "d", "F", "D"):
+            msg = f"Unsupported dtype: {self.dtype}"
+            raise ValueError(msg)
+        if typechar in ("f", "d") and (np.iscomplexobj(alpha) or np.iscomplexobj(beta)):
+            msg = f"Complex scalars require a complex dtype, got {self.dtype}"
+            raise ValueError(msg)
+
+        self._flags = [(~_FLAG_BITS, bits) for bits in flags]
+
+        self._alpha = core.bli_scalar(alpha, typechar)
+        self._beta = None if beta is None else core.bli_scalar(beta, typechar)
+        self._lead = (self._alpha,) if side is None else (side, self._alpha)
+        if num_threads is None and ways is None:
+            self.rntm = self._rntm = None
+        else:
+            self.rntm = core.bli_rntm_create(num_threads, ways)
+            self._rntm = ctypes.byref(self.rntm)
+        self._fn = _resolve(
+            f"bli_{opname}_ex", len(flags) + 1 + (beta is not None), side is not None
+        )
+
+    def __call__(self, *arrays):
+        if not hooks._observers:
+            self._run(arrays)
+            return
+        start = time.perf_counter()
+        self._run(arrays)
+        seconds = time.perf_counter() - start
+        hooks.notify(
+            self.opname,
+            self.dtype,
+            self.shapes,
+            (),
+            self.rntm,
+            start,
+            seconds,
+            ind.implementation(self.opname, (self.dtype,)),
+        )
+
+    def _run(self, arrays):
+        objs = []
+        last = len(self._flags) - 1
+        for i, (arr, (keep, bits)) in enumerate(zip(arrays, self._flags)):
+            obj = core.bli_obj_create_from(arr, output=i == last)
+            obj.info = (obj.info & keep) | bits
+            objs.append(obj)
+        if self.opname == "gemm":
+            rntm = core.bli_rntm_arg(self.rntm, objs)
+        elif self._rntm is not None:
+            rntm = self._rntm
+        else:
+            rntm = core.bli_rntm_arg(None)
+        if self._beta is None:
+            self._fn(*self._lead, *objs, None, rntm)
+        else:
+            self._fn(*self._lead, *objs[:-1], self._beta, objs[-1], None, rntm)
+
+    def empty_output(self, pool=None):
+        """
+        An uninitialized array for the plan's output operand, taken from
+        ``pool`` (by default the pyblis buffer pool), so that repeated calls
+        in a loop can reuse freed outputs instead of allocating new ones.
+        """
+        return (pool or alloc.default_pool).empty(self.shapes[-1], self.dtype)
+
+    def __repr__(self):
+        shapes = ", ".join(str(shape) for shape in self.shapes)
+        return f"<Plan {self.opname} {shapes} {self.dtype}>"
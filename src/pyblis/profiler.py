@@ -0,0 +1,92 @@
+import threading
+from contextlib import contextmanager
+
+from pyblis import hooks
+
+_SUMMARY_FIELDS = ("op", "dtype", "method", "shapes", "flags", "threads")
+
+
+class Profile:
+    """
+    Collects a CallRecord for every pyblis operation while registered as
+    an observer, see :func:`profile`.
+    """
+
+    def __init__(self):
+        self.records = []
+        self._lock = threading.Lock()
+
+    def __call__(self, record):
+        with self._lock:
+            self.records.append(record)
+
+    def summary(self, by=("op", "dtype", "method")):
+        """
+        Aggregate the records over the given CallRecord fields, slowest
+        group first. Each row is a dict with the grouping fields, the number
+        of calls, total seconds, flops and bytes, and the achieved GFLOPS
+        and GB/s.
+        """
+        unknown = set(by) - set(_SUMMARY_FIELDS)
+        if unknown:
+            msg = f"Cannot group by {sorted(unknown)}"
+            raise ValueError(msg)
+        groups = {}
+        with self._lock:
+            records = list(self.records)
+        for record in records:
+            key = tuple(getattr(record, field) for field in by)
+            row = groups.get(key)
+            if row is None:
+                row = groups[key] = dict(zip(by, key))
+                row.update(calls=0, seconds=0.0, flops=0, bytes=0)
+            row["calls"] += 1
+            row["seconds"] += record.seconds
+            row["flops"] += record.flops
+            row["bytes"] += record.bytes
+        rows = sorted(groups.values(), key=lambda row: row["seconds"], reverse=True)
+        for row in rows:
+            seconds = row["seconds"] or float("inf")
+            row["gflops"] = row["flops"] / seconds / 1e9
+            row["gbps"] = row["bytes"] / seconds / 1e9
+        return rows
+
+    def table(self, by=("op", "dtype", "method")):
+        rows = self.summary(by)
+        header = [*by, "calls", "total [ms]", "mean [us]", "GFLOPS", "GB/s"]
+        lines = [
+            [
+                *("-" if row[field] is None else str(row[field]) for field in by),
+                str(row["calls"]),
+                f"{row['seconds'] * 1e3:.3f}",
+                f"{row['seconds'] / row['calls'] * 1e6:.1f}",
+                f"{row['gflops']:.2f}",
+                f"{row['gbps']:.2f}",
+            ]
+            for row in rows
+        ]
+        widths = [max(len(cell) for cell in col) for col in zip(header, *lines)]
+        return "\n".join(
+            "  ".join(cell.rjust(width) for cell, width in zip(line, widths))
+            for line in [header, *lines]
+        )
+
+    def print(self, by=("op", "dtype", "method")):
+        print(self.table(by))  # noqa: T201
+
+
+@contextmanager
+def profile():
+    """
+    Record every pyblis operation run inside the block, from any thread::
+
+        with pyblis.profile() as prof:
+            ...
+        prof.print()
+    """
+    prof = Profile()
+    hooks.add_observer(prof)
+    try:
+        yield prof
+    finally:
+        hooks.remove_observer(prof)
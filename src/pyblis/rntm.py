@@ -0,0 +1,49 @@
+from contextlib import contextmanager
+
+from pyblis import core
+
+
+class Rntm(core._rntm_t):
+    """
+    A BLIS runtime object, passed as ``rntm=`` to any operation to control
+    its threading and packing without touching the global settings.
+
+    ``ways`` gives the parallelism of the (jc, pc, ic, jr, ir) loops, as a
+    5-tuple or a mapping; otherwise ``num_threads`` lets BLIS factor the
+    threads itself. Unset values come from the global runtime.
+    """
+
+    def __init__(
+        self, num_threads=None, ways=None, pack_a=None, pack_b=None, l3_sup=None
+    ):
+        super().__init__()
+        core.bli_rntm_init(self, num_threads, ways)
+        if pack_a is not None:
+            self.pack_a = pack_a
+        if pack_b is not None:
+            self.pack_b = pack_b
+        if l3_sup is not None:
+            self.l3_sup = l3_sup
+
+    @property
+    def ways(self):
+        loops = (core.BLIS_NC, core.BLIS_KC, core.BLIS_MC, core.BLIS_NR, core.BLIS_MR)
+        return tuple(self.thrloop[loop] for loop in loops)
+
+    def __repr__(self):
+        return f"Rntm(num_threads={self.num_threads}, ways={self.ways})"
+
+
+@contextmanager
+def threads(num_threads=None, ways=None, **kwargs):
+    """
+    Run every operation in the block that is not given an explicit
+    ``rntm=`` with the given threading. Scoped to the current thread or
+    asyncio task.
+    """
+    rntm = Rntm(num_threads, ways, **kwargs)
+    token = core._rntm_context.set(rntm)
+    try:
+        yield rntm
+    finally:
+        core._rntm_context.reset(token)
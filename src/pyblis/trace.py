@@ -0,0 +1,93 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+
+from pyblis import hooks
+
+
+def _json_value(value):
+    # Flags are raw arguments, e.g. a dtype for compute_precision.
+    if isinstance(value, np.generic):
+        value = value.item()
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    try:
+        return np.dtype(value).name
+    except TypeError:
+        return str(value)
+
+
+class Tracer:
+    """
+    Records every pyblis operation as a Chrome trace event, one timeline
+    row per Python thread. The result loads in Perfetto or chrome://tracing.
+    """
+
+    def __init__(self):
+        self.events = []
+        self._thread_names = {}
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def __call__(self, record):
+        event = {
+            "name": record.op,
+            "cat": "blis",
+            "ph": "X",
+            "ts": (record.start - self._origin) * 1e6,
+            "dur": record.seconds * 1e6,
+            "pid": os.getpid(),
+            "tid": record.thread_id,
+            "args": {
+                "dtype": record.dtype,
+                "shapes": [list(shape) for shape in record.shapes],
+                "flags": {name: _json_value(v) for name, v in record.flags},
+                "blis_threads": record.threads,
+                "flops": record.flops,
+                "bytes": record.bytes,
+                "method": record.method,
+            },
+        }
+        with self._lock:
+            self.events.append(event)
+            if record.thread_id not in self._thread_names:
+                self._thread_names[record.thread_id] = threading.current_thread().name
+
+    def to_json(self):
+        with self._lock:
+            metadata = [
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": os.getpid(),
+                    "tid": tid,
+                    "args": {"name": name},
+                }
+                for tid, name in self._thread_names.items()
+            ]
+            events = metadata + self.events
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def save(self, path):
+        Path(path).write_text(json.dumps(self.to_json()))
+
+
+@contextmanager
+def trace(path=None):
+    """
+    Trace every pyblis operation run inside the block, from any thread, and
+    write the Chrome trace-event JSON to ``path`` on exit if given.
+    """
+    tracer = Tracer()
+    hooks.add_observer(tracer)
+    try:
+        yield tracer
+    finally:
+        hooks.remove_observer(tracer)
+        if path is not None:
+            tracer.save(path)
@@ -0,0 +1,51 @@
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pytest
+
+_saved_cache_dir = None
+
+
+def pytest_configure(config):  # noqa: ARG001
+    # Test modules import pyblis, which reads and writes its library profile,
+    # while they are collected, before any fixture runs. Keep that and
+    # everything else cached out of the user's home directory.
+    global _saved_cache_dir  # noqa: PLW0603
+    _saved_cache_dir = os.environ.get("PYBLIS_CACHE_DIR")
+    os.environ["PYBLIS_CACHE_DIR"] = tempfile.mkdtemp(prefix="pyblis-cache-")
+
+
+def pytest_unconfigure(config):  # noqa: ARG001
+    shutil.rmtree(os.environ["PYBLIS_CACHE_DIR"], ignore_errors=True)
+    if _saved_cache_dir is None:
+        del os.environ["PYBLIS_CACHE_DIR"]
+    else:
+        os.environ["PYBLIS_CACHE_DIR"] = _saved_cache_dir
+
+
+@pytest.fixture(params=[np.float32, np.float64, np.complex64, np.complex128])
+def dtype(request):
+    return request.param
+
+
+@pytest.fixture
+def rand():
+    # rand(rng, shape, dtype): random values, complex for a complex dtype.
+    def rand(rng, shape, dtype=np.float64):
+        a = rng.random(shape)
+        if np.issubdtype(dtype, np.complexfloating):
+            a = a + 1j * rng.random(shape)
+        return a.astype(dtype)
+
+    return rand
+
+
+@pytest.fixture
+def tol():
+    # tol(dtype): np.allclose tolerances for the precision of dtype.
+    def tol(dtype):
+        return {"rtol": 1e-4} if np.dtype(dtype).char in "fF" else {}
+
+    return tol
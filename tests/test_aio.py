@@ -0,0 +1,102 @@
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+import pyblis
+from pyblis import aio, core
+
+
+@pytest.fixture
+def small_pool():
+    aio.configure(max_workers=2, max_pending=2)
+    yield
+    aio.configure()
+
+
+def test_gemm():
+    rng = np.random.default_rng(0)
+    a = rng.standard_normal((50, 40))
+    b = rng.standard_normal((40, 30))
+    c = np.zeros((50, 30))
+    asyncio.run(aio.gemm(1.0, a, b, 0.0, c))
+    np.testing.assert_allclose(c, a @ b)
+    assert aio.gemm.__name__ == "gemm"
+
+
+def test_level1_result():
+    x = np.arange(5.0)
+    y = np.ones(5)
+    assert asyncio.run(aio.dotv(x, y)) == pytest.approx(10.0)
+
+
+def test_errors_propagate():
+    with pytest.raises(AssertionError):
+        asyncio.run(aio.dotv(np.ones(3), np.ones((3, 1))))
+
+
+def test_threads_context_carries_over():
+    async def main():
+        with pyblis.threads(3):
+            return await aio.run(lambda: core._rntm_context.get().num_threads)
+
+    assert asyncio.run(main()) == 3
+
+
+def test_cores_are_shared_among_workers():
+    aio.configure(max_workers=4)
+    try:
+        threads = asyncio.run(aio.run(lambda: core._rntm_context.get().num_threads))
+    finally:
+        aio.configure()
+    assert threads == max(1, core._get_num_cpus() // 4)
+
+
+def test_level1m_and_diagonal_ops():
+    a, b = np.eye(3), np.ones((3, 3))
+    asyncio.run(aio.axpym(2.0, a, b))
+    np.testing.assert_allclose(b, 1 + 2 * np.eye(3))
+    asyncio.run(aio.addd(a, b))
+    np.testing.assert_allclose(np.diag(b), 4.0)
+
+
+@pytest.mark.usefixtures("small_pool")
+def test_backpressure():
+    release = threading.Event()
+    running = []
+
+    def job():
+        running.append(1)
+        release.wait()
+
+    async def main():
+        tasks = [asyncio.ensure_future(aio.run(job)) for _ in range(4)]
+        await asyncio.sleep(0.1)
+        # Only max_pending jobs have been handed to the pool.
+        submitted = len(running)
+        release.set()
+        await asyncio.gather(*tasks)
+        return submitted
+
+    assert asyncio.run(main()) == 2
+
+
+@pytest.mark.usefixtures("small_pool")
+def test_cancel_keeps_slot_until_done():
+    release = threading.Event()
+
+    async def main():
+        task = asyncio.ensure_future(aio.run(release.wait))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        await asyncio.sleep(0.05)
+        sem = aio._get_semaphore(asyncio.get_running_loop())
+        held = sem._value < 2
+        release.set()
+        await asyncio.sleep(0.05)
+        return held, sem._value
+
+    held, value = asyncio.run(main())
+    assert held
+    assert value == 2
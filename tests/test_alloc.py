@@ -0,0 +1,80 @@
+import gc
+
+import numpy as np
+import pytest
+
+from pyblis import alloc, blis_l3, core
+
+
+def test_alignment_and_layout():
+    pool = alloc.Pool(alignment=4096)
+    a = pool.empty((5, 3), np.complex128)
+    f = pool.zeros((5, 3), np.float32, order="F")
+    assert a.ctypes.data % 4096 == 0
+    assert a.flags.c_contiguous
+    assert f.flags.f_contiguous
+    assert not f.any()
+    with pytest.raises(ValueError, match="power of two"):
+        alloc.Pool(alignment=48)
+
+
+def test_hugepage_alignment():
+    # Only virtual memory: the buffer is never touched.
+    alignment = 64 * alloc.HUGE_PAGE_SIZE
+    pool = alloc.Pool(alignment=alignment, hugepages=True)
+    a = pool.empty(alloc.HUGE_PAGE_SIZE, np.uint8)
+    assert a.ctypes.data % alignment == 0
+    raw = a.base._raw
+    assert a.ctypes.data + a.nbytes <= raw.ctypes.data + raw.nbytes
+
+
+def test_buffers_are_recycled():
+    pool = alloc.Pool()
+    a = pool.empty((10, 10))
+    addr = a.ctypes.data
+    view = a[2:, 3:]
+    del a
+    gc.collect()
+    assert pool.stats().in_use_bytes == alloc.size_class(800)
+    del view
+    stats = pool.stats()
+    assert stats.in_use_bytes == 0
+    assert stats.pooled_bytes == alloc.size_class(800)
+
+    # Any shape in the same size class reuses the buffer.
+    b = pool.empty((99,))
+    assert b.ctypes.data == addr
+    assert pool.stats().hits == 1
+    pool.release(b)
+    pool.clear()
+    assert pool.stats().pooled_bytes == 0
+
+
+def test_buffer_context_and_limit():
+    pool = alloc.Pool(max_pooled=1024)
+    with pool.buffer(64) as tmp:
+        assert pool.stats().in_use_bytes == 512
+    assert pool.stats().pooled_bytes == 512
+    with pool.buffer(1000):
+        pass
+    assert pool.stats().pooled_bytes == 512
+    with pytest.raises(TypeError, match="not allocated from a pool"):
+        pool.release(np.ones(3))
+    del tmp
+
+
+def test_allocmatrix():
+    for order in ("C", "F"):
+        obj, arr = core.bli_allocmatrix((4, 6), order=order)
+        assert arr.flags[f"{order}_CONTIGUOUS"]
+        arr[...] = np.arange(24).reshape(4, 6)
+        assert (obj.rs, obj.cs) == tuple(s // 8 for s in arr.strides)
+
+
+def test_plan_empty_output():
+    plan = blis_l3.plan_gemm((3, 4), (4, 5), np.float64)
+    pool = alloc.Pool()
+    c = plan.empty_output(pool)
+    assert c.shape == (3, 5)
+    plan(np.ones((3, 4)), np.ones((4, 5)), c)
+    assert np.all(c == 4.0)
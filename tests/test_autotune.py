@@ -0,0 +1,94 @@
+import json
+
+import numpy as np
+import pytest
+
+import pyblis
+from pyblis import autotune, blis_l3, core
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("PYBLIS_CACHE_DIR", str(tmp_path))
+    autotune.reload()
+    yield tmp_path
+    monkeypatch.undo()
+    autotune.reload()
+
+
+def test_candidates():
+    settings = list(autotune.candidates([1, 4]))
+    assert settings[:3] == [None, {"num_threads": 1}, {"num_threads": 4}]
+    ways = [s["ways"] for s in settings[3:]]
+    assert len(ways) == 6
+    for jc, pc, ic, jr, ir in ways:
+        assert (pc, ir) == (1, 1)
+        assert jc * ic * jr == 4
+
+
+def test_tune_saves_and_applies(cache_dir, monkeypatch):
+    winner = autotune.tune("syrk", (20, 300), thread_counts=[1, 2], repeat=1)
+    cache = json.loads((cache_dir / "autotune.json").read_text())
+    assert list(cache) == [autotune.host_key()]
+    assert "syrk d 20x300" in cache[autotune.host_key()]
+
+    # A fresh process sees the saved result.
+    autotune.reload()
+    tuned = autotune.lookup("syrk", (20, 300), "d")
+    assert (tuned is None) == (winner is None)
+    if winner is not None:
+        assert tuned.ways == winner.ways
+
+    # Pin a setting to check that the wrapper picks it up.
+    rntm = pyblis.Rntm(ways=(1, 1, 1, 1, 1))
+    monkeypatch.setitem(autotune._tuned, ("gemm", (6, 5, 4), "d"), rntm)
+    seen = []
+    real = autotune.lookup
+    monkeypatch.setattr(
+        autotune, "lookup", lambda *key: seen.append(real(*key)) or seen[-1]
+    )
+    a, b, c = np.ones((4, 6)), np.ones((4, 5)), np.zeros((6, 5))
+    blis_l3.gemm(1.0, a, b, 0.0, c, transa=True)
+    np.testing.assert_allclose(c, 4.0)
+    assert seen == [rntm]
+
+    # Explicit threading wins over the tuned one.
+    seen.clear()
+    with pyblis.threads(1):
+        blis_l3.gemm(1.0, a, b, 0.0, c, transa=True)
+    assert seen == [None]
+
+
+def test_profile_reports_tuned_threads(monkeypatch):
+    monkeypatch.setitem(
+        autotune._tuned, ("syrk", (6, 4), "d"), pyblis.Rntm(num_threads=3)
+    )
+    with pyblis.profile() as prof:
+        blis_l3.syrk(1.0, np.ones((6, 4)), 0.0, np.zeros((6, 6)))
+        blis_l3.syrk(1.0, np.ones((6, 5)), 0.0, np.zeros((6, 6)))
+    tuned, untuned = prof.records
+    assert tuned.threads == 3
+    assert untuned.threads == core.bli_rntm_num_threads()
+
+
+def test_disabled_and_clear(cache_dir, monkeypatch):
+    autotune.tune("gemm", (8, 8, 8), thread_counts=[1], repeat=1)
+    monkeypatch.setitem(autotune._tuned, ("gemm", (8, 8, 8), "d"), pyblis.Rntm(1))
+    monkeypatch.setenv("PYBLIS_AUTOTUNE", "0")
+    autotune.reload()
+    assert autotune.lookup("gemm", (8, 8, 8), "d") is None
+    monkeypatch.delenv("PYBLIS_AUTOTUNE")
+
+    autotune.clear()
+    assert autotune.reload() == 0
+    cache = json.loads((cache_dir / "autotune.json").read_text())
+    assert autotune.host_key() not in cache
+
+
+def test_tune_errors():
+    with pytest.raises(ValueError, match="Cannot tune"):
+        autotune.tune("trsm", (4, 4))
+    with pytest.raises(ValueError, match="shape"):
+        autotune.tune("gemm", (4, 4))
+    with pytest.raises(ValueError, match="dtype"):
+        autotune.tune("syrk", (4, 4), dtype=int)
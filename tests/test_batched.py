@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+from pyblis import blis_l3
+
+
+@pytest.mark.parametrize("mode", ["pool", "serial"])
+def test_gemm_batched_general_stride(mode):
+    # Views with neither unit row nor unit column stride, which the sup
+    # path gets wrong.
+    rng = np.random.default_rng(0)
+    a = rng.random((4, 14, 18))[:, ::2, ::3]
+    b = rng.random((4, 12, 15))[:, ::2, ::3]
+    c = np.zeros((4, 14, 15))[:, ::2, ::3]
+    blis_l3.gemm_batched(1.0, a, b, 0.0, c, mode=mode)
+    assert np.allclose(a @ b, c)
+
+
+def test_batched_shapes_are_checked():
+    a, b, c = np.ones((3, 4, 5)), np.ones((3, 6, 2)), np.zeros((3, 4, 2))
+    with pytest.raises(ValueError, match="gemm B"):
+        blis_l3.gemm_batched(1.0, a, b, 0.0, c)
+    bs = [np.ones((5, 2)), np.ones((5, 2)), np.ones((6, 2))]
+    with pytest.raises(ValueError, match="gemm B"):
+        blis_l3.gemm_batched(1.0, a, bs, 0.0, c)
+    with pytest.raises(ValueError, match="syrk C"):
+        blis_l3.syrk_batched(1.0, a, 0.0, np.zeros((3, 5, 5)))
+    with pytest.raises(ValueError, match="hemm A"):
+        blis_l3.hemm_batched(1.0, a, c, 0.0, c.copy())
+    with pytest.raises(ValueError, match="trsm A"):
+        blis_l3.trsm_batched(1.0, np.ones((3, 5, 5)), c)
@@ -0,0 +1,211 @@
+import ctypes
+import json
+import os
+import subprocess
+import sys
+import warnings
+
+import numpy as np
+import pytest
+
+from pyblis import blis_l1m, blis_l1v, blis_l3, core
+
+
+@pytest.fixture
+def fresh_obj_cache():
+    info = core.obj_cache_info()
+    core.obj_cache_clear()
+    yield
+    core.obj_cache_clear()
+    core.set_obj_cache_size(info.maxsize)
+
+
+@pytest.mark.usefixtures("fresh_obj_cache")
+def test_obj_cache_hits():
+    x = np.arange(10.0)
+    y = np.ones(10)
+    for _ in range(5):
+        blis_l1v.axpyv(2.0, x, y)
+    info = core.obj_cache_info()
+    assert info.misses == 2
+    assert info.hits == 8
+    assert info.currsize == 2
+    assert np.allclose(y, 1 + 10 * x)
+
+
+@pytest.mark.usefixtures("fresh_obj_cache")
+def test_obj_cache_key_includes_layout():
+    a = np.zeros((4, 6))
+    core.bli_obj_create_from(a)
+    core.bli_obj_create_from(a[:, :3])
+    core.bli_obj_create_from(a.T)
+    core.bli_obj_create_from(a.astype(np.float32))
+    assert core.obj_cache_info().misses == 4
+
+
+@pytest.mark.usefixtures("fresh_obj_cache")
+def test_obj_cache_eviction():
+    core.set_obj_cache_size(2)
+    arrs = [np.zeros(3) for _ in range(3)]
+    for a in arrs:
+        core.bli_obj_create_from(a)
+    assert core.obj_cache_info().currsize == 2
+    core.bli_obj_create_from(arrs[0])
+    assert core.obj_cache_info().hits == 0
+
+
+@pytest.mark.usefixtures("fresh_obj_cache")
+def test_obj_cache_returns_private_copies():
+    a = np.zeros((3, 3))
+    o1 = core.bli_obj_create_from(a)
+    core.bli_obj_set_conjtrans(core.BLIS_TRANSPOSE, o1)
+    core.bli_obj_set_uplo(core.BLIS_LOWER, o1)
+    o2 = core.bli_obj_create_from(a)
+    assert o1.info != o2.info
+    assert o2.root == ctypes.addressof(o2)
+
+
+@pytest.mark.usefixtures("fresh_obj_cache")
+def test_obj_cache_flags_do_not_leak():
+    rng = np.random.default_rng(0)
+    a = rng.random((5, 5))
+    b = rng.random((5, 5))
+    c = np.zeros((5, 5))
+    blis_l3.gemm(1.0, a, b, 0.0, c, transa=True)
+    assert np.allclose(c, a.T @ b)
+    blis_l3.gemm(1.0, a, b, 0.0, c)
+    assert np.allclose(c, a @ b)
+    blis_l3.gemm(1.0, a, a, 0.0, c, transb=True)
+    assert np.allclose(c, a @ a.T)
+
+
+def test_scalars_are_interned_per_datatype():
+    one_d = core.bli_scalar(1.0, "d")
+    assert core.bli_scalar(1, "d") is one_d
+    assert core.bli_scalar(1.0, "f") is not one_d
+    assert core.bli_scalar(2.5, "F") is core.bli_scalar(2.5, "F")
+    for typechar in "fdFD":
+        assert core.bli_readscalar(core.bli_scalar(-1, typechar)) == -1
+    assert core.bli_readscalar(core.bli_scalar(np.array(0.5), "f")) == 0.5
+    with pytest.raises(ValueError, match="requires a complex dtype"):
+        core.bli_scalar(1j, "d")
+
+
+def test_scalars_follow_operand_dtype():
+    x = np.ones(4, dtype=np.complex128)
+    y = np.zeros(4, dtype=np.complex128)
+    blis_l1v.axpyv(2 - 1j, x, y)
+    assert np.allclose(y, 2 - 1j)
+
+    # A float32 operation gets a float32 alpha, not a rounded double.
+    a = np.eye(3, dtype=np.float32)
+    c = np.zeros((3, 3), dtype=np.float32)
+    blis_l3.gemm(1 / 3, a, a, 0.0, c)
+    assert c[0, 0] == np.float32(1 / 3)
+
+
+VIEWS = {
+    "reversed": lambda a: a[::-1],
+    "reversed-both": lambda a: a[::-1, ::-1],
+    "transposed": lambda a: a.T,
+    "column-slice": lambda a: a[:, 2:5],
+    "stepped": lambda a: a[::2, ::3],
+    "reversed-transposed": lambda a: a[::-1].T,
+    "stepped-row": lambda a: a[2:3, ::2],
+    "column": lambda a: a[:, 3:4],
+}
+
+
+@pytest.mark.parametrize("view", VIEWS)
+def test_strided_views_are_not_copied(view):
+    rng = np.random.default_rng(0)
+    a = VIEWS[view](rng.random((6, 8)))
+    b = rng.random((a.shape[1], 3))
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        obj = core.bli_obj_create_from(a)
+        assert obj.buffer == a.ctypes.data
+        c = np.zeros((a.shape[0], 3))[::-1]
+        blis_l3.gemm(1.0, a, b, 0.0, c)
+        assert np.allclose(c, a @ b)
+        out = VIEWS[view](np.zeros((6, 8)))
+        blis_l1m.copym(a, out)
+        assert np.array_equal(out, a)
+
+
+def test_strided_vectors():
+    x = np.arange(20.0)
+    y = np.zeros(40)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        blis_l1v.axpyv(2.0, x[::-2], y[::4])
+        assert np.array_equal(y[::4], 2 * x[::-2])
+        assert blis_l1v.dotv(x[::-3], x[:7]) == np.dot(x[::-3], x[:7])
+
+
+def test_unsupported_layouts_are_copied_or_rejected():
+    row = np.arange(8.0)
+    broadcast = np.broadcast_to(row, (6, 8))
+    y = np.zeros((6, 8))
+    with pytest.warns(core.LayoutWarning, match="zero-stride"):
+        blis_l1m.copym(broadcast, y)
+    assert np.array_equal(y, broadcast)
+
+    records = np.zeros((6, 8), dtype=[("a", "f8"), ("b", "f4")])
+    records["a"] = np.arange(48).reshape(6, 8)
+    with pytest.warns(core.LayoutWarning, match="misaligned"):
+        blis_l1m.copym(records["a"], y)
+    assert np.array_equal(y, records["a"])
+
+    windows = np.lib.stride_tricks.sliding_window_view(np.arange(10.0), 4)
+    with pytest.warns(core.LayoutWarning, match="overlapping"):
+        blis_l1m.copym(windows, np.zeros(windows.shape))
+
+    with pytest.raises(ValueError, match="cannot write"):
+        blis_l1m.copym(y, records["a"])
+    with pytest.raises(ValueError, match="cannot write"):
+        blis_l3.gemm(1.0, y, y.T, 0.0, np.broadcast_to(0.0, (6, 6)))
+
+
+_LOAD_PROBE = """
+import sys
+import numpy as np
+import pyblis, pyblis.autotune, pyblis.info, pyblis.lazy, pyblis.blis_l1f
+print(pyblis.core.libblis._lib is None, "psutil" in sys.modules)
+pyblis.matmul(np.ones((2, 2)), np.ones((2, 2)))
+print(pyblis.core.libblis._lib is None)
+"""
+
+
+def _run_load_probe(cache_dir):
+    env = {**os.environ, "PYBLIS_CACHE_DIR": str(cache_dir)}
+    proc = subprocess.run(
+        [sys.executable, "-c", _LOAD_PROBE],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    assert proc.returncode == 0, proc.stderr
+    return proc.stdout.split()
+
+
+def test_library_is_loaded_on_first_use(tmp_path):
+    # The first import finds the library and records what it needs...
+    assert _run_load_probe(tmp_path) == ["False", "False", "False"]
+    profile = json.loads((tmp_path / "library.json").read_text())
+    assert profile["int_type_size"] == core.int_type_size
+    assert profile["legacy_info_layout"] == core.BLIS_LEGACY_INFO_LAYOUT
+    assert profile["path"] == core.libblis._name
+
+    # ...so later imports only load it for the first call.
+    assert _run_load_probe(tmp_path) == ["True", "False", "False"]
+
+    # A profile for other search paths is stale.
+    profile["search_paths"] = ["/nonexistent"]
+    (tmp_path / "library.json").write_text(json.dumps(profile))
+    assert _run_load_probe(tmp_path) == ["False", "False", "False"]
+
+
+def test_num_cpus():
+    assert 1 <= core._get_num_cpus() <= os.cpu_count()
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from pyblis import blis_l3, core
+from pyblis.executor import PartitionedExecutor, current_partition
+
+
+def _worker_state():
+    rntm = core._rntm_context.get()
+    return current_partition(), rntm.num_threads
+
+
+def test_partition_split():
+    with PartitionedExecutor(partitions=3, cpus=range(8), pin=False) as ex:
+        assert ex.partitions == [(0, 1, 2), (3, 4, 5), (6, 7)]
+
+
+def test_partition_validation():
+    with pytest.raises(ValueError, match="Cannot split"):
+        PartitionedExecutor(partitions=3, cpus=[0, 1])
+    with pytest.raises(ValueError, match="Cannot split"):
+        PartitionedExecutor(partitions=0)
+
+
+def test_worker_threading():
+    with PartitionedExecutor(partitions=2, cpus=[0, 1, 2, 3], pin=False) as ex:
+        states = {ex.submit(_worker_state).result() for _ in range(8)}
+    for cpus, num_threads in states:
+        assert cpus in ((0, 1), (2, 3))
+        assert num_threads == 2
+    assert current_partition() is None
+
+
+def test_concurrent_gemm():
+    rng = np.random.default_rng(0)
+    a = rng.standard_normal((16, 64, 48))
+    b = rng.standard_normal((16, 48, 32))
+    c = np.zeros((16, 64, 32))
+    with PartitionedExecutor() as ex:
+        futures = [
+            ex.submit(blis_l3.gemm, 1.0, a[i], b[i], 0.0, c[i]) for i in range(16)
+        ]
+        for future in futures:
+            future.result()
+    np.testing.assert_allclose(c, a @ b)
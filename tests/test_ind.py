@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+import pyblis
+from pyblis import blis_l1v, blis_l3, ind
+
+
+def test_methods():
+    assert ind.METHODS[-1] == "native"
+    assert "1m" in ind.METHODS
+    assert ind.available("gemm")[-1] == "native"
+    assert "1m" in ind.available("herk")
+    with pytest.raises(ValueError, match="Unknown induced method"):
+        ind.enable("2m")
+    with pytest.raises(ValueError, match="complex dtypes"):
+        ind.current("gemm", np.float64)
+    with pytest.raises(ValueError, match="level-3"):
+        ind.current("axpyv")
+
+
+def test_using_restores_settings():
+    before = ind.current("gemm", np.complex128)
+    with ind.using("1m", np.complex128):
+        assert ind.current("gemm", np.complex128) == "1m"
+        assert ind.current("herk", np.complex128) == "1m"
+        with ind.using("native"):
+            assert ind.current("gemm", np.complex128) == "native"
+        assert ind.current("gemm", np.complex128) == "1m"
+    assert ind.current("gemm", np.complex128) == before
+
+
+def test_enable_disable():
+    with ind.using("native"):
+        ind.enable("1m", np.complex64)
+        assert ind.is_enabled("1m", "trsm", np.complex64)
+        assert ind.current("syrk", np.complex64) == "1m"
+        assert ind.current("syrk", np.complex128) == "native"
+        ind.disable("1m")
+        assert ind.current("syrk", np.complex64) == "native"
+
+
+@pytest.mark.parametrize("method", ["1m", "native"])
+def test_per_call_method(method):
+    rng = np.random.default_rng(0)
+    a = rng.random((9, 7)) + 1j * rng.random((9, 7))
+    c = np.zeros((9, 9), dtype=np.complex128)
+    with pyblis.profile() as prof:
+        blis_l3.gemm(1.0, a, a, 0.0, c, transb=True, conjb=True, method=method)
+    assert np.allclose(c, a @ a.conj().T)
+    c = np.zeros((9, 9), dtype=np.complex128)
+    blis_l3.herk(1.0, a, 0.0, c, uplo_c="L", method=method)
+    assert np.allclose(np.tril(c), np.tril(a @ a.conj().T))
+    (record,) = prof.records
+    assert record.method == method
+
+
+def test_profile_reports_method():
+    a = np.ones((4, 4), dtype=np.complex64)
+    with pyblis.profile() as prof, ind.using("1m"):
+        blis_l3.gemm(1.0, a, a, 0.0, a.copy())
+        blis_l3.gemm(1.0, a.real.copy(), a.real.copy(), 0.0, np.ones((4, 4)))
+        blis_l1v.scalv(2.0, np.ones(3))
+    assert [r.method for r in prof.records] == ["1m", "native", None]
+    rows = prof.summary()
+    assert {row["method"] for row in rows} == {"1m", "native", None}
@@ -0,0 +1,89 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from pyblis import core, info
+
+
+def run_python(code, **env):
+    return subprocess.run(
+        [sys.executable, "-c", code],
+        env={**os.environ, **env},
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+
+
+def test_summary():
+    summary = info.summary()
+    assert summary["version"] == info.version()
+    assert summary["arch"] in summary["built_archs"]
+    assert summary["detected_arch"] in core.arch_names()
+    assert set(summary["blocksizes"]) == {"f", "d", "F", "D"}
+    assert summary["blocksizes"]["d"] == core.bli_blocksizes("d")
+    assert summary["threading"]["backend"] in ("openmp", "pthreads", "none")
+    assert summary["threading"]["num_threads"] >= 1
+    assert set(summary["simd"]) == {
+        "max_register_size",
+        "max_num_registers",
+        "align_size",
+    }
+    for impls in summary["microkernels"].values():
+        assert set(impls.values()) <= {
+            "reference",
+            "virtual",
+            "optimized",
+            "not applicable",
+        }
+    json.dumps(summary)
+
+
+def test_built_archs():
+    names = core.arch_names()
+    assert names[-1] == "generic"
+    assert info.arch() in core.built_archs()
+    assert set(core.built_archs()) <= set(names)
+
+
+def test_sup_thresholds():
+    thresholds = info.sup_thresholds("d")
+    if thresholds is None:
+        pytest.skip("context layout not known for this BLIS version")
+    assert set(thresholds) == {"mt", "nt", "kt"}
+
+
+def test_main():
+    proc = run_python("from pyblis import info; info.main()")
+    assert proc.returncode == 0, proc.stderr
+    assert json.loads(proc.stdout)["version"] == info.version()
+
+
+def test_unknown_arch():
+    # The library, and with it PYBLIS_ARCH, is loaded on first use.
+    proc = run_python("import pyblis.info as i; i.arch()", PYBLIS_ARCH="nonesuch")
+    assert proc.returncode != 0
+    assert "PYBLIS_ARCH=nonesuch" in proc.stderr
+
+
+def test_requested_arch():
+    code = "import warnings; warnings.simplefilter('error'); import pyblis.info as i; print(i.arch())"
+    proc = run_python(code, PYBLIS_ARCH=info.arch())
+    assert proc.returncode == 0, proc.stderr
+    assert proc.stdout.strip() == info.arch()
+
+    # BLIS_ARCH_TYPE is only set while BLIS initializes.
+    env = "import os; print(os.environ.get('BLIS_ARCH_TYPE'))"
+    proc = run_python(f"{code}; {env}", PYBLIS_ARCH=info.arch())
+    assert proc.stdout.split()[-1] == "None"
+
+    other = next(name for name in core.built_archs() if name != info.arch())
+    proc = run_python(code, PYBLIS_ARCH=other)
+    if info.arch_override_supported():
+        assert proc.returncode == 0, proc.stderr
+        assert proc.stdout.strip() == other
+    else:
+        assert "BLIS ignored PYBLIS_ARCH" in proc.stderr
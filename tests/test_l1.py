@@ -120,3 +120,11 @@ def test_subv(setup_l1v):
     yc = y.copy()
     blis_l1v.subv(x, yc)
     assert np.allclose(y - x, yc)
+
+
+def test_dotaxpyv(setup_l1v):
+    x, y, z, alpha, beta = setup_l1v
+    zc = z.copy()
+    rho = blis_l1v.dotaxpyv(alpha, x, y, zc)
+    assert np.allclose(np.dot(x, y), rho)
+    assert np.allclose(z + alpha * x, zc)
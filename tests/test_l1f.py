@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from pyblis import blis_l1f
+
+M = 50
+
+
+# Fewer columns than, exactly and more than the fusing factors.
+@pytest.fixture(params=[3, 8, 21])
+def b(request):
+    return request.param
+
+
+def scalars(dtype):
+    if np.issubdtype(dtype, np.complexfloating):
+        return 0.5 - 1j, 2.0 + 0.5j
+    return 0.5, 2.0
+
+
+def test_axpyf(dtype, b, rand, tol):
+    rng = np.random.default_rng(0)
+    a, x, y = rand(rng, (M, b), dtype), rand(rng, b, dtype), rand(rng, M, dtype)
+    alpha, _ = scalars(dtype)
+    yc = y.copy()
+    blis_l1f.axpyf(alpha, a, x, yc, conja=True)
+    assert np.allclose(yc, y + alpha * a.conj() @ x, **tol(dtype))
+
+
+def test_dotxf(dtype, b, rand, tol):
+    rng = np.random.default_rng(0)
+    a, x, y = rand(rng, (M, b), dtype), rand(rng, M, dtype), rand(rng, b, dtype)
+    alpha, beta = scalars(dtype)
+    yc = y.copy()
+    blis_l1f.dotxf(alpha, a, x, beta, yc, conjx=True)
+    assert np.allclose(yc, beta * y + alpha * a.T @ x.conj(), **tol(dtype))
+
+
+def test_dotxaxpyf(dtype, b, rand, tol):
+    rng = np.random.default_rng(0)
+    a = rand(rng, (M, b), dtype)
+    w, z = rand(rng, M, dtype), rand(rng, M, dtype)
+    x, y = rand(rng, b, dtype), rand(rng, b, dtype)
+    alpha, beta = scalars(dtype)
+    yc, zc = y.copy(), z.copy()
+    blis_l1f.dotxaxpyf(alpha, a, w, x, beta, yc, zc, conjat=True)
+    assert np.allclose(yc, beta * y + alpha * a.conj().T @ w, **tol(dtype))
+    assert np.allclose(zc, z + alpha * a @ x, **tol(dtype))
+
+
+def test_strided_panel():
+    rng = np.random.default_rng(0)
+    a = rng.random((2 * M, 40))[::2, 1::3]
+    x, y = rng.random(a.shape[1]), rng.random(M)
+    yc = y.copy()
+    blis_l1f.axpyf(1.0, a, x, yc)
+    assert np.allclose(yc, y + a @ x)
+
+
+def test_l1fargs():
+    a = np.ones((M, 4))
+    with pytest.raises(AssertionError, match="size"):
+        blis_l1f.axpyf(1.0, a, np.ones(5), np.ones(M))
+    with pytest.raises(AssertionError, match="dtype"):
+        blis_l1f.dotxf(1.0, a, np.ones(M, dtype=np.float32), 0.0, np.ones(4))
+
+
+def test_fusing_factor():
+    for name in ("af", "df", "xf"):
+        assert 1 <= blis_l1f.fusing_factor(name, "d") <= 64
@@ -0,0 +1,107 @@
+import numpy as np
+import pytest
+
+from pyblis import blis_l2
+
+M, N = 9, 6
+
+
+def scalar(dtype):
+    return 0.5 + 0.25j if np.issubdtype(dtype, np.complexfloating) else 0.5
+
+
+def hermitian(a):
+    # BLIS assumes the diagonal of a Hermitian matrix is real.
+    return np.tril(a, -1) + np.tril(a, -1).conj().T + np.diag(a.diagonal().real)
+
+
+@pytest.mark.parametrize("transa", [False, True])
+def test_gemv(dtype, transa, rand, tol):
+    rng = np.random.default_rng(0)
+    a = rand(rng, (M, N), dtype)
+    x = rand(rng, M if transa else N, dtype)
+    y = rand(rng, N if transa else M, dtype)
+    alpha, beta = scalar(dtype), 2.0
+    yc = y.copy()
+    blis_l2.gemv(alpha, a, x, beta, yc, transa=transa)
+    opa = a.T if transa else a
+    assert np.allclose(alpha * opa @ x + beta * y, yc, **tol(dtype))
+
+
+def test_gemv_conj(rand):
+    rng = np.random.default_rng(0)
+    a = rand(rng, (M, N), np.complex128)
+    x, y = rand(rng, N, np.complex128), np.zeros(M, dtype=np.complex128)
+    blis_l2.gemv(1.0, a, x, 0.0, y, conja=True, conjx=True)
+    assert np.allclose(a.conj() @ x.conj(), y)
+
+
+def test_ger(dtype, rand, tol):
+    rng = np.random.default_rng(0)
+    x, y, a = rand(rng, M, dtype), rand(rng, N, dtype), rand(rng, (M, N), dtype)
+    ac = a.copy()
+    blis_l2.ger(scalar(dtype), x, y, ac, conjy=True)
+    assert np.allclose(a + scalar(dtype) * np.outer(x, y.conj()), ac, **tol(dtype))
+
+
+def test_hemv_symv(dtype, rand, tol):
+    rng = np.random.default_rng(0)
+    a = rand(rng, (N, N), dtype)
+    x, y = rand(rng, N, dtype), np.zeros(N, dtype=dtype)
+    blis_l2.hemv(1.0, a, x, 0.0, y, uplo_a="L")
+    assert np.allclose(hermitian(a) @ x, y, **tol(dtype))
+    sym = np.tril(a) + np.tril(a, -1).T
+    blis_l2.symv(1.0, a, x, 0.0, y, uplo_a="L")
+    assert np.allclose(sym @ x, y, **tol(dtype))
+
+
+def test_her_syr(dtype, rand, tol):
+    rng = np.random.default_rng(0)
+    x = rand(rng, N, dtype)
+    a = np.zeros((N, N), dtype=dtype)
+    blis_l2.her(2.0, x, a, uplo_a="U")
+    assert np.allclose(np.triu(2.0 * np.outer(x, x.conj())), np.triu(a), **tol(dtype))
+    a[:] = 0
+    blis_l2.syr(scalar(dtype), x, a, uplo_a="L")
+    assert np.allclose(
+        np.tril(scalar(dtype) * np.outer(x, x)), np.tril(a), **tol(dtype)
+    )
+
+
+def test_her2_syr2(dtype, rand, tol):
+    rng = np.random.default_rng(0)
+    x, y = rand(rng, N, dtype), rand(rng, N, dtype)
+    alpha = scalar(dtype)
+    a = np.zeros((N, N), dtype=dtype)
+    blis_l2.her2(alpha, x, y, a)
+    expected = alpha * np.outer(x, y.conj()) + np.conj(alpha) * np.outer(y, x.conj())
+    assert np.allclose(np.tril(expected), np.tril(a), **tol(dtype))
+    a[:] = 0
+    blis_l2.syr2(alpha, x, y, a)
+    expected = alpha * (np.outer(x, y) + np.outer(y, x))
+    assert np.allclose(np.tril(expected), np.tril(a), **tol(dtype))
+
+
+@pytest.mark.parametrize("uplo", ["L", "U"])
+@pytest.mark.parametrize("transa", [False, True])
+def test_trmv_trsv(dtype, uplo, transa, rand, tol):
+    rng = np.random.default_rng(0)
+    a = rand(rng, (N, N), dtype) + N * np.eye(N, dtype=dtype)
+    tri = np.tril(a) if uplo == "L" else np.triu(a)
+    opa = tri.T if transa else tri
+    x = rand(rng, N, dtype)
+    xc = x.copy()
+    blis_l2.trmv(1.0, a, xc, uplo_a=uplo, transa=transa)
+    assert np.allclose(opa @ x, xc, **tol(dtype))
+    blis_l2.trsv(1.0, a, xc, uplo_a=uplo, transa=transa)
+    assert np.allclose(x, xc, **tol(dtype))
+
+
+def test_trsv_unit_diag(rand):
+    rng = np.random.default_rng(0)
+    a = rand(rng, (N, N), np.float64)
+    b = rand(rng, N, np.float64)
+    x = b.copy()
+    blis_l2.trsv(1.0, a, x, uplo_a="L", unit_diag_a=True)
+    unit = np.tril(a, -1) + np.eye(N)
+    assert np.allclose(unit @ x, b)
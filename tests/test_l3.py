@@ -0,0 +1,240 @@
+import numpy as np
+import pytest
+
+from pyblis import blis_l3
+from pyblis.core import libblis
+
+M, N, K = 7, 5, 6
+
+
+def test_gemm(dtype, rand, tol):
+    rng = np.random.default_rng(0)
+    a, b, c = (
+        rand(rng, (M, K), dtype),
+        rand(rng, (K, N), dtype),
+        rand(rng, (M, N), dtype),
+    )
+    cc = c.copy()
+    blis_l3.gemm(2.0, a, b, 0.5, cc)
+    assert np.allclose(2.0 * a @ b + 0.5 * c, cc, **tol(dtype))
+
+
+def test_syrk_lower(dtype, rand, tol):
+    rng = np.random.default_rng(0)
+    a = rand(rng, (N, K), dtype)
+    c = np.zeros((N, N), dtype=dtype)
+    blis_l3.syrk(1.0, a, 0.0, c, uplo_c="L")
+    assert np.allclose(np.tril(a @ a.T), np.tril(c), **tol(dtype))
+
+
+def test_trsm(dtype, rand, tol):
+    rng = np.random.default_rng(0)
+    a = np.tril(rand(rng, (M, M), dtype)) + M * np.eye(M, dtype=dtype)
+    b = rand(rng, (M, N), dtype)
+    x = b.copy()
+    blis_l3.trsm(1.0, a, x, side_a="L", uplo_a="L")
+    assert np.allclose(a @ x, b, **tol(dtype))
+
+
+def test_trsm_general_stride(dtype, rand, tol):
+    rng = np.random.default_rng(0)
+    a = np.zeros((2 * M, 3 * M), dtype=dtype)[::2, ::3]
+    a[...] = np.tril(rand(rng, (M, M), dtype)) + M * np.eye(M)
+    b = rand(rng, (2 * M, 3 * N), dtype)[::2, ::3]
+    x = np.zeros((2 * M, 3 * N), dtype=dtype)[::2, ::3]
+    x[...] = b
+    blis_l3.trsm(1.0, a, x, side_a="L", uplo_a="L")
+    assert np.allclose(a @ x, b, **tol(dtype))
+
+
+def test_gemmt_general_stride(dtype, rand, tol):
+    if not hasattr(libblis, "bli_gemmt_ex"):
+        pytest.skip("gemmt needs a newer BLIS")
+    rng = np.random.default_rng(0)
+    a = rand(rng, (2 * N, 3 * K), dtype)[::2, ::3]
+    b = rand(rng, (2 * K, 3 * N), dtype)[::2, ::3]
+    c = np.zeros((2 * N, 3 * N), dtype=dtype)[::2, ::3]
+    blis_l3.gemmt(1.0, a, b, 0.0, c, uplo_c="L")
+    assert np.allclose(np.tril(a @ b), np.tril(c), **tol(dtype))
+
+
+def test_plan_gemm(dtype, rand, tol):
+    rng = np.random.default_rng(0)
+    a, b = rand(rng, (K, M), dtype), rand(rng, (K, N), dtype)
+    plan = blis_l3.plan_gemm(a.shape, b.shape, dtype, transa=True, beta=1.0)
+    assert plan.shapes[2] == (M, N)
+    c = np.zeros((M, N), dtype=dtype)
+    plan(a, b, c)
+    plan(a, b, c)
+    assert np.allclose(2 * a.T @ b, c, **tol(dtype))
+
+
+def test_plan_gemm_conj(rand):
+    rng = np.random.default_rng(0)
+    a, b = rand(rng, (M, K), np.complex128), rand(rng, (K, N), np.complex128)
+    c = np.zeros((M, N), dtype=np.complex128)
+    blis_l3.plan_gemm(a.shape, b.shape, np.complex128, conjb=True, alpha=1j)(a, b, c)
+    assert np.allclose(1j * a @ b.conj(), c)
+
+
+def test_plan_syrk_trsm(dtype, rand, tol):
+    rng = np.random.default_rng(0)
+    a = rand(rng, (K, N), dtype)
+    c = np.zeros((N, N), dtype=dtype)
+    blis_l3.plan_syrk(a.shape, dtype, uplo_c="U", transa=True, num_threads=1)(a, c)
+    assert np.allclose(np.triu(a.T @ a), np.triu(c), **tol(dtype))
+
+    t = np.triu(rand(rng, (N, N), dtype)) + N * np.eye(N, dtype=dtype)
+    b = rand(rng, (M, N), dtype)
+    x = b.copy()
+    plan = blis_l3.plan_trsm(t.shape, x.shape, dtype, side_a="R", uplo_a="U")
+    plan(t, x)
+    assert np.allclose(x @ t, b, **tol(dtype))
+
+
+def test_plan_validates_up_front():
+    with pytest.raises(ValueError, match="gemm k"):
+        blis_l3.plan_gemm((3, 4), (5, 6), np.float64)
+    with pytest.raises(ValueError, match="Unknown uplo"):
+        blis_l3.plan_syrk((3, 4), np.float64, uplo_c="X")
+    with pytest.raises(ValueError, match="trsm A"):
+        blis_l3.plan_trsm((3, 3), (4, 2), np.float64)
+    with pytest.raises(ValueError, match="complex dtype"):
+        blis_l3.plan_gemm((3, 4), (4, 2), np.float64, alpha=1j)
+
+
+@pytest.mark.parametrize("mode", [None, "pool", "serial"])
+def test_gemm_batched(dtype, mode, rand, tol):
+    rng = np.random.default_rng(0)
+    batch = 6
+    a = rand(rng, (batch, K, M), dtype)
+    b = rand(rng, (batch, K, N), dtype)
+    c = rand(rng, (batch, M, N), dtype)
+    alphas = np.arange(1, batch + 1)
+    cc = c.copy()
+    blis_l3.gemm_batched(alphas, a, b, 0.5, cc, transa=True, mode=mode)
+    expected = alphas[:, None, None] * np.transpose(a, (0, 2, 1)) @ b + 0.5 * c
+    assert np.allclose(expected, cc, **tol(dtype))
+
+
+def test_gemm_batched_lists_and_broadcast(rand):
+    rng = np.random.default_rng(0)
+    a = rand(rng, (M, K), np.float64)
+    bs = [rand(rng, (K, N), np.float64) for _ in range(4)]
+    cs = [np.zeros((M, N)) for _ in range(4)]
+    blis_l3.gemm_batched(1.0, a, bs, 0.0, cs)
+    for b, c in zip(bs, cs):
+        assert np.allclose(a @ b, c)
+    with pytest.raises(ValueError, match="batch sizes"):
+        blis_l3.gemm_batched(1.0, a, bs[:3], 0.0, cs)
+    with pytest.raises(ValueError, match="broadcast"):
+        blis_l3.gemm_batched(1.0, a, bs, 0.0, cs[0])
+    with pytest.raises(ValueError, match="complex dtype"):
+        blis_l3.gemm_batched([1.0, 1j, 1.0, 1.0], a, bs, 0.0, cs)
+    blis_l3.gemm_batched(np.full(4, 2 + 0j), a, bs, 0.0, cs)
+    for b, c in zip(bs, cs):
+        assert np.allclose(2 * a @ b, c)
+
+
+def test_trsm_syrk_batched(dtype, rand, tol):
+    rng = np.random.default_rng(0)
+    batch = 5
+    t = np.tril(rand(rng, (batch, M, M), dtype)) + M * np.eye(M, dtype=dtype)
+    b = rand(rng, (batch, M, N), dtype)
+    x = b.copy()
+    blis_l3.trsm_batched(1.0, t, x, side_a="L", uplo_a="L", mode="pool")
+    assert np.allclose(t @ x, b, **tol(dtype))
+
+    c = np.zeros((batch, N, N), dtype=dtype)
+    blis_l3.syrk_batched(1.0, b, 0.0, c, uplo_c="L", transa=True)
+    expected = np.transpose(b, (0, 2, 1)) @ b
+    assert np.allclose(np.tril(expected), np.tril(c), **tol(dtype))
+
+
+@pytest.mark.parametrize("uplo", ["L", "U", "l", "u"])
+def test_streaming_syrk_herk(dtype, uplo, rand, tol):
+    rng = np.random.default_rng(0)
+    a = rand(rng, (23, N), dtype)
+    syrk_acc = blis_l3.StreamingSyrk(N, dtype, uplo=uplo)
+    herk_acc = blis_l3.StreamingHerk(N, dtype, uplo=uplo)
+    for start in range(0, 23, 5):
+        syrk_acc.update(a[start : start + 5])
+        herk_acc.update(a[start : start + 5])
+    assert syrk_acc.rows == herk_acc.rows == 23
+    assert np.allclose(syrk_acc.finalize(), a.T @ a, **tol(dtype))
+    assert np.allclose(herk_acc.finalize(), a.conj().T @ a, **tol(dtype))
+
+
+def test_streaming_gemm(dtype, rand, tol):
+    rng = np.random.default_rng(0)
+    a, b = rand(rng, (17, M), dtype), rand(rng, (17, N), dtype)
+    acc = blis_l3.StreamingGemm(M, N, dtype, conj=True)
+    for start in range(0, 17, 4):
+        acc.update(a[start : start + 4], b[start : start + 4], alpha=2.0)
+    assert np.allclose(acc.finalize(), 2.0 * a.conj().T @ b, **tol(dtype))
+    acc.reset()
+    assert acc.rows == 0
+    assert not acc.finalize().any()
+
+
+def test_streaming_errors():
+    acc = blis_l3.StreamingSyrk(4, np.float64)
+    with pytest.raises(ValueError, match="Expected a block"):
+        acc.update(np.ones((3, 5)))
+    with pytest.raises(ValueError, match="uplo"):
+        blis_l3.StreamingSyrk(4, np.float64, uplo="D")
+    with pytest.raises(ValueError, match="Expected blocks"):
+        blis_l3.StreamingGemm(2, 3, np.float64).update(np.ones((4, 2)), np.ones((5, 3)))
+
+
+@pytest.mark.parametrize(
+    ("da", "db", "dc"),
+    [
+        (np.float32, np.complex128, np.complex128),
+        (np.float32, np.float32, np.float64),
+        (np.complex64, np.float64, np.complex128),
+        (np.float64, np.complex64, np.complex64),
+    ],
+)
+def test_gemm_mixed_datatypes(da, db, dc, rand, tol):
+    rng = np.random.default_rng(0)
+    a, b, c = rand(rng, (M, K), da), rand(rng, (K, N), db), rand(rng, (M, N), dc)
+    cc = c.copy()
+    blis_l3.gemm(2.0, a, b, 0.5, cc)
+    ref = 2.0 * a.astype(np.complex128) @ b.astype(np.complex128) + 0.5 * c
+    assert np.allclose(cc, ref, **tol(dc))
+
+
+@pytest.mark.parametrize("beta", [0.0, 0.5 - 2j])
+def test_gemm_mixed_datatypes_complex_alpha(beta, rand):
+    rng = np.random.default_rng(0)
+    a, b = rand(rng, (M, K), np.float64), rand(rng, (K, N), np.float64)
+    c = rand(rng, (M, N), np.complex128)
+    cc = c.copy()
+    blis_l3.gemm(2 + 1j, a, b, beta, cc)
+    assert np.allclose(cc, (2 + 1j) * a @ b + beta * c)
+    with pytest.raises(ValueError, match="complex output"):
+        blis_l3.gemm(1j, a.astype(np.float32), b, 0.0, np.zeros((M, N)))
+    # C is left alone when the call is rejected.
+    cc = c.copy()
+    with pytest.raises(ValueError, match="computation precision"):
+        blis_l3.gemm(2 + 1j, a, b, 0.5, cc, compute_precision="int64")
+    np.testing.assert_array_equal(cc, c)
+
+
+def test_gemm_compute_precision():
+    rng = np.random.default_rng(0)
+    a = rng.random((4, 20000)).astype(np.float32)
+    b = rng.random((20000, 4)).astype(np.float32)
+    ref = a.astype(np.float64) @ b.astype(np.float64)
+
+    def error(**kwargs):
+        c = np.zeros((4, 4), dtype=np.float32)
+        blis_l3.gemm(1.0, a, b, 0.0, c, **kwargs)
+        return np.abs(c - ref).max() / ref.max()
+
+    # Accumulating in double leaves only the final rounding to float32.
+    assert error(compute_precision="double") < 1e-7 < error()
+    assert error(compute_precision=np.float32) == error()
+    with pytest.raises(ValueError, match="computation precision"):
+        blis_l3.gemm(1.0, a, b, 0.0, np.zeros((4, 4)), compute_precision="int64")
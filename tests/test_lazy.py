@@ -0,0 +1,144 @@
+import numpy as np
+import pytest
+
+from pyblis import blis_l1m, blis_l1v, blis_l2, blis_l3, lazy
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    # The names of the BLIS wrappers an evaluation calls.
+    names = []
+    for module in (blis_l1m, blis_l1v, blis_l2, blis_l3):
+        for name in (
+            "axpbyv",
+            "axpy2v",
+            "axpym",
+            "axpyv",
+            "dotaxpyv",
+            "dotv",
+            "gemm",
+            "gemv",
+            "scal2m",
+            "scal2v",
+            "scalm",
+            "scalv",
+        ):
+            fn = getattr(module, name, None)
+            if fn is not None:
+
+                def spy(*args, _fn=fn, _name=name, **kwargs):
+                    names.append(_name)
+                    return _fn(*args, **kwargs)
+
+                monkeypatch.setattr(module, name, spy)
+    return names
+
+
+def test_gemm_fusion(calls, rand):
+    rng = np.random.default_rng(0)
+    a, b, c = rand(rng, (6, 4)), rand(rng, (6, 5)), rand(rng, (4, 5))
+    expr = 2.0 * lazy.array(a).T @ b + 0.5 * lazy.array(c)
+    np.testing.assert_allclose(expr.evaluate(), 2.0 * a.T @ b + 0.5 * c)
+    assert calls == ["gemm", "axpyv"]
+
+    calls.clear()
+    ref = 2.0 * a.T @ b + 0.5 * c
+    out = expr.evaluate(out=c)
+    assert out is c
+    np.testing.assert_allclose(c, ref)
+    assert calls == ["gemm"]
+
+
+def test_product_transpose_and_conj(calls, rand):
+    rng = np.random.default_rng(0)
+    a, b = rand(rng, (3, 4), np.complex128), rand(rng, (4, 5), np.complex128)
+    expr = (lazy.array(a) @ b).H
+    np.testing.assert_allclose(expr.evaluate(), (a @ b).conj().T)
+    assert calls == ["gemm"]
+
+
+def test_complex_coefficient_of_real_product(calls, rand):
+    rng = np.random.default_rng(0)
+    a, b = rand(rng, (3, 4)), rand(rng, (4, 5))
+    expr = 1j * (lazy.array(a) @ b)
+    np.testing.assert_allclose(expr.evaluate(), 1j * (a @ b))
+    out = np.ones((3, 5), dtype=np.complex64)
+    (lazy.array(out) + (2 - 1j) * (lazy.array(a) @ b)).evaluate(out=out)
+    np.testing.assert_allclose(out, 1 + (2 - 1j) * (a @ b), rtol=1e-5)
+    assert calls == ["gemm", "gemm"]
+
+
+def test_gemv(calls, rand):
+    rng = np.random.default_rng(0)
+    a, x, y = rand(rng, (4, 6)), rand(rng, 6), rand(rng, 4)
+    ref = 3.0 * a @ x - y
+    (3.0 * lazy.array(a) @ x - lazy.array(y)).evaluate(out=y)
+    np.testing.assert_allclose(y, ref)
+    np.testing.assert_allclose((y @ lazy.array(a)).evaluate(), y @ a)
+    assert calls == ["gemv", "gemv"]
+
+
+def test_vector_sums(calls, rand):
+    rng = np.random.default_rng(0)
+    x, y, z = rand(rng, 7), rand(rng, 7), rand(rng, 7)
+    lx, ly = lazy.array(x), lazy.array(y)
+
+    np.testing.assert_allclose((lx * 2.0 + ly * 3.0).evaluate(), 2 * x + 3 * y)
+    assert calls == ["axpy2v"]
+
+    calls.clear()
+    ref = 2 * x + 0.5 * z
+    (lx * 2.0 + 0.5 * lazy.array(z)).evaluate(out=z)
+    np.testing.assert_allclose(z, ref)
+    assert calls == ["axpbyv"]
+
+    calls.clear()
+    np.testing.assert_allclose((lx / 2).evaluate(), x / 2)
+    assert calls == ["scal2v"]
+
+
+def test_matrix_sums(calls, rand):
+    rng = np.random.default_rng(0)
+    a, b, c = rand(rng, (5, 4)), rand(rng, (4, 5)), rand(rng, (5, 4))
+
+    # Operands in one element order are summed as vectors.
+    np.testing.assert_allclose((lazy.array(a).T - c.T).evaluate(), a.T - c.T)
+    assert calls == ["axpy2v"]
+
+    calls.clear()
+    np.testing.assert_allclose((lazy.array(a).T - b).evaluate(), a.T - b)
+    assert calls == ["axpym", "axpym"]
+
+    calls.clear()
+    np.testing.assert_allclose((lazy.array(a).T * 2.0).evaluate(), 2 * a.T)
+    assert calls == ["scal2m"]
+
+
+def test_dotaxpyv(calls, rand):
+    rng = np.random.default_rng(0)
+    x, y, z = rand(rng, 9), rand(rng, 9), rand(rng, 9)
+    ref_rho, ref_z = x @ y, z + 2.0 * x
+    lx = lazy.array(x)
+    rho, out = lazy.evaluate(lx @ y, z + 2.0 * lx, out=(None, z))
+    assert out is z
+    np.testing.assert_allclose(rho, ref_rho)
+    np.testing.assert_allclose(z, ref_z)
+    assert calls == ["dotaxpyv"]
+
+
+def test_aliased_operands(rand):
+    rng = np.random.default_rng(0)
+    a = rand(rng, (5, 5))
+    ref = a @ a + a
+    np.testing.assert_allclose((lazy.array(a) @ a + a).evaluate(out=a), ref)
+
+
+def test_errors():
+    with pytest.raises(ValueError, match="not aligned"):
+        lazy.array(np.ones((3, 4))) @ np.ones((3, 4))
+    with pytest.raises(ValueError, match="Cannot add"):
+        lazy.array(np.ones(3)) + np.ones(4)
+    with pytest.raises(TypeError, match="BLIS dtype"):
+        lazy.array(np.ones(3, dtype=int))
+    with pytest.raises(TypeError):
+        lazy.array(np.ones(3)) * np.ones(3)
@@ -0,0 +1,136 @@
+import numpy as np
+import pytest
+
+import pyblis
+from pyblis import linalg
+
+SHAPES = [
+    ((5,), (5,)),
+    ((4, 5), (5,)),
+    ((5,), (5, 3)),
+    ((4, 5), (5, 3)),
+    ((2, 4, 5), (5, 3)),
+    ((4, 5), (2, 5, 3)),
+    ((2, 4, 5), (2, 5, 3)),
+    ((3, 1, 4, 5), (2, 5, 3)),
+    ((5,), (2, 5, 3)),
+    ((2, 4, 5), (5,)),
+]
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.complex128])
+@pytest.mark.parametrize(("ashape", "bshape"), SHAPES)
+def test_matmul(dtype, ashape, bshape, rand):
+    rng = np.random.default_rng(0)
+    a, b = rand(rng, ashape, dtype), rand(rng, bshape, dtype)
+    ref = a @ b
+    result = pyblis.matmul(a, b)
+    assert np.shape(result) == ref.shape
+    assert np.asarray(result).dtype == ref.dtype
+    np.testing.assert_allclose(result, ref, rtol=1e-5)
+
+
+@pytest.mark.parametrize(("ashape", "bshape"), SHAPES)
+def test_matmul_accumulate(ashape, bshape):
+    rng = np.random.default_rng(0)
+    a, b = rng.random(ashape), rng.random(bshape)
+    out = np.asarray(rng.random(np.shape(a @ b)))
+    ref = 2.0 * (a @ b) + 0.5 * out
+    result = pyblis.matmul(a, b, out=out, alpha=2.0, beta=0.5)
+    assert result is out
+    np.testing.assert_allclose(out, ref)
+
+
+@pytest.mark.parametrize("n", [64, 300])
+def test_matmul_out_aliases_input(n):
+    rng = np.random.default_rng(0)
+    a, b = rng.random((n, n)), rng.random((n, n))
+    ref = a @ b
+    x = a.copy()
+    assert pyblis.matmul(x, b, out=x) is x
+    np.testing.assert_allclose(x, ref)
+    y = b.copy()
+    pyblis.matmul(a, y, out=y, alpha=2.0, beta=1.0)
+    np.testing.assert_allclose(y, 2.0 * ref + b)
+    v = a[:, 0].copy()
+    pyblis.matmul(a, v, out=v)
+    np.testing.assert_allclose(v, a @ a[:, 0])
+
+
+def test_matmul_mixed_and_fallback_dtypes():
+    rng = np.random.default_rng(0)
+    a = rng.random((4, 5)).astype(np.float32)
+    b = rng.random((5, 3))
+    np.testing.assert_allclose(pyblis.matmul(a, b), a @ b, rtol=1e-6)
+    np.testing.assert_allclose(pyblis.matmul(a, b[:, 0]), a @ b[:, 0], rtol=1e-6)
+    ai = np.arange(6).reshape(2, 3)
+    np.testing.assert_array_equal(pyblis.matmul(ai, ai.T), ai @ ai.T)
+    # Unsupported operands of a supported result type go to NumPy as well.
+    for other in (ai, ai.astype(np.float16)):
+        ones = np.ones((3, 2))
+        np.testing.assert_allclose(pyblis.matmul(other, ones), other @ ones)
+        np.testing.assert_allclose(pyblis.dot(other, ones), other @ ones)
+        np.testing.assert_allclose(linalg.asblis(ones.T) @ other.T, ones.T @ other.T)
+    out = np.zeros((2, 2), dtype=np.float16)
+    pyblis.matmul(a[:2, :3], b[:3, :2], out=out)
+    np.testing.assert_allclose(out, a[:2, :3] @ b[:3, :2], rtol=1e-3)
+
+
+def test_matmul_errors():
+    a = np.ones((4, 5))
+    with pytest.raises(ValueError, match="not aligned"):
+        pyblis.matmul(a, a)
+    with pytest.raises(ValueError, match="nonzero beta"):
+        pyblis.matmul(a, a.T, beta=1.0)
+    with pytest.raises(ValueError, match="shape"):
+        pyblis.matmul(a, a.T, out=np.zeros((5, 5)))
+    with pytest.raises(TypeError, match="Cannot write"):
+        pyblis.matmul(a + 1j, a.T, out=np.zeros((4, 4)))
+
+
+@pytest.mark.parametrize(
+    ("ashape", "bshape"),
+    [((), (3, 4)), ((5,), (5,)), ((3, 5), (5, 4)), ((2, 3, 5), (4, 5, 6))],
+)
+def test_dot(ashape, bshape):
+    rng = np.random.default_rng(0)
+    a, b = rng.random(ashape), rng.random(bshape)
+    np.testing.assert_allclose(pyblis.dot(a, b), np.dot(a, b))
+
+
+def test_blis_array(monkeypatch):
+    calls = []
+    gemm = linalg.blis_l3.gemm
+    monkeypatch.setattr(
+        linalg.blis_l3, "gemm", lambda *args, **kw: calls.append(1) or gemm(*args, **kw)
+    )
+    rng = np.random.default_rng(0)
+    a, b = rng.random((4, 5)), rng.random((5, 3))
+    ba = linalg.asblis(a)
+
+    result = ba @ b
+    assert type(result) is linalg.BlisArray
+    np.testing.assert_allclose(result, a @ b)
+    np.testing.assert_allclose(np.dot(ba, b), a @ b)
+    np.testing.assert_allclose(ba.dot(b), a @ b)
+    assert len(calls) == 3
+
+    assert type(ba + 1) is linalg.BlisArray
+
+
+def test_override(monkeypatch):
+    calls = []
+    gemm = linalg.blis_l3.gemm
+    monkeypatch.setattr(
+        linalg.blis_l3, "gemm", lambda *args, **kw: calls.append(1) or gemm(*args, **kw)
+    )
+    a = np.ones((4, 5))
+    with pyblis.override():
+        with pyblis.override():
+            np.testing.assert_allclose(np.matmul(a, a.T), 5.0)
+        np.testing.assert_allclose(np.dot(a, a.T), 5.0)
+    assert len(calls) == 2
+    assert np.matmul is linalg._np_matmul
+    assert np.dot is linalg._np_dot
+    np.dot(a, a.T)
+    assert len(calls) == 2
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from pyblis import outofcore
+
+
+def memmap(path, arr):
+    out = np.memmap(path, dtype=arr.dtype, mode="w+", shape=arr.shape)
+    out[:] = arr
+    return out
+
+
+@pytest.mark.parametrize(
+    ("transa", "transb"), [(False, False), (True, False), (False, True)]
+)
+def test_gemm_memmap(tmp_path, transa, transb):
+    rng = np.random.default_rng(0)
+    m, n, k = 70, 50, 90
+    a = rng.standard_normal((k, m) if transa else (m, k))
+    b = rng.standard_normal((n, k) if transb else (k, n))
+    c = rng.standard_normal((m, n))
+    am = memmap(tmp_path / "a", a)
+    bm = memmap(tmp_path / "b", b)
+    cm = memmap(tmp_path / "c", c)
+
+    # A budget this small forces several tiles in every dimension.
+    budget = 16 * 1024
+    tm, tn, tk = outofcore.tile_sizes(m, n, k, a.dtype, budget)
+    assert tm < m
+    assert tn < n
+    assert tk < k
+    outofcore.gemm(
+        0.5, am, bm, 2.0, cm, transa=transa, transb=transb, memory_budget=budget
+    )
+
+    opa = a.T if transa else a
+    opb = b.T if transb else b
+    np.testing.assert_allclose(cm, 0.5 * opa @ opb + 2.0 * c)
+
+
+def test_gemm_beta_zero_ignores_c():
+    a = np.ones((20, 30), dtype=np.float32)
+    b = np.ones((30, 10), dtype=np.float32)
+    c = np.full((20, 10), np.nan, dtype=np.float32)
+    outofcore.gemm(1.0, a, b, 0.0, c, memory_budget=4096)
+    np.testing.assert_allclose(c, 30.0)
+
+    # Also when there is nothing to accumulate.
+    c = np.full((20, 10), np.nan, dtype=np.float32)
+    outofcore.gemm(1.0, a[:, :0], b[:0], 0.0, c)
+    np.testing.assert_array_equal(c, 0.0)
+
+
+@pytest.mark.parametrize(("m", "n"), [(0, 10), (20, 0)])
+def test_gemm_empty(m, n):
+    a, b = np.ones((m, 30)), np.ones((30, n))
+    c = np.ones((m, n))
+    outofcore.gemm(1.0, a, b, 0.0, c)
+    assert outofcore.tile_sizes(m, n, 30, np.float64) == (m, n, 30)
+
+
+def test_tile_sizes_use_blocksizes():
+    tm, tn, tk = outofcore.tile_sizes(100_000, 100_000, 100_000, np.float64, 1 << 30)
+    assert tm * tn + 2 * tk * (tm + tn) <= (1 << 30) // 8
+    assert tk >= 256
+
+
+def test_gemm_errors():
+    a = np.ones((4, 5))
+    with pytest.raises(ValueError, match="Dimension mismatch"):
+        outofcore.gemm(1.0, a, a, 0.0, np.ones((4, 4)))
+    with pytest.raises(ValueError, match="too small"):
+        outofcore.tile_sizes(1000, 1000, 1000, np.float64, 64)
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+import pyblis
+from pyblis import alloc, blis_l3
+from pyblis.packed import PackedMatrix
+
+M, N, K = 13, 10, 7
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.complex128])
+@pytest.mark.parametrize(("transpose", "conjugate"), [(False, False), (True, True)])
+def test_packed_b(dtype, transpose, conjugate, rand):
+    rng = np.random.default_rng(0)
+    a = rand(rng, (M, K), dtype)
+    b = rand(rng, (N, K) if transpose else (K, N), dtype)
+    opb = b.T if transpose else b
+    opb = opb.conj() if conjugate else opb
+    packed = PackedMatrix(
+        np.asfortranarray(b), transpose=transpose, conjugate=conjugate
+    )
+    assert packed.shape == (K, N)
+    assert packed.array.strides[1] == b.itemsize
+    assert packed.array.ctypes.data % alloc.CACHE_LINE == 0
+    assert packed.array.strides[0] % alloc.CACHE_LINE == 0
+
+    # The same packed operand serves many calls.
+    for _ in range(3):
+        a = rand(rng, (M, K), dtype)
+        c = np.zeros((M, N), dtype=dtype)
+        blis_l3.gemm(2.0, a, packed, 0.0, c)
+        np.testing.assert_allclose(c, 2.0 * a @ opb, rtol=1e-5)
+
+
+def test_packed_a_and_flags():
+    rng = np.random.default_rng(0)
+    a, b = rng.random((K, M)), rng.random((N, K))
+    packed = PackedMatrix(a, operand="a", transpose=True)
+    assert packed.array.strides[0] == a.itemsize
+    assert packed.array.strides[1] % alloc.CACHE_LINE == 0
+    c = np.zeros((M, N))
+    blis_l3.gemm(1.0, packed, b, 0.0, c, transb=True)
+    np.testing.assert_allclose(c, a.T @ b.T)
+
+    # Flags passed to gemm apply to the packed op(matrix).
+    ct = np.zeros((N, M))
+    blis_l3.gemm(1.0, b, PackedMatrix(a), 0.0, ct)
+    np.testing.assert_allclose(ct, b @ a)
+    np.testing.assert_allclose(np.asarray(packed), a.T)
+
+
+def test_packed_array_copy():
+    packed = PackedMatrix(np.ones((M, K)))
+    assert np.shares_memory(np.asarray(packed), packed.array)
+    copied = np.array(packed, copy=True)
+    assert not np.shares_memory(copied, packed.array)
+    np.testing.assert_array_equal(copied, packed.array)
+    assert np.asarray(packed, dtype=np.float32).dtype == np.float32
+    with pytest.raises(ValueError, match="requires a copy"):
+        np.array(packed, dtype=np.float32, copy=False)
+
+
+def test_packed_dtype_and_profile():
+    rng = np.random.default_rng(0)
+    a, b = rng.random((M, K)), rng.random((K, N))
+    packed = PackedMatrix(b, dtype=np.float32)
+    assert packed.dtype == np.float32
+    c = np.zeros((M, N))
+    with pyblis.profile() as prof:
+        blis_l3.gemm(1.0, a, packed, 0.0, c)
+    np.testing.assert_allclose(c, a @ b, rtol=1e-6)
+    (record,) = prof.records
+    assert record.shapes == ((M, K), (K, N), (M, N))
+
+
+def test_packed_errors():
+    with pytest.raises(ValueError, match="operand"):
+        PackedMatrix(np.ones((2, 2)), operand="c")
+    with pytest.raises(ValueError, match="2-D"):
+        PackedMatrix(np.ones(3))
+    with pytest.raises(ValueError, match="dtype"):
+        PackedMatrix(np.ones((2, 2), dtype=int))
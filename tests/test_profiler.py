@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+import pyblis
+from pyblis import blis_l1v, blis_l3, hooks
+
+
+def test_profile_records():
+    a = np.ones((8, 6))
+    b = np.ones((4, 6))
+    c = np.zeros((8, 4))
+    x = np.ones(5, dtype=np.complex128)
+    with pyblis.profile() as prof:
+        blis_l3.gemm(
+            1.0, a, b, 0.0, c, transb=True, rntm=pyblis.Rntm(ways=(1, 1, 2, 1, 1))
+        )
+        blis_l1v.dotv(x, x)
+    assert not hooks._observers
+
+    gemm, dotv = prof.records
+    assert gemm.op == "gemm"
+    assert gemm.dtype == "d"
+    assert gemm.shapes == ((8, 6), (4, 6), (8, 4))
+    assert gemm.flags == (("transb", True),)
+    assert gemm.threads == 2
+    assert gemm.flops == 2 * 8 * 4 * 6
+    assert gemm.bytes == (48 + 24 + 32) * 8
+    assert gemm.seconds > 0
+    assert dotv.op == "dotv"
+    assert dotv.dtype == "D"
+    assert dotv.flops == 8 * 5
+
+
+def test_profile_plan():
+    a = np.ones((8, 6))
+    c = np.zeros((8, 8))
+    plan = blis_l3.plan_syrk(a.shape, a.dtype, uplo_c="L")
+    with pyblis.profile() as prof:
+        plan(a, c)
+    (record,) = prof.records
+    assert record.op == "syrk"
+    assert record.flops == 8 * 8 * 6
+
+
+def test_profile_empty_gemm():
+    with pyblis.profile() as prof:
+        blis_l3.gemm(1.0, np.ones((0, 6)), np.ones((6, 4)), 0.0, np.zeros((0, 4)))
+    (record,) = prof.records
+    assert record.flops == 0
+
+
+def test_profile_summary():
+    x = np.ones(100)
+    with pyblis.profile() as prof:
+        for _ in range(3):
+            blis_l1v.axpyv(2.0, x, x.copy())
+        blis_l1v.scalv(2.0, x)
+    rows = {row["op"]: row for row in prof.summary()}
+    assert rows["axpyv"]["calls"] == 3
+    assert rows["axpyv"]["flops"] == 3 * 200
+    assert rows["scalv"]["calls"] == 1
+    assert rows["axpyv"]["gflops"] > 0
+    assert "axpyv" in prof.table()
+    with pytest.raises(ValueError, match="Cannot group"):
+        prof.summary(by=("nonsense",))
+
+
+def test_profile_not_recording_outside():
+    with pyblis.profile() as prof:
+        pass
+    blis_l1v.scalv(2.0, np.ones(3))
+    assert prof.records == []
@@ -0,0 +1,74 @@
+import ctypes
+
+import numpy as np
+import pytest
+
+import pyblis
+from pyblis import blis_l1v, blis_l2, blis_l3, core
+
+
+def test_rntm_ways():
+    rntm = pyblis.Rntm(ways=(2, 1, 3, 1, 1))
+    assert rntm.ways == (2, 1, 3, 1, 1)
+    assert rntm.thrloop[core.BLIS_KR] == 1
+    assert pyblis.Rntm(ways={"ic": 4}).ways == (1, 1, 4, 1, 1)
+
+
+def test_rntm_num_threads():
+    rntm = pyblis.Rntm(num_threads=4)
+    assert rntm.num_threads == 4
+    assert list(rntm.thrloop) == [-1] * core.BLIS_NUM_LOOPS
+
+
+def test_rntm_validation():
+    with pytest.raises(ValueError, match="Unknown loops"):
+        pyblis.Rntm(ways={"kc": 2})
+    with pytest.raises(ValueError, match="does not match"):
+        pyblis.Rntm(num_threads=3, ways=(2, 1, 1, 1, 1))
+    pyblis.Rntm(num_threads=2, ways=(2, 1, 1, 1, 1))
+
+
+def test_rntm_packing():
+    rntm = pyblis.Rntm(num_threads=1, pack_a=True, pack_b=False, l3_sup=False)
+    assert rntm.pack_a
+    assert not rntm.pack_b
+    assert not rntm.l3_sup
+
+
+def test_rntm_layout():
+    # bool_t was as wide as gint_t before BLIS 0.8.
+    wide = core._version_info < (0, 8)
+    assert core._rntm_t.pack_a.size == (ctypes.sizeof(core.gint_t) if wide else 1)
+    rntm = pyblis.Rntm(pack_b=True)
+    assert rntm.num_threads == core.libblis.bli_thread_get_num_threads()
+    assert not rntm.pack_a
+    assert rntm.pack_b
+    assert rntm.l3_sup in (0, 1)
+
+
+def test_threads_context():
+    assert core._rntm_context.get() is None
+    with pyblis.threads(2) as rntm:
+        assert core._rntm_context.get() is rntm
+        with pyblis.threads(ways=(1, 1, 1, 1, 1)) as inner:
+            assert core._rntm_context.get() is inner
+        assert core._rntm_context.get() is rntm
+    assert core._rntm_context.get() is None
+
+
+def test_rntm_kwarg():
+    rng = np.random.default_rng(0)
+    a = rng.standard_normal((40, 30))
+    b = rng.standard_normal((30, 20))
+    c = np.zeros((40, 20))
+    blis_l3.gemm(1.0, a, b, 0.0, c, rntm=pyblis.Rntm(ways=(1, 1, 1, 1, 1)))
+    np.testing.assert_allclose(c, a @ b)
+
+    x = rng.standard_normal(30)
+    y = np.zeros(40)
+    with pyblis.threads(1):
+        blis_l2.gemv(1.0, a, x, 0.0, y)
+        blis_l1v.scalv(2.0, y, rntm=pyblis.Rntm(num_threads=1))
+        blis_l3.plan_gemm(a.shape, b.shape, a.dtype, beta=1.0)(a, b, c)
+    np.testing.assert_allclose(y, 2 * (a @ x))
+    np.testing.assert_allclose(c, 2 * (a @ b))
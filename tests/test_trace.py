@@ -0,0 +1,49 @@
+import json
+import threading
+
+import numpy as np
+
+import pyblis
+from pyblis import blis_l1v, blis_l3
+
+
+def test_trace_events(tmp_path):
+    a = np.ones((8, 8))
+    c = np.zeros((8, 8))
+    path = tmp_path / "trace.json"
+
+    def worker():
+        blis_l1v.scalv(2.0, np.ones(10))
+
+    with pyblis.trace(path) as tracer:
+        blis_l3.gemm(1.0, a, a, 0.0, c, transa=True)
+        thread = threading.Thread(target=worker, name="worker")
+        thread.start()
+        thread.join()
+
+    assert len(tracer.events) == 2
+    data = json.loads(path.read_text())
+    events = [e for e in data["traceEvents"] if e["ph"] == "X"]
+    names = {e["args"]["name"] for e in data["traceEvents"] if e["ph"] == "M"}
+    assert "worker" in names
+
+    gemm, scalv = events
+    assert gemm["name"] == "gemm"
+    assert gemm["args"]["shapes"] == [[8, 8], [8, 8], [8, 8]]
+    assert gemm["args"]["flags"] == {"transa": True}
+    assert gemm["args"]["blis_threads"] >= 1
+    assert gemm["dur"] > 0
+    assert scalv["name"] == "scalv"
+    assert scalv["tid"] != gemm["tid"]
+    assert scalv["ts"] >= gemm["ts"] + gemm["dur"]
+
+
+def test_trace_dtype_flags(tmp_path):
+    a = np.ones((4, 4), dtype=np.float32)
+    path = tmp_path / "trace.json"
+    with pyblis.trace(path):
+        blis_l3.gemm(1.0, a, a, 0.0, a.copy(), compute_precision=np.float64)
+    (event,) = (
+        e for e in json.loads(path.read_text())["traceEvents"] if e["ph"] == "X"
+    )
+    assert event["args"]["flags"] == {"compute_precision": "float64"}